@@ -0,0 +1,345 @@
+"""
+Archivage compact des parties.
+
+Une partie est codée par un seul entier en base mixte :
+
+- les coups forment une permutation partielle des cases, codée par son code
+  de Lehmer : le i-ème coup est remplacé par son rang parmi les cases encore
+  libres (0 à nb_cases - 1 - i) ;
+- la longueur de la partie (0 à nb_cases), le résultat (en cours, X, O, nul)
+  et le type de chaque joueur (8 types possibles) complètent le code.
+
+Sur le 3x3, le code tient dans 30 bits (9! x 10 x 4 x 8 x 8 valeurs) : chaque
+partie occupe 4 octets. Le fichier commence par un en-tête (signature et
+géométrie du plateau) suivi des enregistrements de taille fixe, écrits par
+EcrivainParties et relus en flux par LecteurParties, sans pickle.
+
+X joue toujours le premier coup, comme dans toutes les boucles de jeu.
+"""
+
+import struct
+from typing import Iterator, List, NamedTuple, Optional
+
+from morpion_base import TicTacToe
+from morpion_mnk import MorpionMNK
+
+SIGNATURE = b'MRPP'
+FORMAT_EN_TETE = '<4sBBB'
+TAILLE_EN_TETE = struct.calcsize(FORMAT_EN_TETE)
+
+# Résultats, dans l'ordre de leur code
+RESULTATS = (None, MorpionMNK.HUMAIN, MorpionMNK.IA, 'NUL')
+
+# Types de joueurs, dans l'ordre de leur code (au plus 8)
+TYPES_JOUEURS = (
+    'Inconnu', 'JoueurHumain', 'JoueurIA', 'JoueurIACache',
+    'JoueurQLearning', 'JoueurReseauNeurones', 'JoueurAleatoire', 'JoueurMCTS',
+)
+_NB_TYPES = 8
+
+# Nombre d'enregistrements mis en mémoire avant chaque écriture sur le disque
+_TAILLE_TAMPON = 4096
+
+
+class Partie(NamedTuple):
+    """Partie décodée."""
+    coups: List[int]  # Indices des cases, dans l'ordre du jeu (X joue les coups pairs)
+    resultat: Optional[str]  # 'X', 'O', 'NUL' ou None si la partie n'était pas terminée
+    joueur_x: str  # Type du joueur X (nom de classe)
+    joueur_o: str  # Type du joueur O
+
+
+def type_joueur(joueur) -> str:
+    """Type d'archive d'un joueur : le nom de sa classe s'il est connu, sinon 'Inconnu'."""
+    nom = type(joueur).__name__
+    return nom if nom in TYPES_JOUEURS else 'Inconnu'
+
+
+def taille_enregistrement(nb_cases: int) -> int:
+    """Nombre d'octets d'un enregistrement pour un plateau de ``nb_cases`` cases."""
+    nb_permutations = 1
+    for n in range(2, nb_cases + 1):
+        nb_permutations *= n
+    maximum = nb_permutations * (nb_cases + 1) * len(RESULTATS) * _NB_TYPES * _NB_TYPES - 1
+    return max(1, (maximum.bit_length() + 7) // 8)
+
+
+def encoder_coups(coups: List[int], resultat: Optional[str], joueur_x: str, joueur_o: str,
+                  nb_cases: int = 9) -> int:
+    """
+    Code une partie en un entier.
+    
+    Args:
+        coups: Indices des cases jouées, dans l'ordre
+        resultat: 'X', 'O', 'NUL' ou None
+        joueur_x: Type du joueur X (voir TYPES_JOUEURS)
+        joueur_o: Type du joueur O
+        nb_cases: Nombre de cases du plateau
+    
+    Returns:
+        Code de la partie
+    """
+    # Code de Lehmer : rang de chaque coup parmi les cases encore libres
+    libres = (1 << nb_cases) - 1
+    permutation = 0
+    base = 1
+    for i, index in enumerate(coups):
+        bit = 1 << index
+        if not libres & bit:
+            raise ValueError(f"Case {index} jouée deux fois")
+        rang = bin(libres & (bit - 1)).count('1')
+        permutation += rang * base
+        base *= nb_cases - i
+        libres ^= bit
+    
+    code = permutation
+    code = code * (nb_cases + 1) + len(coups)
+    code = code * len(RESULTATS) + RESULTATS.index(resultat)
+    code = code * _NB_TYPES + TYPES_JOUEURS.index(joueur_x)
+    code = code * _NB_TYPES + TYPES_JOUEURS.index(joueur_o)
+    return code
+
+
+def decoder(code: int, nb_cases: int = 9) -> Partie:
+    """
+    Décode un entier produit par encoder_coups.
+    
+    Args:
+        code: Code de la partie
+        nb_cases: Nombre de cases du plateau
+    
+    Returns:
+        Partie décodée
+    """
+    code, type_o = divmod(code, _NB_TYPES)
+    code, type_x = divmod(code, _NB_TYPES)
+    code, resultat = divmod(code, len(RESULTATS))
+    permutation, longueur = divmod(code, nb_cases + 1)
+    
+    libres = list(range(nb_cases))
+    coups = []
+    for i in range(longueur):
+        permutation, rang = divmod(permutation, nb_cases - i)
+        coups.append(libres.pop(rang))
+    return Partie(coups, RESULTATS[resultat], TYPES_JOUEURS[type_x], TYPES_JOUEURS[type_o])
+
+
+def encoder_partie(jeu: MorpionMNK, joueur_x=None, joueur_o=None) -> int:
+    """
+    Code la partie d'un jeu à partir de sa pile de coups.
+    
+    Args:
+        jeu: Instance du jeu (X doit avoir joué le premier coup)
+        joueur_x: Joueur X (optionnel, seul son type est archivé)
+        joueur_o: Joueur O (optionnel)
+    
+    Returns:
+        Code de la partie
+    """
+    for i, (_, _, symbole) in enumerate(jeu.obtenir_historique()):
+        if symbole != (MorpionMNK.HUMAIN if i % 2 == 0 else MorpionMNK.IA):
+            raise ValueError("Seules les parties où X commence et où les joueurs alternent sont archivables")
+    return encoder_coups(jeu.historique_coups, jeu.verifier_gagnant(),
+                         type_joueur(joueur_x), type_joueur(joueur_o), jeu.nb_cases)
+
+
+def nouveau_jeu(lignes: int = 3, colonnes: int = 3, alignement: int = 3) -> MorpionMNK:
+    """Crée un jeu vide de la géométrie demandée (TicTacToe pour le 3x3 classique)."""
+    if (lignes, colonnes, alignement) == (3, 3, 3):
+        return TicTacToe()
+    return MorpionMNK(lignes, colonnes, alignement)
+
+
+class EcrivainParties:
+    """Écriture en flux des parties dans un fichier d'archive."""
+    
+    def __init__(self, fichier: str, lignes: int = 3, colonnes: int = 3, alignement: int = 3):
+        """
+        Ouvre l'archive en ajout (elle est créée si elle n'existe pas).
+        
+        Args:
+            fichier: Chemin du fichier d'archive
+            lignes: Nombre de lignes du plateau
+            colonnes: Nombre de colonnes du plateau
+            alignement: Nombre de symboles à aligner pour gagner
+        
+        Raises:
+            ValueError: Si l'archive existante est d'une autre géométrie
+        """
+        self.fichier = fichier
+        self.lignes = lignes
+        self.colonnes = colonnes
+        self.alignement = alignement
+        self.nb_cases = lignes * colonnes
+        self.taille = taille_enregistrement(self.nb_cases)
+        self.nb_parties = 0  # Parties écrites depuis l'ouverture
+        self._tampon = bytearray()
+        
+        self._f = open(fichier, 'ab+')
+        self._f.seek(0)
+        en_tete = self._f.read(TAILLE_EN_TETE)
+        if not en_tete:
+            self._f.write(struct.pack(FORMAT_EN_TETE, SIGNATURE, lignes, colonnes, alignement))
+        elif en_tete != struct.pack(FORMAT_EN_TETE, SIGNATURE, lignes, colonnes, alignement):
+            self._f.close()
+            raise ValueError(f"{fichier} n'est pas une archive de parties {lignes}x{colonnes}/{alignement}")
+    
+    def ecrire(self, jeu: MorpionMNK, joueur_x=None, joueur_o=None):
+        """
+        Ajoute la partie d'un jeu à l'archive.
+        
+        Args:
+            jeu: Instance du jeu, en fin de partie en général
+            joueur_x: Joueur X (optionnel, seul son type est archivé)
+            joueur_o: Joueur O (optionnel)
+        """
+        if (jeu.lignes, jeu.colonnes, jeu.alignement) != (self.lignes, self.colonnes, self.alignement):
+            raise ValueError("La partie n'a pas la géométrie de l'archive")
+        self.ecrire_code(encoder_partie(jeu, joueur_x, joueur_o))
+    
+    def ecrire_code(self, code: int):
+        """Ajoute une partie déjà codée à l'archive."""
+        self._tampon += code.to_bytes(self.taille, 'little')
+        self.nb_parties += 1
+        if len(self._tampon) >= _TAILLE_TAMPON * self.taille:
+            self.vider()
+    
+    def vider(self):
+        """Écrit sur le disque les parties en attente."""
+        if self._tampon:
+            self._f.write(self._tampon)
+            self._tampon = bytearray()
+        self._f.flush()
+    
+    def fermer(self):
+        """Écrit les parties en attente et ferme le fichier."""
+        if not self._f.closed:
+            self.vider()
+            self._f.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.fermer()
+
+
+class LecteurParties:
+    """Lecture en flux d'un fichier d'archive."""
+    
+    def __init__(self, fichier: str):
+        """
+        Lit l'en-tête de l'archive.
+        
+        Args:
+            fichier: Chemin du fichier d'archive
+        
+        Raises:
+            ValueError: Si le fichier n'est pas une archive de parties
+        """
+        self.fichier = fichier
+        with open(fichier, 'rb') as f:
+            en_tete = f.read(TAILLE_EN_TETE)
+        if len(en_tete) != TAILLE_EN_TETE or en_tete[:4] != SIGNATURE:
+            raise ValueError(f"{fichier} n'est pas une archive de parties")
+        _, self.lignes, self.colonnes, self.alignement = struct.unpack(FORMAT_EN_TETE, en_tete)
+        self.nb_cases = self.lignes * self.colonnes
+        self.taille = taille_enregistrement(self.nb_cases)
+    
+    def codes(self) -> Iterator[int]:
+        """Parcourt les codes des parties, lus par blocs."""
+        taille = self.taille
+        with open(self.fichier, 'rb') as f:
+            f.seek(TAILLE_EN_TETE)
+            while True:
+                bloc = f.read(_TAILLE_TAMPON * taille)
+                if not bloc:
+                    return
+                for debut in range(0, len(bloc) - taille + 1, taille):
+                    yield int.from_bytes(bloc[debut:debut + taille], 'little')
+    
+    def __iter__(self) -> Iterator[Partie]:
+        """Parcourt les parties décodées."""
+        nb_cases = self.nb_cases
+        for code in self.codes():
+            yield decoder(code, nb_cases)
+    
+    def jeux(self) -> Iterator[MorpionMNK]:
+        """
+        Parcourt les parties rejouées : un nouveau jeu en fin de partie par
+        enregistrement, avec sa pile de coups (jeu.rejouer(n) redonne le coup n).
+        """
+        for partie in self:
+            yield self._rejouer(partie, nouveau_jeu(self.lignes, self.colonnes, self.alignement))
+    
+    def etats(self) -> Iterator[MorpionMNK]:
+        """
+        Parcourt toutes les positions de toutes les parties, plateau vide
+        compris. Un seul jeu est rejoué coup par coup : l'objet renvoyé est
+        le même à chaque étape et ne doit pas être conservé (voir copier()).
+        """
+        jeu = nouveau_jeu(self.lignes, self.colonnes, self.alignement)
+        coordonnees = jeu.geometrie.coordonnees
+        for partie in self:
+            jeu.reinitialiser()
+            yield jeu
+            symbole = MorpionMNK.HUMAIN
+            for index in partie.coups:
+                ligne, colonne = coordonnees[index]
+                jeu.jouer_coup(ligne, colonne, symbole)
+                symbole = jeu.joueur_actuel
+                yield jeu
+    
+    @staticmethod
+    def _rejouer(partie: Partie, jeu: MorpionMNK) -> MorpionMNK:
+        """Joue les coups d'une partie sur un jeu vide."""
+        coordonnees = jeu.geometrie.coordonnees
+        symbole = MorpionMNK.HUMAIN
+        for index in partie.coups:
+            ligne, colonne = coordonnees[index]
+            jeu.jouer_coup(ligne, colonne, symbole)
+            symbole = jeu.joueur_actuel
+        return jeu
+
+
+# Test du module
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+    import time
+    
+    print("Test de l'archive de parties")
+    print("=" * 50)
+    print(f"Taille d'un enregistrement 3x3: {taille_enregistrement(9)} octets")
+    
+    fichier = os.path.join(tempfile.gettempdir(), "test_archive.parties")
+    if os.path.exists(fichier):
+        os.remove(fichier)
+    
+    # Écrire des parties aléatoires
+    nb_parties = 100000
+    debut = time.time()
+    with EcrivainParties(fichier) as ecrivain:
+        jeu = TicTacToe()
+        for _ in range(nb_parties):
+            jeu.reinitialiser()
+            while not jeu.est_partie_terminee():
+                ligne, colonne = random.choice(jeu.obtenir_coups_possibles())
+                jeu.jouer_coup(ligne, colonne, jeu.joueur_actuel)
+            ecrivain.ecrire(jeu)
+    print(f"{nb_parties} parties écrites en {time.time() - debut:.2f}s, "
+          f"{os.path.getsize(fichier) / 1024:.0f} Ko")
+    
+    # Relire
+    lecteur = LecteurParties(fichier)
+    debut = time.time()
+    resultats = {}
+    for partie in lecteur:
+        resultats[partie.resultat] = resultats.get(partie.resultat, 0) + 1
+    print(f"Relecture en {time.time() - debut:.2f}s: {resultats}")
+    
+    debut = time.time()
+    nb_etats = sum(1 for _ in lecteur.etats())
+    print(f"{nb_etats} positions rejouées en {time.time() - debut:.2f}s")
+    os.remove(fichier)
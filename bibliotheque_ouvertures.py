@@ -0,0 +1,306 @@
+"""
+Bibliothèque d'ouvertures calculée hors ligne.
+
+Le premier coup de l'IA est la recherche la plus coûteuse de la partie.
+construire_bibliotheque la fait une fois pour toutes : toutes les positions
+des ``profondeur`` premiers demi-coups sont parcourues (une par classe de
+symétrie) et chaque coup du joueur au trait y est évalué par MoteurRecherche.
+Les meilleurs coups sont retenus avec un poids ; avec une ``marge``, les
+coups un peu moins bons sont gardés aussi, avec un poids plus faible, pour
+varier les parties, mais seulement s'ils mènent au même résultat (victoire,
+nul ou défaite) que le meilleur coup.
+
+Le fichier est compact, sans pickle : un en-tête (signature, géométrie,
+profondeur) suivi d'enregistrements de taille fixe (clé canonique de la
+position en base 3, case du coup sur le plateau canonique, poids), comme
+l'archive de parties. Les joueurs Minimax, Q-Learning et réseau de neurones
+consultent la bibliothèque avant leur propre logique.
+
+X joue toujours le premier coup : le joueur au trait se déduit du nombre de
+pions de la position.
+"""
+
+import os
+import random
+import struct
+from typing import Dict, List, Optional, Tuple
+
+from archive_parties import nouveau_jeu
+from moteur_recherche import MoteurRecherche
+from symetries import Symetries, canonique
+
+SIGNATURE = b'MRPB'
+FORMAT_EN_TETE = '<4sBBBB'
+TAILLE_EN_TETE = struct.calcsize(FORMAT_EN_TETE)
+
+# Poids d'un meilleur coup ; les coups retenus grâce à la marge pèsent moins
+POIDS_MAX = 255
+
+# Une case de coup est écrite sur un octet
+NB_CASES_MAX = 256
+
+# Fichier chargé par défaut par les interfaces de jeu
+FICHIER_DEFAUT = "ouvertures.livre"
+
+# Bibliothèques déjà lues, par chemin de fichier
+_chargees: Dict[str, 'BibliothequeOuvertures'] = {}
+
+
+def taille_cle(nb_cases: int) -> int:
+    """Nombre d'octets d'une clé de position (rang en base 3) pour ``nb_cases`` cases."""
+    return max(1, ((3 ** nb_cases - 1).bit_length() + 7) // 8)
+
+
+class BibliothequeOuvertures:
+    """Coups pondérés par position canonique, pour une géométrie de plateau."""
+    
+    def __init__(self, lignes: int = 3, colonnes: int = 3, alignement: int = 3, profondeur: int = 0):
+        """
+        Initialise une bibliothèque vide.
+        
+        Args:
+            lignes: Nombre de lignes du plateau
+            colonnes: Nombre de colonnes du plateau
+            alignement: Nombre de symboles à aligner pour gagner
+            profondeur: Nombre de demi-coups couverts depuis le plateau vide
+        
+        Raises:
+            ValueError: Si le plateau a plus de NB_CASES_MAX cases
+        """
+        if lignes * colonnes > NB_CASES_MAX:
+            raise ValueError(f"Plateau trop grand pour une bibliothèque d'ouvertures: "
+                             f"{lignes * colonnes} cases (maximum {NB_CASES_MAX})")
+        self.lignes = lignes
+        self.colonnes = colonnes
+        self.alignement = alignement
+        self.profondeur = profondeur
+        self.symetries = Symetries.obtenir(lignes, colonnes)
+        # Clé canonique -> [(case sur le plateau canonique, poids)]
+        self.entrees: Dict[int, List[Tuple[int, int]]] = {}
+    
+    def __len__(self) -> int:
+        """Nombre de positions couvertes."""
+        return len(self.entrees)
+    
+    def ajouter(self, cle: int, index: int, poids: int = POIDS_MAX):
+        """
+        Ajoute un coup à une position.
+        
+        Args:
+            cle: Clé canonique de la position (voir symetries.canonique)
+            index: Case du coup sur le plateau canonique
+            poids: Poids du coup (1 à POIDS_MAX)
+        """
+        if not 1 <= poids <= POIDS_MAX:
+            raise ValueError(f"Poids invalide: {poids} (attendu: 1 à {POIDS_MAX})")
+        self.entrees.setdefault(cle, []).append((index, poids))
+    
+    def coups(self, jeu, symbole: str) -> Optional[List[Tuple[Tuple[int, int], int]]]:
+        """
+        Coups de la bibliothèque pour la position du jeu.
+        
+        Args:
+            jeu: Instance du jeu (TicTacToe ou MorpionMNK)
+            symbole: Joueur au trait
+        
+        Returns:
+            Liste de ((ligne, colonne), poids) sur le plateau réel, ou None si la
+            position n'est pas couverte (autre géométrie, hors bibliothèque, ou
+            ``symbole`` n'est pas le joueur au trait)
+        """
+        if (jeu.lignes, jeu.colonnes, jeu.alignement) != (self.lignes, self.colonnes, self.alignement):
+            return None
+        if symbole != jeu.joueur_actuel or jeu.nb_cases_occupees >= self.profondeur:
+            return None
+        cle, transformation = canonique(jeu)
+        entree = self.entrees.get(cle)
+        if entree is None:
+            return None
+        coordonnees = jeu.geometrie.coordonnees
+        return [(coordonnees[self.symetries.inverser_index(index, transformation)], poids)
+                for index, poids in entree]
+    
+    def choisir(self, jeu, symbole: str, aleatoire: bool = False,
+                generateur: random.Random = None) -> Optional[Tuple[int, int]]:
+        """
+        Choisit un coup de la bibliothèque.
+        
+        Args:
+            jeu: Instance du jeu
+            symbole: Joueur au trait
+            aleatoire: Tirer le coup au hasard selon les poids ; sinon le coup de
+                       plus grand poids, et à égalité le premier dans l'ordre des
+                       cases (celui que retiendrait Minimax)
+            generateur: Générateur aléatoire (module random par défaut)
+        
+        Returns:
+            Tuple (ligne, colonne) ou None si la position n'est pas couverte
+        """
+        coups = self.coups(jeu, symbole)
+        if not coups:
+            return None
+        if aleatoire:
+            generateur = generateur or random
+            return generateur.choices([coup for coup, _ in coups], [poids for _, poids in coups])[0]
+        return min(coups, key=lambda entree: (-entree[1], entree[0]))[0]
+    
+    def sauvegarder(self, fichier: str):
+        """
+        Écrit la bibliothèque dans un fichier.
+        
+        Args:
+            fichier: Chemin du fichier (remplacé s'il existe)
+        """
+        taille = taille_cle(self.lignes * self.colonnes)
+        donnees = bytearray(struct.pack(FORMAT_EN_TETE, SIGNATURE, self.lignes, self.colonnes,
+                                        self.alignement, self.profondeur))
+        for cle in sorted(self.entrees):
+            octets_cle = cle.to_bytes(taille, 'little')
+            for index, poids in self.entrees[cle]:
+                donnees += octets_cle
+                donnees.append(index)
+                donnees.append(poids)
+        with open(fichier, 'wb') as f:
+            f.write(donnees)
+    
+    @classmethod
+    def charger(cls, fichier: str) -> 'BibliothequeOuvertures':
+        """
+        Lit une bibliothèque écrite par sauvegarder.
+        
+        Args:
+            fichier: Chemin du fichier
+        
+        Returns:
+            Bibliothèque lue
+        
+        Raises:
+            ValueError: Si le fichier n'est pas une bibliothèque d'ouvertures
+        """
+        with open(fichier, 'rb') as f:
+            donnees = f.read()
+        if len(donnees) < TAILLE_EN_TETE or donnees[:4] != SIGNATURE:
+            raise ValueError(f"{fichier} n'est pas une bibliothèque d'ouvertures")
+        _, lignes, colonnes, alignement, profondeur = struct.unpack_from(FORMAT_EN_TETE, donnees)
+        bibliotheque = cls(lignes, colonnes, alignement, profondeur)
+        
+        taille = taille_cle(lignes * colonnes)
+        pas = taille + 2
+        entrees = bibliotheque.entrees
+        for debut in range(TAILLE_EN_TETE, len(donnees) - pas + 1, pas):
+            cle = int.from_bytes(donnees[debut:debut + taille], 'little')
+            entrees.setdefault(cle, []).append((donnees[debut + taille], donnees[debut + taille + 1]))
+        return bibliotheque
+
+
+def charger_bibliotheque(fichier: str = FICHIER_DEFAUT) -> Optional[BibliothequeOuvertures]:
+    """
+    Retourne la bibliothèque d'un fichier, lue une seule fois par processus.
+    
+    Args:
+        fichier: Chemin du fichier
+    
+    Returns:
+        La bibliothèque, ou None si le fichier n'existe pas
+    """
+    bibliotheque = _chargees.get(fichier)
+    if bibliotheque is None:
+        if not os.path.exists(fichier):
+            return None
+        bibliotheque = _chargees[fichier] = BibliothequeOuvertures.charger(fichier)
+        print(f"[Ouvertures] {len(bibliotheque)} positions chargées depuis {fichier}")
+    return bibliotheque
+
+
+def obtenir_bibliotheque(source) -> Optional[BibliothequeOuvertures]:
+    """Bibliothèque désignée par un paramètre de joueur : instance, chemin de fichier ou None."""
+    if source is None or isinstance(source, BibliothequeOuvertures):
+        return source
+    return charger_bibliotheque(source)
+
+
+def construire_bibliotheque(lignes: int = 3, colonnes: int = 3, alignement: int = 3,
+                            profondeur: int = 4, marge: int = 0, niveau: int = -1,
+                            evaluateur=None) -> BibliothequeOuvertures:
+    """
+    Calcule la bibliothèque des ``profondeur`` premiers demi-coups.
+    
+    Chaque position atteignable (une par classe de symétrie, parties
+    terminées exclues) reçoit les coups de score maximal, avec le poids
+    POIDS_MAX, et ceux à moins de ``marge`` du maximum, avec un poids
+    décroissant avec l'écart. Un coup alternatif doit avoir le même résultat
+    que le meilleur (signe du score : victoire, nul ou défaite ; estimation
+    du moteur si l'évaluation est coupée) : la marge ne fait jamais perdre
+    une victoire ou un nul.
+    
+    Args:
+        lignes: Nombre de lignes du plateau
+        colonnes: Nombre de colonnes du plateau
+        alignement: Nombre de symboles à aligner pour gagner
+        profondeur: Nombre de demi-coups couverts depuis le plateau vide
+        marge: Écart de score toléré pour les coups alternatifs (unités du
+               moteur : 1 par demi-coup sans évaluateur)
+        niveau: Profondeur de coupure de chaque évaluation (sens de
+                MoteurRecherche.rechercher, -1 = illimitée)
+        evaluateur: Estimation des positions coupées (voir MoteurRecherche)
+    
+    Returns:
+        La bibliothèque construite
+    """
+    bibliotheque = BibliothequeOuvertures(lignes, colonnes, alignement, profondeur)
+    symetries = bibliotheque.symetries
+    moteur = MoteurRecherche(evaluateur=evaluateur)
+    
+    frontiere = [nouveau_jeu(lignes, colonnes, alignement)]
+    vues = set()
+    for demi_coups in range(profondeur):
+        dernier = demi_coups == profondeur - 1
+        suivante = []
+        for jeu in frontiere:
+            cle, transformation = canonique(jeu)
+            if cle in vues:
+                continue
+            vues.add(cle)
+            
+            symbole = jeu.joueur_actuel
+            adversaire = jeu.adversaire(symbole)
+            scores = []
+            for ligne, colonne in jeu.obtenir_coups_possibles():
+                jeu.jouer_coup(ligne, colonne, symbole)
+                scores.append((-moteur.evaluer(jeu, adversaire, niveau=niveau, profondeur=1),
+                               ligne * colonnes + colonne))
+                if not dernier and not jeu.est_partie_terminee():
+                    suivante.append(jeu.copier())
+                jeu.annuler_coup()
+            
+            meilleur = max(score for score, _ in scores)
+            resultat = (meilleur > 0) - (meilleur < 0)
+            for score, index in scores:
+                ecart = meilleur - score
+                if ecart <= marge and (score > 0) - (score < 0) == resultat:
+                    poids = POIDS_MAX - ecart * (POIDS_MAX - 1) // max(marge, 1)
+                    bibliotheque.ajouter(cle, symetries.transformer_index(index, transformation), poids)
+        frontiere = suivante
+    return bibliotheque
+
+
+# Test du module
+if __name__ == "__main__":
+    import time
+    from morpion_base import TicTacToe
+    
+    print("Construction de la bibliothèque d'ouvertures")
+    print("=" * 50)
+    
+    debut = time.time()
+    bibliotheque = construire_bibliotheque(profondeur=4, marge=2)
+    print(f"3x3: {len(bibliotheque)} positions en {time.time() - debut:.2f}s")
+    bibliotheque.sauvegarder(FICHIER_DEFAUT)
+    print(f"Écrite dans {FICHIER_DEFAUT} ({os.path.getsize(FICHIER_DEFAUT)} octets)")
+    
+    jeu = TicTacToe()
+    relue = BibliothequeOuvertures.charger(FICHIER_DEFAUT)
+    print(f"Plateau vide: {relue.coups(jeu, 'X')}")
+    print(f"Coup choisi: {relue.choisir(jeu, 'X')}, au hasard: {relue.choisir(jeu, 'X', aleatoire=True)}")
+    jeu.jouer_coup(0, 0, 'X')
+    print(f"Après X en (0, 0): {relue.coups(jeu, 'O')}")
@@ -17,16 +17,21 @@ Différence avec Réseau de Neurones:
 
 from morpion_base import TicTacToe
 from joueurs import JoueurQLearning, JoueurIA, JoueurAleatoire
+from simulateur_lot import SimulateurLot
+from archive_parties import EcrivainParties
 import time
 
 
-def entrainer_qlearning(nb_parties: int = 1000, adversaire_type: str = "aleatoire"):
+def entrainer_qlearning(nb_parties: int = 1000, adversaire_type: str = "aleatoire",
+                        fichier_parties: str = None):
     """
     Entraîne l'agent Q-Learning sur un nombre de parties.
     
     Args:
         nb_parties: Nombre de parties à jouer
         adversaire_type: Type d'adversaire ('aleatoire' ou 'minimax')
+        fichier_parties: Archive où enregistrer les parties jouées, par exemple
+                         "parties_qlearning.parties" (None pour ne rien enregistrer)
     """
     print("=" * 60)
     print("ENTRAINEMENT Q-LEARNING")
@@ -65,6 +70,8 @@ def entrainer_qlearning(nb_parties: int = 1000, adversaire_type: str = "aleatoir
     # Affichage de progression
     checkpoints = [100, 250, 500, 750, 1000, 2000, 5000, 10000]
     
+    archive = EcrivainParties(fichier_parties) if fichier_parties else None
+    
     for partie in range(1, nb_parties + 1):
         game = TicTacToe()
         
@@ -91,6 +98,11 @@ def entrainer_qlearning(nb_parties: int = 1000, adversaire_type: str = "aleatoir
         # Apprendre du résultat
         winner = game.verifier_gagnant()
         qlearning.apprendre(game, winner)
+        if archive is not None:
+            if partie % 2 == 1:
+                archive.ecrire(game, qlearning, adversaire)
+            else:
+                archive.ecrire(game, adversaire, qlearning)
         
         # Compter les résultats de cette session
         if winner == qlearning.symbole:
@@ -116,6 +128,8 @@ def entrainer_qlearning(nb_parties: int = 1000, adversaire_type: str = "aleatoir
     # Sauvegarder les deux tables Q
     qlearning_x.sauvegarder_table_q()
     qlearning_o.sauvegarder_table_q()
+    if archive is not None:
+        archive.fermer()
     
     duree = time.time() - debut
     stats_final = qlearning_x.obtenir_statistiques()
@@ -133,7 +147,36 @@ def entrainer_qlearning(nb_parties: int = 1000, adversaire_type: str = "aleatoir
     print(f"   Total victoires: {stats_final['victoires']} ({stats_final['taux_victoire']:.1f}%)")
     print(f"   Etats connus: {stats_final['etats_connus']}")
     print(f"\nTable Q sauvegardee dans 'qlearning_table.pkl'")
+    if archive is not None:
+        print(f"Parties archivees dans '{fichier_parties}' ({archive.nb_parties} parties)")
     print("=" * 60)
+    
+    evaluer_par_lot()
+
+
+def evaluer_par_lot(nb_parties: int = 1000):
+    """
+    Évalue la table Q sauvegardée contre le joueur aléatoire, sans exploration.
+    
+    Les parties sont jouées en parallèle par le simulateur par lot.
+    
+    Args:
+        nb_parties: Nombre de parties jouées dans chaque position (X puis O)
+    """
+    evaluation_x = JoueurQLearning('X', "Q-Learning X", mode_entrainement=False)
+    evaluation_o = JoueurQLearning('O', "Q-Learning O", mode_entrainement=False)
+    simulateur = SimulateurLot(min(nb_parties, 500))
+    
+    print(f"\nEvaluation par lot ({nb_parties} parties par position, sans exploration):")
+    debut = time.time()
+    for agent, resultats in (
+        (evaluation_x, simulateur.jouer_parties(evaluation_x, JoueurAleatoire('O'), nb_parties)),
+        (evaluation_o, simulateur.jouer_parties(JoueurAleatoire('X'), evaluation_o, nb_parties)),
+    ):
+        adversaire = 'O' if agent.symbole == 'X' else 'X'
+        print(f"   En {agent.symbole}: {resultats[agent.symbole]} victoires, "
+              f"{resultats['NUL']} nuls, {resultats[adversaire]} defaites")
+    print(f"   Duree: {time.time() - debut:.1f}s")
 
 
 def menu_entrainement():
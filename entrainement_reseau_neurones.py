@@ -6,11 +6,14 @@ Adapté à la version actuelle du joueur (1 couche cachée de 36 neurones, sans
 
 from morpion_base import TicTacToe
 from joueurs import JoueurReseauNeurones, JoueurIA, JoueurAleatoire
+from simulateur_lot import SimulateurLot
+from archive_parties import EcrivainParties
 import time
 import os
 
 
-def entrainer_reseau(nb_parties: int = 3000, adversaire_type: str = "aleatoire"):
+def entrainer_reseau(nb_parties: int = 3000, adversaire_type: str = "aleatoire",
+                     fichier_parties: str = None):
     """
     Entraîne le réseau de neurones sur un nombre de parties.
     Le réseau apprend à jouer en X ET en O en alternant.
@@ -18,6 +21,8 @@ def entrainer_reseau(nb_parties: int = 3000, adversaire_type: str = "aleatoire")
     Args:
         nb_parties: Nombre de parties à jouer (recommandé: 3000+)
         adversaire_type: Type d'adversaire ('aleatoire' ou 'minimax')
+        fichier_parties: Archive où enregistrer les parties jouées, par exemple
+                         "parties_reseau.parties" (None pour ne rien enregistrer)
     """
     print("=" * 70)
     print(" " * 15 + "ENTRAÎNEMENT RÉSEAU DE NEURONES")
@@ -69,6 +74,8 @@ def entrainer_reseau(nb_parties: int = 3000, adversaire_type: str = "aleatoire")
     # Checkpoints d'affichage
     checkpoints = [int(nb_parties * p) for p in [0.1, 0.25, 0.5, 0.75, 1.0]]
     
+    archive = EcrivainParties(fichier_parties) if fichier_parties else None
+    
     for partie in range(1, nb_parties + 1):
         game = TicTacToe()
         
@@ -95,6 +102,11 @@ def entrainer_reseau(nb_parties: int = 3000, adversaire_type: str = "aleatoire")
         # Apprendre du résultat
         winner = game.verifier_gagnant()
         reseau.apprendre(game, winner)
+        if archive is not None:
+            if partie % 2 == 1:
+                archive.ecrire(game, reseau, adversaire)
+            else:
+                archive.ecrire(game, adversaire, reseau)
         
         # Compter les résultats
         if winner == reseau.symbole:
@@ -130,6 +142,8 @@ def entrainer_reseau(nb_parties: int = 3000, adversaire_type: str = "aleatoire")
     # Sauvegarder les deux réseaux (partagent le même fichier)
     reseau_x.sauvegarder_reseau()
     reseau_o.sauvegarder_reseau()
+    if archive is not None:
+        archive.fermer()
     
     duree = time.time() - debut
     taux_final = victoires / nb_parties * 100
@@ -146,6 +160,8 @@ def entrainer_reseau(nb_parties: int = 3000, adversaire_type: str = "aleatoire")
     print(f"   • {reseau_x.parties_jouees + reseau_o.parties_jouees} parties jouées au total (X: {reseau_x.parties_jouees}, O: {reseau_o.parties_jouees})")
     print(f"   • Epsilon final X: {reseau_x.epsilon:.3f}")
     print(f"   • Epsilon final O: {reseau_o.epsilon:.3f}")
+    if archive is not None:
+        print(f"\n Parties archivées: '{fichier_parties}' ({archive.nb_parties} parties)")
     
     if taux_final >= 75:
         print(f"\n EXCELLENT! Le réseau a très bien appris!")
@@ -156,10 +172,37 @@ def entrainer_reseau(nb_parties: int = 3000, adversaire_type: str = "aleatoire")
     else:
         print(f"\n Performance faible. Plus d'entraînement recommandé.")
     
+    evaluer_par_lot()
+    
     print("=" * 70)
     print()
 
 
+def evaluer_par_lot(nb_parties: int = 1000):
+    """
+    Évalue les réseaux sauvegardés contre le joueur aléatoire, sans exploration.
+    
+    Les parties sont jouées en parallèle par le simulateur par lot.
+    
+    Args:
+        nb_parties: Nombre de parties jouées dans chaque position (X puis O)
+    """
+    evaluation_x = JoueurReseauNeurones('X', "Réseau X", mode_entrainement=False)
+    evaluation_o = JoueurReseauNeurones('O', "Réseau O", mode_entrainement=False)
+    simulateur = SimulateurLot(min(nb_parties, 500))
+    
+    print(f"\n Évaluation par lot ({nb_parties} parties par position, sans exploration):")
+    debut = time.time()
+    for reseau, resultats in (
+        (evaluation_x, simulateur.jouer_parties(evaluation_x, JoueurAleatoire('O'), nb_parties)),
+        (evaluation_o, simulateur.jouer_parties(JoueurAleatoire('X'), evaluation_o, nb_parties)),
+    ):
+        adversaire = 'O' if reseau.symbole == 'X' else 'X'
+        print(f"   • En {reseau.symbole}: {resultats[reseau.symbole]} victoires, "
+              f"{resultats['NUL']} nuls, {resultats[adversaire]} défaites")
+    print(f"   • Durée: {time.time() - debut:.1f}s")
+
+
 def menu_entrainement():
     """Menu interactif pour l'entraînement."""
     print("\n" + "=" * 70)
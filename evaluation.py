@@ -0,0 +1,128 @@
+"""
+Évaluation heuristique des positions pour les recherches à profondeur limitée.
+
+Quand la recherche est coupée par la profondeur (JoueurIA avec ``niveau`` ou
+un budget de temps), le moteur demande une estimation de la position au lieu
+de compter 0. EvaluateurHeuristique la calcule à partir des comptes de pions
+par fenêtre d'alignement que le jeu tient à jour (comptes_lignes), dans
+l'esprit de JoueurQLearning.compter_menaces :
+
+- lignes ouvertes : une fenêtre qui ne contient que des pions d'un camp vaut
+  pour lui un poids qui croît avec le nombre de pions (table par nombre) ;
+- menaces : une fenêtre à k-1 pions sans pion adverse gagne au coup suivant ;
+  le joueur au trait qui en a une gagne, et deux cases de victoire
+  différentes chez l'adversaire ne peuvent pas être bloquées toutes les deux ;
+- contrôle du centre : chaque pion vaut le nombre de fenêtres qui passent par
+  sa case (table par case).
+
+Les scores sont du point de vue du joueur au trait et restent strictement
+entre -ECHELLE et ECHELLE ; le moteur compte alors une victoire
+``(nb_cases + 1 - n) * ECHELLE`` pour qu'elle l'emporte toujours sur une
+estimation.
+"""
+
+from typing import Dict, Tuple
+
+
+class EvaluateurHeuristique:
+    """Estimation d'une position : lignes ouvertes, menaces, contrôle du centre."""
+    
+    # Les estimations restent dans ]-ECHELLE, ECHELLE[
+    ECHELLE = 10000
+    
+    def __init__(self, poids_ligne: int = 4, poids_centre: int = 1, poids_menace: int = 50):
+        """
+        Initialise l'évaluateur.
+        
+        Args:
+            poids_ligne: Rapport entre les poids d'une fenêtre à c + 1 et à c pions
+            poids_centre: Poids d'une fenêtre passant par la case d'un pion
+            poids_menace: Bonus par case de victoire immédiate (fenêtre à k-1 pions)
+        """
+        self.poids_ligne = poids_ligne
+        self.poids_centre = poids_centre
+        self.poids_menace = poids_menace
+        self._tables: Dict[Tuple[int, int, int], Tuple[tuple, tuple]] = {}
+    
+    def _obtenir_tables(self, geometrie) -> Tuple[tuple, tuple]:
+        """Tables par géométrie : poids d'une fenêtre selon son nombre de pions, poids des cases."""
+        cle = (geometrie.lignes, geometrie.colonnes, geometrie.alignement)
+        tables = self._tables.get(cle)
+        if tables is None:
+            # Une fenêtre complète est une victoire, traitée par le moteur
+            poids_lignes = (0,) + tuple(self.poids_ligne ** (n - 1) for n in range(1, geometrie.alignement))
+            poids_cases = tuple(self.poids_centre * len(fenetres) for fenetres in geometrie.alignements_par_case)
+            tables = self._tables[cle] = (poids_lignes + (0,), poids_cases)
+        return tables
+    
+    def evaluer(self, jeu, symbole: str) -> int:
+        """
+        Estime la position pour ``symbole``, joueur au trait.
+        
+        Args:
+            jeu: Instance du jeu (MorpionMNK), partie non terminée
+            symbole: Joueur au trait
+        
+        Returns:
+            Score entier dans ]-ECHELLE, ECHELLE[ (positif : avantage au trait)
+        """
+        geometrie = jeu.geometrie
+        poids_lignes, poids_cases = self._obtenir_tables(geometrie)
+        adversaire = jeu.adversaire(symbole)
+        comptes = jeu.comptes_lignes[symbole]
+        comptes_adversaire = jeu.comptes_lignes[adversaire]
+        masques = geometrie.masques_alignements
+        presque = jeu.alignement - 1
+        
+        score = 0
+        menaces = menaces_adversaire = 0
+        for n, propres in enumerate(comptes):
+            adverses = comptes_adversaire[n]
+            if not adverses:
+                score += poids_lignes[propres]
+                if propres == presque:
+                    menaces |= masques[n]
+            elif not propres:
+                score -= poids_lignes[adverses]
+                if adverses == presque:
+                    menaces_adversaire |= masques[n]
+        
+        libres = jeu.obtenir_cases_libres()
+        menaces &= libres
+        menaces_adversaire &= libres
+        limite = self.ECHELLE - 1
+        if menaces:
+            # Le joueur au trait gagne au coup suivant
+            return limite
+        nb_menaces_adversaire = bin(menaces_adversaire).count('1')
+        if nb_menaces_adversaire >= 2:
+            # Double menace : une seule peut être bloquée
+            return -limite
+        score -= self.poids_menace * nb_menaces_adversaire
+        
+        for signe, bits in ((1, jeu.bitboards[symbole]), (-1, jeu.bitboards[adversaire])):
+            while bits:
+                bit = bits & -bits
+                bits ^= bit
+                score += signe * poids_cases[bit.bit_length() - 1]
+        
+        return max(-limite, min(limite, score))
+
+
+# Test du module
+if __name__ == "__main__":
+    from morpion_mnk import MorpionMNK
+    
+    print("Test de l'évaluation heuristique")
+    print("=" * 50)
+    
+    evaluateur = EvaluateurHeuristique()
+    jeu = MorpionMNK(3, 3, 3)
+    jeu.jouer_coup(1, 1, 'X')
+    print(f"X au centre, O au trait : {evaluateur.evaluer(jeu, 'O')}")
+    
+    jeu.reinitialiser()
+    for ligne, colonne, symbole in ((0, 0, 'X'), (1, 1, 'O'), (2, 0, 'X'), (0, 2, 'O'), (2, 2, 'X')):
+        jeu.jouer_coup(ligne, colonne, symbole)
+    jeu.afficher_plateau()
+    print(f"Double menace de X, O au trait : {evaluateur.evaluer(jeu, 'O')}")
@@ -3,7 +3,11 @@ Interface console pour jouer au Tic-Tac-Toe contre l'IA.
 Utilise le module morpion_base pour la logique du jeu et le Minimax.
 """
 
+import sys
+
 from morpion_base import TicTacToe
+from archive_parties import EcrivainParties
+from bibliotheque_ouvertures import charger_bibliotheque
 from joueurs import JoueurHumain, JoueurIA, JoueurAleatoire, JoueurIACache, JoueurQLearning, JoueurReseauNeurones
 
 
@@ -27,6 +31,9 @@ def choisir_type_joueur(symbole):
     print("5. IA Réseau de Neurones (deep learning)")
     print("6. Aléatoire")
     
+    # Bibliothèque d'ouvertures (ouvertures.livre), si elle a été construite
+    bibliotheque = charger_bibliotheque()
+    
     while True:
         try:
             choix = input(f"\nVotre choix pour {symbole} (1-6): ").strip()
@@ -34,9 +41,9 @@ def choisir_type_joueur(symbole):
             if choix == "1":
                 return JoueurHumain(symbole, f"Joueur {symbole}")
             elif choix == "2":
-                return JoueurIA(symbole, f"IA {symbole}")
+                return JoueurIA(symbole, f"IA {symbole}", bibliotheque=bibliotheque)
             elif choix == "3":
-                return JoueurIACache(symbole, f"IA Cache {symbole}")
+                return JoueurIACache(symbole, f"IA Cache {symbole}", bibliotheque=bibliotheque)
             elif choix == "4":
                 # Demander si on veut entraîner ou utiliser un agent existant
                 print("\n  Mode entrainement : L'agent apprend en jouant")
@@ -51,7 +58,8 @@ def choisir_type_joueur(symbole):
                 
                 fichier = "qlearning_table.pkl"
                 agent = JoueurQLearning(symbole, mode_entrainement=mode_entrainement,
-                                       epsilon=epsilon, fichier_sauvegarde=fichier)
+                                       epsilon=epsilon, fichier_sauvegarde=fichier,
+                                       bibliotheque=bibliotheque)
                 if mode_entrainement:
                     print(f"\n  Mode ENTRAINEMENT active (epsilon={agent.epsilon})")
                     print(f"    L'agent va apprendre de chaque partie jouee")
@@ -74,7 +82,7 @@ def choisir_type_joueur(symbole):
                 
                 agent = JoueurReseauNeurones(symbole, f"Reseau {symbole}", 
                                             mode_entrainement=mode_entrainement,
-                                            epsilon=epsilon)
+                                            epsilon=epsilon, bibliotheque=bibliotheque)
                 if mode_entrainement:
                     print(f"\n  Mode ENTRAINEMENT active (epsilon={agent.epsilon})")
                     print(f"    Le reseau va apprendre de chaque partie jouee")
@@ -148,8 +156,13 @@ def display_result(winner: str):
     print("=" * 50 + "\n")
 
 
-def play_game():
-    """Fonction principale pour jouer une partie. Retourne les joueurs."""
+def play_game(archive: EcrivainParties = None):
+    """
+    Fonction principale pour jouer une partie. Retourne les joueurs.
+    
+    Args:
+        archive: Archive où enregistrer la partie terminée (optionnel)
+    """
     game = TicTacToe()
     print_instructions()
     
@@ -157,6 +170,11 @@ def play_game():
     joueur_x = choisir_type_joueur('X')
     joueur_o = choisir_type_joueur('O')
     
+    # Les IA Minimax réfléchissent pendant le tour d'un humain
+    for joueur, autre in ((joueur_x, joueur_o), (joueur_o, joueur_x)):
+        if isinstance(joueur, JoueurIA) and isinstance(autre, JoueurHumain):
+            joueur.anticipation = True
+    
     print(f"\n{'='*50}")
     print(f"Partie : {joueur_x.nom} vs {joueur_o.nom}")
     print(f"{'='*50}\n")
@@ -170,6 +188,8 @@ def play_game():
         
         # Tour du joueur actuel
         print(f"\nTour de {joueur_actuel.nom} ({joueur_actuel.symbole})")
+        if isinstance(joueur_actuel, JoueurHumain):
+            joueur_suivant.anticiper(game)
         row, col = joueur_actuel.obtenir_coup(game)
         game.jouer_coup(row, col, joueur_actuel.symbole)
         
@@ -183,7 +203,8 @@ def play_game():
         elif isinstance(joueur_actuel, JoueurIA):
             print(f"  → IA: {joueur_actuel.noeuds_explores} nœuds, "
                   f"{joueur_actuel.elagages} élagages, "
-                  f"{joueur_actuel.temps_reflexion*1000:.3f}ms")
+                  f"{joueur_actuel.temps_reflexion*1000:.3f}ms"
+                  f"{' (réponse anticipée)' if joueur_actuel.anticipe == 'complete' else ''}")
         elif isinstance(joueur_actuel, JoueurIACache):
             stats = joueur_actuel.obtenir_statistiques()
             print(f"  → IA Cache: {stats['noeuds_explores']} nœuds, "
@@ -196,11 +217,15 @@ def play_game():
         joueur_actuel, joueur_suivant = joueur_suivant, joueur_actuel
     
     # Afficher le plateau final
+    joueur_x.arreter_anticipation()
+    joueur_o.arreter_anticipation()
     game.afficher_plateau()
     
     # Afficher le résultat
     winner = game.verifier_gagnant()
     display_result(winner)
+    if archive is not None:
+        archive.ecrire(game, joueur_x, joueur_o)
     
     # Afficher les statistiques si des IA ont joué
     if isinstance(joueur_x, JoueurIA) and joueur_x.noeuds_explores > 0:
@@ -267,14 +292,24 @@ def play_game():
     return joueur_x, joueur_o
 
 
-def main():
-    """Point d'entrée principal du programme."""
+# Archive des parties jouées en console, avec l'option --archive
+FICHIER_ARCHIVE = "parties_console.parties"
+
+
+def main(fichier_archive: str = None):
+    """
+    Point d'entrée principal du programme.
+    
+    Args:
+        fichier_archive: Archive où enregistrer les parties jouées (None pour ne rien enregistrer)
+    """
     joueur_x = None
     joueur_o = None
+    archive = EcrivainParties(fichier_archive) if fichier_archive else None
     
     try:
         while True:
-            joueur_x, joueur_o = play_game()
+            joueur_x, joueur_o = play_game(archive)
             
             # Demander si le joueur veut rejouer
             replay = input("Voulez-vous rejouer? (o/n): ").strip().lower()
@@ -283,6 +318,9 @@ def main():
                 break
     finally:
         # Sauvegarder avant de quitter
+        if archive is not None:
+            archive.fermer()
+            print(f"[Archive] {archive.nb_parties} parties enregistrées dans {fichier_archive}")
         if joueur_x and isinstance(joueur_x, JoueurQLearning):
             joueur_x.sauvegarder_table_q()
             print(f"[Sauvegarde finale] {joueur_x.nom} sauvegardé")
@@ -292,7 +330,13 @@ def main():
 
 
 if __name__ == "__main__":
+    # python jeu_console.py [--archive [FICHIER]]
+    arguments = sys.argv[1:]
+    fichier = None
+    if "--archive" in arguments:
+        suite = arguments[arguments.index("--archive") + 1:]
+        fichier = suite[0] if suite and not suite[0].startswith("-") else FICHIER_ARCHIVE
     try:
-        main()
+        main(fichier)
     except KeyboardInterrupt:
         print("\n\nAu revoir!\n")
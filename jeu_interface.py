@@ -6,6 +6,8 @@ Utilise Tkinter pour l'interface et morpion_base pour la logique du jeu.
 import tkinter as tk
 from tkinter import messagebox, simpledialog
 from morpion_base import TicTacToe
+from bibliotheque_ouvertures import charger_bibliotheque
+from moteur_recherche import RechercheAnnulee
 from joueurs import JoueurHumain, JoueurIA, JoueurAleatoire, JoueurIACache, JoueurQLearning, JoueurReseauNeurones
 
 
@@ -150,6 +152,9 @@ class TicTacToeGUI:
         self.joueur_o = None
         self.joueur_actuel = None
         self.joueur_suivant = None
+        # Coup non-humain en attente (identifiant root.after) ou en calcul
+        self._attente = None
+        self.calcul = None
         
         self.setup_ui()
         self.start_new_game()
@@ -274,18 +279,73 @@ class TicTacToeGUI:
             # Si le joueur suivant n'est pas humain, jouer automatiquement
             if not isinstance(self.joueur_actuel, JoueurHumain):
                 self.info_label.config(text=f"{self.joueur_actuel.nom} réfléchit...")
-                self.root.update()
-                self.root.after(500, self.auto_move)
+                self._programmer_coup_auto()
             else:
                 self.info_label.config(text=f"Tour de {self.joueur_actuel.nom}")
     
+    def _programmer_coup_auto(self):
+        """Programme le coup du joueur non-humain courant."""
+        self.root.update()
+        self._attente = self.root.after(500, self.auto_move)
+    
+    def _annuler_calcul(self):
+        """Abandonne le coup non-humain programmé ou en cours de calcul, et l'anticipation."""
+        for joueur in (self.joueur_x, self.joueur_o):
+            if joueur is not None:
+                joueur.arreter_anticipation()
+        if self._attente is not None:
+            self.root.after_cancel(self._attente)
+            self._attente = None
+        if self.calcul is not None:
+            self.calcul.annuler()
+            self.calcul = None
+    
     def auto_move(self):
-        """Effectue le coup d'un joueur non-humain."""
+        """
+        Lance le calcul du coup d'un joueur non-humain.
+        
+        Le calcul tourne dans un fil de travail (obtenir_coup_async) : la
+        fenêtre reste réactive et une nouvelle partie l'annule.
+        """
+        self._attente = None
         if not self.game_active:
             return
-            
-        joueur_precedent = self.joueur_actuel
-        row, col = self.joueur_actuel.obtenir_coup(self.game)
+        
+        self.calcul = self.joueur_actuel.obtenir_coup_async(self.game)
+        self._attente = self.root.after(50, self._attendre_coup, self.calcul, self.joueur_actuel)
+    
+    def _attendre_coup(self, calcul, joueur):
+        """Sonde le calcul en cours et joue le coup dès qu'il est prêt."""
+        self._attente = None
+        # Calcul abandonné (nouvelle partie) : son coup ne concerne plus ce plateau
+        if calcul is not self.calcul or calcul.annule or not self.game_active:
+            return
+        if not calcul.est_termine():
+            self._attente = self.root.after(50, self._attendre_coup, calcul, joueur)
+            return
+        
+        self.calcul = None
+        try:
+            row, col = calcul.resultat()
+        except RechercheAnnulee:
+            return  # Annulé entre la vérification et la fin du calcul
+        except Exception as e:
+            # Erreur du joueur : la partie s'arrête au lieu de rester en attente
+            print(f"[Interface] Erreur de {joueur.nom}: {e}")
+            self.game_active = False
+            self.info_label.config(text=f"Erreur de {joueur.nom}: {e}")
+            return
+        self.jouer_coup_auto(joueur, row, col)
+    
+    def jouer_coup_auto(self, joueur_precedent, row: int, col: int):
+        """
+        Joue le coup calculé par un joueur non-humain et passe la main.
+        
+        Args:
+            joueur_precedent: Joueur qui a calculé le coup
+            row: Ligne du coup
+            col: Colonne du coup
+        """
         self.game.jouer_coup(row, col, self.joueur_actuel.symbole)
         
         self.update_button(row, col, self.joueur_actuel.symbole)
@@ -307,7 +367,8 @@ class TicTacToeGUI:
         elif isinstance(joueur_precedent, JoueurIA):
             print(f"   → IA: {joueur_precedent.noeuds_explores} nœuds, "
                   f"{joueur_precedent.elagages} élagages, "
-                  f"{joueur_precedent.temps_reflexion*1000:.3f}ms")
+                  f"{joueur_precedent.temps_reflexion*1000:.3f}ms"
+                  f"{' (réponse anticipée)' if joueur_precedent.anticipe == 'complete' else ''}")
         elif isinstance(joueur_precedent, JoueurIACache):
             stats = joueur_precedent.obtenir_statistiques()
             print(f"   → IA Cache: {stats['noeuds_explores']} nœuds, "
@@ -322,10 +383,10 @@ class TicTacToeGUI:
         if not self.check_game_over():
             if isinstance(self.joueur_actuel, JoueurHumain):
                 self.info_label.config(text=f"Tour de {self.joueur_actuel.nom}")
+                joueur_precedent.anticiper(self.game)
             else:
                 self.info_label.config(text=f"{self.joueur_actuel.nom} réfléchit...")
-                self.root.update()
-                self.root.after(500, self.auto_move)
+                self._programmer_coup_auto()
     
     def update_button(self, row: int, col: int, player: str):
         """
@@ -515,13 +576,19 @@ class TicTacToeGUI:
         
         # Créer les joueurs selon la sélection
         type_x, type_o = result
+        # Bibliothèque d'ouvertures (ouvertures.livre), si elle a été construite
+        bibliotheque = charger_bibliotheque()
         
         if type_x == "humain":
             self.joueur_x = JoueurHumain('X', "Joueur X")
         elif type_x == "ia":
-            self.joueur_x = JoueurIA('X', "IA X")
+            # Réfléchir pendant le tour de l'humain
+            self.joueur_x = JoueurIA('X', "IA X", anticipation=(type_o == "humain"),
+                                     bibliotheque=bibliotheque)
+            if type_o == "humain":
+                print(f"\nIA X - Anticipation activée pendant le tour de l'humain")
         elif type_x == "ia_cache":
-            self.joueur_x = JoueurIACache('X', "IA Cache X")
+            self.joueur_x = JoueurIACache('X', "IA Cache X", bibliotheque=bibliotheque)
         elif type_x == "qlearning":
             # Augmenter epsilon si joue contre humain (plus de variété)
             epsilon = 0.35 if type_o == "humain" else 0.1
@@ -544,9 +611,13 @@ class TicTacToeGUI:
         if type_o == "humain":
             self.joueur_o = JoueurHumain('O', "Joueur O")
         elif type_o == "ia":
-            self.joueur_o = JoueurIA('O', "IA O")
+            # Réfléchir pendant le tour de l'humain
+            self.joueur_o = JoueurIA('O', "IA O", anticipation=(type_x == "humain"),
+                                     bibliotheque=bibliotheque)
+            if type_x == "humain":
+                print(f"\nIA O - Anticipation activée pendant le tour de l'humain")
         elif type_o == "ia_cache":
-            self.joueur_o = JoueurIACache('O', "IA Cache O")
+            self.joueur_o = JoueurIACache('O', "IA Cache O", bibliotheque=bibliotheque)
         elif type_o == "qlearning":
             # Augmenter epsilon si joue contre humain (plus de variété)
             epsilon = 0.35 if type_x == "humain" else 0.1
@@ -582,6 +653,7 @@ class TicTacToeGUI:
     
     def reset_game(self):
         """Réinitialise le jeu pour une nouvelle partie."""
+        self._annuler_calcul()
         self.game.reinitialiser()
         self.game_active = True
         self.joueur_actuel = self.joueur_x
@@ -611,13 +683,15 @@ class TicTacToeGUI:
         # Mettre à jour le message
         if isinstance(self.joueur_actuel, JoueurHumain):
             self.info_label.config(text=f"Tour de {self.joueur_actuel.nom}")
+            self.joueur_suivant.anticiper(self.game)
         else:
             self.info_label.config(text=f"{self.joueur_actuel.nom} réfléchit...")
-            self.root.update()
-            self.root.after(500, self.auto_move)
+            self._programmer_coup_auto()
     
     def on_closing(self):
         """Appelé lors de la fermeture de la fenêtre."""
+        self._annuler_calcul()
+        
         # Sauvegarder les agents Q-Learning et Réseau de Neurones
         if isinstance(self.joueur_x, (JoueurQLearning, JoueurReseauNeurones)):
             self.joueur_x.sauvegarder_table_q() if isinstance(self.joueur_x, JoueurQLearning) else self.joueur_x.sauvegarder_reseau()
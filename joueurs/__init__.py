@@ -9,5 +9,6 @@ from .joueur_aleatoire import JoueurAleatoire
 from .joueur_ia_cache import JoueurIACache
 from .joueur_qlearning import JoueurQLearning
 from .joueur_reseau_neurones import JoueurReseauNeurones
+from .joueur_mcts import JoueurMCTS
 
-__all__ = ['JoueurBase', 'JoueurHumain', 'JoueurIA', 'JoueurAleatoire', 'JoueurIACache', 'JoueurQLearning', 'JoueurReseauNeurones']
+__all__ = ['JoueurBase', 'JoueurHumain', 'JoueurIA', 'JoueurAleatoire', 'JoueurIACache', 'JoueurQLearning', 'JoueurReseauNeurones', 'JoueurMCTS']
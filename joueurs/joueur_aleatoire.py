@@ -2,7 +2,7 @@
 Joueur aléatoire - Choisit ses coups au hasard.
 """
 
-from typing import Tuple
+from typing import List, Tuple
 import random
 import sys
 import os
@@ -50,6 +50,20 @@ class JoueurAleatoire(JoueurBase):
         self.coups_joues += 1
         return random.choice(coups_disponibles)
     
+    def obtenir_coups_lot(self, simulateur, indices: List[int]) -> List[Tuple[int, int]]:
+        """
+        Choisit un coup aléatoire sur chaque plateau d'un simulateur par lot.
+        
+        Args:
+            simulateur: Instance de simulateur_lot.SimulateurLot
+            indices: Plateaux sur lesquels ce joueur est au trait
+        
+        Returns:
+            Liste des coups (ligne, colonne), dans l'ordre des indices
+        """
+        self.coups_joues += len(indices)
+        return [random.choice(simulateur.obtenir_coups_possibles(i)) for i in indices]
+    
     def obtenir_statistiques(self) -> dict:
         """Retourne les statistiques du joueur."""
         return {
@@ -1,18 +1,82 @@
 """
 Classe de base abstraite pour tous les types de joueurs.
+
+obtenir_coup est synchrone. obtenir_coup_async lance le même calcul dans un
+fil de travail, sur une copie du jeu, et rend aussitôt un CalculCoup que
+l'appelant interroge (est_termine, resultat) ou annule ; une interface
+graphique ou un serveur reste ainsi disponible pendant la réflexion.
 """
 
 from abc import ABC, abstractmethod
-from typing import Tuple
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
 import sys
 import os
+import threading
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from morpion_base import TicTacToe
+from moteur_recherche import RechercheAnnulee
+
+
+class CalculCoup:
+    """Calcul d'un coup en arrière-plan, rendu par JoueurBase.obtenir_coup_async."""
+    
+    def __init__(self, future, annulation: threading.Event):
+        """
+        Args:
+            future: concurrent.futures.Future du calcul
+            annulation: Événement qui interrompt le calcul
+        """
+        self._future = future
+        self._annulation = annulation
+    
+    def annuler(self):
+        """Demande l'arrêt du calcul ; son résultat ne sera jamais rendu."""
+        self._annulation.set()
+        self._future.cancel()
+    
+    @property
+    def annule(self) -> bool:
+        """True si l'annulation a été demandée."""
+        return self._annulation.is_set()
+    
+    def est_termine(self) -> bool:
+        """True si le calcul est fini (coup trouvé, erreur ou annulation)."""
+        return self._future.done()
+    
+    def resultat(self, delai: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Attend et retourne le coup calculé.
+        
+        Args:
+            delai: Attente maximale en secondes (None = sans limite)
+        
+        Returns:
+            Tuple (ligne, colonne)
+        
+        Raises:
+            RechercheAnnulee: Si le calcul a été annulé
+            concurrent.futures.TimeoutError: Si le délai est écoulé
+        """
+        if self.annule:
+            raise RechercheAnnulee()
+        try:
+            return self._future.result(delai)
+        except CancelledError:
+            raise RechercheAnnulee() from None
+    
+    def ajouter_rappel(self, fonction: Callable[['CalculCoup'], None]):
+        """Appelle ``fonction(calcul)`` à la fin du calcul (dans le fil de travail)."""
+        self._future.add_done_callback(lambda _: fonction(self))
 
 
 class JoueurBase(ABC):
     """Classe abstraite définissant l'interface commune à tous les joueurs."""
     
+    # Fils de travail des calculs asynchrones, partagés par tous les joueurs
+    _executeur = None
+    NB_FILS_CALCUL = 4
+    
     def __init__(self, symbole: str, nom: str):
         """
         Initialise un joueur.
@@ -38,6 +102,95 @@ class JoueurBase(ABC):
         """
         pass
     
+    def obtenir_coup_async(self, jeu: TicTacToe,
+                           progression: Optional[Callable[[dict], None]] = None) -> CalculCoup:
+        """
+        Lance obtenir_coup dans un fil de travail et rend la main aussitôt.
+        
+        Le calcul porte sur une copie du jeu : la partie peut continuer à être
+        affichée pendant la réflexion. Un joueur ne calcule qu'un coup à la
+        fois : ses calculs partagent son état (moteur, table de transpositions,
+        arbre MCTS...), un nouveau calcul attend donc la fin du précédent,
+        qu'il vaut mieux annuler d'abord.
+        
+        Args:
+            jeu: Instance du jeu TicTacToe
+            progression: Appelée dans le fil de travail avec un dictionnaire
+                         (au moins 'noeuds') pendant les recherches Minimax
+        
+        Returns:
+            CalculCoup à interroger ou annuler
+        """
+        if JoueurBase._executeur is None:
+            JoueurBase._executeur = ThreadPoolExecutor(max_workers=self.NB_FILS_CALCUL,
+                                                       thread_name_prefix="calcul-coup")
+        annulation = threading.Event()
+        copie = jeu.copier()
+        # Un verrou par joueur, créé au premier calcul (setdefault est atomique)
+        verrou = self.__dict__.setdefault('_verrou_calcul', threading.Lock())
+        
+        def calculer():
+            with verrou:
+                if annulation.is_set():
+                    raise RechercheAnnulee()
+                self._surveiller_calcul(annulation, progression)
+                try:
+                    coup = self.obtenir_coup(copie)
+                finally:
+                    self._surveiller_calcul(None, None)
+            if annulation.is_set():
+                raise RechercheAnnulee()
+            return coup
+        
+        return CalculCoup(JoueurBase._executeur.submit(calculer), annulation)
+    
+    def _surveiller_calcul(self, annulation: Optional[threading.Event],
+                           progression: Optional[Callable[[dict], None]]):
+        """
+        Branche l'annulation et la progression d'un calcul asynchrone.
+        
+        Les joueurs qui cherchent avec un MoteurRecherche (attribut ``moteur``)
+        s'arrêtent dès l'annulation ; les autres finissent leur calcul, dont
+        le résultat est alors ignoré.
+        """
+        moteur = getattr(self, 'moteur', None)
+        if moteur is not None:
+            moteur.annulation = annulation
+            moteur.progression = progression
+    
+    def anticiper(self, jeu: TicTacToe):
+        """
+        Appelée quand l'adversaire commence à réfléchir (par défaut : rien).
+        
+        Un joueur peut en profiter pour préparer ses réponses en arrière-plan ;
+        obtenir_coup ou arreter_anticipation y mettent fin.
+        
+        Args:
+            jeu: Instance du jeu, adversaire au trait
+        """
+        pass
+    
+    def arreter_anticipation(self):
+        """Arrête la réflexion lancée par anticiper (par défaut : rien)."""
+        pass
+    
+    def obtenir_coups_lot(self, simulateur, indices: List[int]) -> List[Tuple[int, int]]:
+        """
+        Retourne un coup pour chacun des plateaux d'un simulateur par lot.
+        
+        Par défaut chaque plateau est chargé dans un jeu de travail et
+        obtenir_coup() est appelé ; les joueurs qui savent lire directement
+        les bitboards du simulateur redéfinissent cette méthode.
+        
+        Args:
+            simulateur: Instance de simulateur_lot.SimulateurLot
+            indices: Plateaux sur lesquels ce joueur est au trait
+        
+        Returns:
+            Liste des coups (ligne, colonne), dans l'ordre des indices
+        """
+        return [self.obtenir_coup(simulateur.obtenir_jeu(i)) for i in indices]
+    
     def __str__(self):
         """Représentation textuelle du joueur."""
         return f"{self.nom} ({self.symbole})"
@@ -52,13 +52,14 @@ class JoueurHumain(JoueurBase):
                 ligne, colonne = map(int, entree.split())
                 
                 # Vérifier que les coordonnées sont valides
-                if 0 <= ligne < 3 and 0 <= colonne < 3:
+                if 0 <= ligne < jeu.lignes and 0 <= colonne < jeu.colonnes:
                     if jeu.plateau[ligne][colonne] == TicTacToe.VIDE:
                         return (ligne, colonne)
                     else:
                         print("Cette case est deja occupee!")
                 else:
-                    print("Position invalide! Utilisez des nombres entre 0 et 2.")
+                    print(f"Position invalide! Lignes de 0 a {jeu.lignes - 1}, "
+                          f"colonnes de 0 a {jeu.colonnes - 1}.")
             
             except ValueError:
                 print("Format invalide! Utilisez: ligne colonne (ex: 0 1)")
@@ -1,11 +1,21 @@
 """
 Joueur IA utilisant l'algorithme Minimax avec élagage Alpha-Beta.
+
+Chaque recherche part par défaut de la fenêtre complète. Avec
+``fenetre='aspiration'``, les itérations de l'approfondissement partent
+d'une fenêtre étroite autour du score de l'itération précédente (recherche
+refaite en fenêtre complète si le score en sort) ; avec ``fenetre='mtdf'``,
+la valeur est trouvée par MTD(f), une suite de recherches à fenêtre nulle
+partant du même score. Les deux modes s'appuient sur une table de
+transpositions, vidée à chaque coup.
 """
 
-from typing import Tuple
-import math
+from typing import List, Tuple
+import copy
 import sys
 import os
+import threading
+import time
 
 # Permettre l'import depuis le dossier parent
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -16,12 +26,25 @@ except ImportError:
     from joueur_base import JoueurBase
 
 from morpion_base import TicTacToe
+from moteur_recherche import MoteurRecherche, RechercheAnnulee, TempsEcoule
+from recherche_parallele import RechercheParallele
+from evaluation import EvaluateurHeuristique
+from bibliotheque_ouvertures import obtenir_bibliotheque
+from table_finale import TableFinale
+import table_resolue
 
 
 class JoueurIA(JoueurBase):
     """Joueur IA utilisant l'algorithme Minimax (imbattable)."""
     
-    def __init__(self, symbole: str, nom: str = "IA Minimax", niveau: int = -1):
+    MODES = ('recherche', 'table')
+    FENETRES = ('complete', 'aspiration', 'mtdf')
+    
+    def __init__(self, symbole: str, nom: str = "IA Minimax", niveau: int = -1,
+                 mode: str = 'recherche', budget_ms: int = None, ordre_coups=True,
+                 processus: int = 1, evaluateur=None, anticipation: bool = False,
+                 bibliotheque=None, ouvertures_variees: bool = False, table_finale=None,
+                 fenetre: str = 'complete', marge_aspiration: int = None):
         """
         Initialise le joueur IA.
         
@@ -29,13 +52,79 @@ class JoueurIA(JoueurBase):
             symbole: Symbole du joueur ('X' ou 'O')
             nom: Nom du joueur (par défaut "IA Minimax")
             niveau: Profondeur maximale de recherche (-1 = illimitée)
+            mode: 'recherche' pour Minimax, 'table' pour lire la table de
+                  résolution complète (jeu parfait, ignore ``niveau``)
+            budget_ms: Temps de réflexion par coup en millisecondes. Si fourni,
+                       la recherche approfondit itérativement (profondeur 1, 2, ...)
+                       et joue le meilleur coup de la dernière itération terminée;
+                       ``niveau`` borne alors la profondeur maximale.
+            ordre_coups: Ordonnancement des coups dans la recherche : True pour
+                         OrdreCoups par défaut, None/False pour l'ordre brut des
+                         cases, ou tout objet compatible (ex. OrdreCoups(tueurs=False))
+            processus: Nombre de processus entre lesquels répartir les coups de la
+                       racine (1 = recherche dans le processus courant). Le coup
+                       choisi est le même qu'en recherche séquentielle.
+            evaluateur: Estimation des positions où la profondeur coupe la
+                        recherche : None pour compter 0, True pour
+                        EvaluateurHeuristique par défaut, ou un objet compatible
+            anticipation: Réfléchir pendant le tour de l'adversaire (voir
+                          anticiper) : la réponse à un coup prévu est immédiate
+            bibliotheque: Bibliothèque d'ouvertures consultée avant la recherche
+                          (BibliothequeOuvertures ou chemin de fichier)
+            ouvertures_variees: Tirer les coups de la bibliothèque selon leurs
+                                poids plutôt que jouer le meilleur
+            table_finale: Table de finales sondée par la recherche (TableFinale ou
+                          chemin de fichier) : valeurs exactes près de la fin
+            fenetre: 'complete' (Alpha-Beta classique), 'aspiration' (fenêtre
+                     étroite autour du score de l'itération précédente) ou
+                     'mtdf' (recherches à fenêtre nulle, voir MoteurRecherche.mtdf).
+                     Le coup choisi est le même dans les trois modes.
+            marge_aspiration: Demi-largeur de la fenêtre d'aspiration (par défaut
+                              1 sans évaluateur, ECHELLE // 200 avec)
         """
+        if mode not in self.MODES:
+            raise ValueError(f"Mode inconnu: {mode!r} (attendu: {', '.join(self.MODES)})")
+        if fenetre not in self.FENETRES:
+            raise ValueError(f"Fenêtre inconnue: {fenetre!r} (attendu: {', '.join(self.FENETRES)})")
+        if fenetre != 'complete' and processus > 1:
+            raise ValueError("Les fenêtres étroites ne sont pas disponibles en recherche parallèle")
+        if budget_ms is not None and budget_ms <= 0:
+            raise ValueError(f"Budget de temps invalide: {budget_ms} ms")
         super().__init__(symbole, nom)
         self.niveau = niveau
+        self.mode = mode
+        self.budget_ms = budget_ms
+        if evaluateur is True:
+            evaluateur = EvaluateurHeuristique()
+        if isinstance(table_finale, str):
+            table_finale = TableFinale(table_finale)
+        self.moteur = MoteurRecherche(ordre_coups, evaluateur=evaluateur, table_finale=table_finale,
+                                      transpositions={} if fenetre != 'complete' else None)
+        self.fenetre = fenetre
+        if marge_aspiration is None:
+            marge_aspiration = max(1, evaluateur.ECHELLE // 200) if evaluateur is not None else 1
+        self.marge_aspiration = marge_aspiration
+        self.echecs_aspiration = 0  # Recherches refaites en fenêtre complète
+        self.processus = processus
+        self._parallele = RechercheParallele(processus, self.moteur) if processus > 1 else None
         self.symbole_adversaire = TicTacToe.IA if symbole == TicTacToe.HUMAIN else TicTacToe.HUMAIN
         self.noeuds_explores = 0  # Pour statistiques
         self.elagages = 0  # Nombre d'élagages Alpha-Beta
         self.temps_reflexion = 0.0  # Temps de calcul en secondes
+        self.iterations = []  # Détail de chaque itération de l'approfondissement
+        self.anticipation = anticipation
+        self.bibliotheque = obtenir_bibliotheque(bibliotheque)
+        self.ouvertures_variees = ouvertures_variees
+        self.depuis_bibliotheque = False  # True si le dernier coup vient de la bibliothèque
+        self.anticipe = None  # 'complete', 'partielle' ou None pour le dernier coup
+        self._anticipations = {}  # Clé de position -> réponse préparée
+        self._anticipation_en_cours = None  # (fil, événement d'arrêt)
+        self._moteur_anticipation = None
+    
+    @property
+    def ordre_coups(self):
+        """Ordonnancement des coups du moteur (None : ordre brut des cases)."""
+        return self.moteur.ordre_coups
     
     def obtenir_coup(self, jeu: TicTacToe) -> Tuple[int, int]:
         """
@@ -47,91 +136,273 @@ class JoueurIA(JoueurBase):
         Returns:
             Tuple (ligne, colonne) du meilleur coup possible
         """
-        import time
         debut = time.time()
         
-        self.noeuds_explores = 0
-        self.elagages = 0
-        meilleur_score = -math.inf
-        meilleur_coup = None
+        self.arreter_anticipation()
+        preparee = self._anticipations.get(jeu.cle)
+        self._anticipations = {}
+        self.anticipe = None
+        self.iterations = []
+        self.echecs_aspiration = 0
+        self.moteur.reinitialiser_statistiques()
+        if self.moteur.transpositions is not None:
+            self.moteur.transpositions.clear()
         
-        for ligne, col in jeu.obtenir_coups_possibles():
-            jeu.plateau[ligne][col] = self.symbole
-            score = self._minimax(jeu, 0, False, -math.inf, math.inf)
-            jeu.plateau[ligne][col] = TicTacToe.VIDE
-            
-            if score > meilleur_score:
-                meilleur_score = score
-                meilleur_coup = (ligne, col)
+        meilleur_coup = None
+        if self.bibliotheque is not None:
+            meilleur_coup = self.bibliotheque.choisir(jeu, self.symbole, self.ouvertures_variees)
+        self.depuis_bibliotheque = meilleur_coup is not None
+        if meilleur_coup is None and self.mode == 'table':
+            meilleur_coup = table_resolue.obtenir_meilleur_coup(jeu, self.symbole)
+        if meilleur_coup is None and preparee is not None and preparee['complete']:
+            # Coup de l'adversaire prévu : la réponse est déjà calculée
+            meilleur_coup = preparee['coup']
+            self.anticipe = 'complete'
+        elif meilleur_coup is None:
+            if self.budget_ms is None:
+                meilleur_coup, _ = self._rechercher(jeu, self.niveau)
+            else:
+                if preparee is not None:
+                    self.anticipe = 'partielle'
+                meilleur_coup = self._approfondir(jeu, preparee)
         
+        self.noeuds_explores = self.moteur.noeuds
+        self.elagages = self.moteur.elagages
         self.temps_reflexion = time.time() - debut
         return meilleur_coup if meilleur_coup else (0, 0)
     
-    def _minimax(self, jeu: TicTacToe, profondeur: int, est_maximisant: bool,
-                 alpha: float, beta: float) -> int:
+    def _rechercher(self, jeu: TicTacToe, niveau: int, coups: list = None, estimation: int = None):
+        """
+        Lance la recherche dans ce processus ou sur le pool de processus.
+        
+        ``estimation`` (score attendu, ex. celui de l'itération précédente)
+        centre la fenêtre d'aspiration ou sert de point de départ à MTD(f).
+        """
+        if self._parallele is not None:
+            return self._parallele.rechercher(jeu, self.symbole, niveau, coups, self.moteur.echeance)
+        moteur = self.moteur
+        if self.fenetre == 'mtdf':
+            return moteur.mtdf(jeu, self.symbole, estimation or 0, niveau, coups)
+        if self.fenetre == 'aspiration' and estimation is not None:
+            alpha = estimation - self.marge_aspiration
+            beta = estimation + self.marge_aspiration
+            coup, score = moteur.rechercher(jeu, self.symbole, niveau, coups, alpha, beta)
+            if alpha < score < beta:
+                return coup, score
+            # Score hors de la fenêtre : ce n'est qu'une borne
+            self.echecs_aspiration += 1
+        return moteur.rechercher(jeu, self.symbole, niveau, coups)
+    
+    def analyser(self, jeu: TicTacToe) -> List[dict]:
         """
-        Algorithme Minimax avec élagage Alpha-Beta.
+        Valeur exacte et variation principale de chaque coup légal.
+        
+        Une seule analyse au lieu d'une recherche par coup : les coups de la
+        racine partagent une table de transpositions (celle du mode de
+        fenêtre, ou une table créée pour l'analyse). La profondeur est celle
+        du joueur (``niveau``), sans budget de temps.
+        
+        Args:
+            jeu: Instance du jeu, non modifiée ; analysée pour le joueur au trait
+        
+        Returns:
+            Liste de dictionnaires {'coup', 'score', 'variation'}, du meilleur
+            coup au moins bon ; les scores sont ceux de obtenir_statistiques
+            (moteur de recherche), la variation commence par le coup
+        """
+        moteur = self.moteur
+        transpositions = moteur.transpositions
+        if transpositions is None:
+            moteur.transpositions = {}
+        moteur.reinitialiser_statistiques()
+        try:
+            analyse = moteur.analyser(jeu.copier(), jeu.joueur_actuel, self.niveau)
+        finally:
+            moteur.transpositions = transpositions
+        return [{'coup': coup, 'score': score, 'variation': variation}
+                for coup, score, variation in analyse]
+    
+    def fermer(self):
+        """Arrête les processus de la recherche parallèle (ils sont recréés au besoin)."""
+        if self._parallele is not None:
+            self._parallele.fermer()
+    
+    def _profondeur_max(self, jeu: TicTacToe) -> int:
+        """Profondeur (coup de la racine compris) où l'approfondissement s'arrête."""
+        profondeur_max = jeu.nb_cases - jeu.nb_cases_occupees
+        if self.niveau != -1:
+            profondeur_max = min(profondeur_max, self.niveau + 1)
+        return profondeur_max
+    
+    def _approfondir(self, jeu: TicTacToe, preparee: dict = None) -> Tuple[int, int]:
+        """
+        Approfondissement itératif sous budget de temps.
+        
+        Chaque itération relance la recherche avec une profondeur de plus, en
+        essayant d'abord le meilleur coup de l'itération précédente. Une
+        itération interrompue par le budget est abandonnée. L'approfondissement
+        s'arrête dès qu'une itération n'a plus été coupée par la profondeur
+        (la valeur est alors exacte).
         
         Args:
             jeu: Instance du jeu
-            profondeur: Profondeur actuelle dans l'arbre de recherche
-            est_maximisant: True si c'est le tour de l'IA
-            alpha: Meilleur score garanti pour le maximiseur
-            beta: Meilleur score garanti pour le minimiseur
+            preparee: Réponse partielle préparée par anticiper : l'approfondissement
+                      reprend à la profondeur suivante, son coup en premier
         
         Returns:
-            Score du meilleur coup
+            Meilleur coup de la dernière itération terminée
+        """
+        debut = time.perf_counter()
+        moteur = self.moteur
+        moteur.echeance = debut + self.budget_ms / 1000
+        coups = jeu.obtenir_coups_possibles()
+        # Même sans temps pour une seule itération, on joue un coup légal
+        meilleur_coup = coups[0] if coups else None
+        depart = 1
+        estimation = None  # Score de l'itération précédente
+        if preparee is not None:
+            meilleur_coup = preparee['coup']
+            coups = [meilleur_coup] + [c for c in coups if c != meilleur_coup]
+            depart = preparee['profondeur'] + 1
+            estimation = preparee['score']
+        
+        try:
+            for profondeur in range(depart, self._profondeur_max(jeu) + 1):
+                # Profondeur comptée coup de la racine compris
+                noeuds_avant = moteur.noeuds
+                passes_avant = moteur.passes_fenetre_nulle
+                try:
+                    coup, score = self._rechercher(jeu, profondeur - 1, coups, estimation)
+                except TempsEcoule:
+                    break
+                
+                meilleur_coup = coup
+                estimation = score
+                self.iterations.append({
+                    'profondeur': profondeur,
+                    'coup': coup,
+                    'score': score,
+                    'noeuds': moteur.noeuds - noeuds_avant,
+                    'passes_fenetre_nulle': moteur.passes_fenetre_nulle - passes_avant,
+                    'temps': time.perf_counter() - debut,
+                })
+                if moteur.progression is not None:
+                    moteur.progression(dict(self.iterations[-1]))
+                if not moteur.coupe:
+                    break
+                # Le meilleur coup est essayé en premier à l'itération suivante
+                coups = [coup] + [c for c in coups if c != coup]
+        finally:
+            moteur.echeance = None
+        return meilleur_coup
+    
+    def anticiper(self, jeu: TicTacToe):
+        """
+        Prépare en arrière-plan les réponses aux coups possibles de l'adversaire.
+        
+        Les coups de l'adversaire sont examinés du plus probable au moins
+        probable selon l'ordonnancement du moteur. Sans budget, chaque réponse
+        est celle qu'obtenir_coup calculerait ; avec un budget, toutes les
+        réponses sont approfondies d'un demi-coup à la fois, sans échéance.
+        obtenir_coup arrête la réflexion, puis joue directement une réponse
+        complète, ou reprend l'approfondissement d'une réponse partielle.
+        
+        Args:
+            jeu: Instance du jeu, adversaire au trait (non modifiée)
         """
-        self.noeuds_explores += 1
-        
-        # Vérifier si on a atteint la profondeur maximale
-        if self.niveau != -1 and profondeur >= self.niveau:
-            return 0
-        
-        gagnant = jeu.verifier_gagnant()
-        
-        # Conditions terminales
-        if gagnant == self.symbole:
-            return 10 - profondeur  # Favorise les victoires rapides
-        elif gagnant == self.symbole_adversaire:
-            return profondeur - 10  # Retarde les défaites
-        elif gagnant == 'NUL':
-            return 0
-        
-        if est_maximisant:
-            # Tour de l'IA (maximise le score)
-            eval_max = -math.inf
-            for ligne, col in jeu.obtenir_coups_possibles():
-                jeu.plateau[ligne][col] = self.symbole
-                score_eval = self._minimax(jeu, profondeur + 1, False, alpha, beta)
-                jeu.plateau[ligne][col] = TicTacToe.VIDE
-                eval_max = max(eval_max, score_eval)
-                alpha = max(alpha, score_eval)
-                if beta <= alpha:
-                    self.elagages += 1
-                    break  # Élagage Beta
-            return eval_max
+        self.arreter_anticipation()
+        self._anticipations = {}
+        if not self.anticipation or self.mode == 'table' or jeu.est_partie_terminee():
+            return
+        if self._moteur_anticipation is None:
+            # Moteur distinct : l'ordonnancement garde un état propre à chaque recherche
+            self._moteur_anticipation = MoteurRecherche(copy.deepcopy(self.moteur.ordre_coups),
+                                                        evaluateur=self.moteur.evaluateur,
+                                                        table_finale=self.moteur.table_finale)
+        arret = threading.Event()
+        fil = threading.Thread(target=self._anticiper, args=(jeu.copier(), arret),
+                               name=f"anticipation-{self.symbole}", daemon=True)
+        self._anticipation_en_cours = (fil, arret)
+        fil.start()
+    
+    def arreter_anticipation(self):
+        """Arrête la réflexion en cours ; les réponses déjà préparées sont gardées."""
+        if self._anticipation_en_cours is not None:
+            fil, arret = self._anticipation_en_cours
+            arret.set()
+            fil.join()
+            self._anticipation_en_cours = None
+    
+    def _anticiper(self, jeu: TicTacToe, arret: threading.Event):
+        """Corps du fil d'anticipation (voir anticiper)."""
+        moteur = self._moteur_anticipation
+        moteur.annulation = arret
+        moteur.reinitialiser_statistiques()
+        adversaire = jeu.adversaire(self.symbole)
+        if moteur.ordre_coups is not None:
+            reponses = moteur.ordre_coups.ordonner(jeu, adversaire, 0)
         else:
-            # Tour de l'adversaire (minimise le score)
-            eval_min = math.inf
-            for ligne, col in jeu.obtenir_coups_possibles():
-                jeu.plateau[ligne][col] = self.symbole_adversaire
-                score_eval = self._minimax(jeu, profondeur + 1, True, alpha, beta)
-                jeu.plateau[ligne][col] = TicTacToe.VIDE
-                eval_min = min(eval_min, score_eval)
-                beta = min(beta, score_eval)
-                if beta <= alpha:
-                    self.elagages += 1
-                    break  # Élagage Alpha
-            return eval_min
+            reponses = jeu.obtenir_coups_possibles()
+        
+        # Coups de la racine de chaque réponse encore à approfondir
+        a_approfondir = {reponse: None for reponse in reponses}
+        profondeur = 1 if self.budget_ms is not None else None
+        try:
+            while a_approfondir:
+                for reponse, coups in list(a_approfondir.items()):
+                    jeu.jouer_coup(reponse[0], reponse[1], adversaire)
+                    complete = True
+                    if jeu.est_partie_terminee():
+                        del a_approfondir[reponse]
+                        jeu.annuler_coup()
+                        continue
+                    if profondeur is None:
+                        coup, score = moteur.rechercher(jeu, self.symbole, self.niveau)
+                    else:
+                        coup, score = moteur.rechercher(jeu, self.symbole, profondeur - 1, coups)
+                        complete = not moteur.coupe or profondeur >= self._profondeur_max(jeu)
+                    self._anticipations[jeu.cle] = {
+                        'coup': coup,
+                        'score': score,
+                        'profondeur': profondeur,
+                        'complete': complete,
+                    }
+                    if complete:
+                        del a_approfondir[reponse]
+                    else:
+                        coups = coups or jeu.obtenir_coups_possibles()
+                        a_approfondir[reponse] = [coup] + [c for c in coups if c != coup]
+                    jeu.annuler_coup()
+                if profondeur is not None:
+                    profondeur += 1
+        except RechercheAnnulee:
+            pass
+        finally:
+            moteur.annulation = None
     
     def obtenir_statistiques(self) -> dict:
         """Retourne les statistiques du dernier coup calculé."""
         return {
             'noeuds_explores': self.noeuds_explores,
             'elagages': self.elagages,
+            're_recherches': self.moteur.re_recherches,
+            'hits_finale': self.moteur.hits_finale,
+            'fenetre': self.fenetre,
+            'passes_fenetre_nulle': self.moteur.passes_fenetre_nulle,
+            'echecs_aspiration': self.echecs_aspiration,
+            'hits_transpositions': self.moteur.hits_transpositions,
+            'noeuds_par_seconde': self.moteur.noeuds_par_seconde,
             'temps_reflexion': self.temps_reflexion,
-            'niveau': self.niveau
+            'niveau': self.niveau,
+            'mode': self.mode,
+            'budget_ms': self.budget_ms,
+            'ordre_coups': self.ordre_coups is not None,
+            'processus': self.processus,
+            'evaluateur': type(self.moteur.evaluateur).__name__ if self.moteur.evaluateur else None,
+            'anticipation': self.anticipe,
+            'bibliotheque': self.depuis_bibliotheque,
+            'profondeurs': [it['profondeur'] for it in self.iterations],
+            'iterations': list(self.iterations)
         }
 
 
@@ -159,3 +430,29 @@ if __name__ == "__main__":
     jeu.jouer_coup(coup[0], coup[1], ia.symbole)
     print("\nPlateau après le coup de l'IA:")
     jeu.afficher_plateau()
+    
+    print("\nApprofondissement itératif sur 4x4 (alignement 4, budget 200 ms):")
+    from morpion_mnk import MorpionMNK
+    grand = MorpionMNK(4, 4, 4)
+    ia_temps = JoueurIA('X', "Chrono", budget_ms=200)
+    coup = ia_temps.obtenir_coup(grand)
+    stats = ia_temps.obtenir_statistiques()
+    print(f"Coup choisi: {coup} en {stats['temps_reflexion'] * 1000:.0f} ms")
+    for it in stats['iterations']:
+        print(f"   profondeur {it['profondeur']:2d}: coup {it['coup']}, score {it['score']}, "
+              f"{it['noeuds']} noeuds, {it['temps'] * 1000:.0f} ms")
+    
+    print("\nAnalyse de tous les coups (3x3, X en (0, 0)):")
+    jeu.reinitialiser()
+    jeu.jouer_coup(0, 0, 'X')
+    for ligne in JoueurIA('O').analyser(jeu):
+        print(f"   {ligne['coup']}: score {ligne['score']:3d}, variation {ligne['variation']}")
+    
+    print("\nFenêtres de recherche sur 4x4 (alignement 4, évaluateur, profondeur 6):")
+    for fenetre in JoueurIA.FENETRES:
+        ia_fenetre = JoueurIA('X', fenetre=fenetre, niveau=5, budget_ms=60000, evaluateur=True)
+        coup = ia_fenetre.obtenir_coup(grand)
+        stats = ia_fenetre.obtenir_statistiques()
+        print(f"   {fenetre:10s}: coup {coup}, {stats['noeuds_explores']} noeuds, "
+              f"{stats['passes_fenetre_nulle']} passes à fenêtre nulle, "
+              f"{stats['echecs_aspiration']} échecs d'aspiration, {stats['temps_reflexion'] * 1000:.0f} ms")
@@ -12,13 +12,17 @@ from pathlib import Path
 try:
     from .joueur_base import JoueurBase
     from morpion_base import TicTacToe
+    from moteur_recherche import MoteurRecherche
+    from table_transpositions import OCTETS_PAR_CASE, TableCompacte
+    from bibliotheque_ouvertures import obtenir_bibliotheque
 except ImportError:
     # Si exécuté directement
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from joueurs.joueur_base import JoueurBase
     from morpion_base import TicTacToe
-
-import math
+    from moteur_recherche import MoteurRecherche
+    from table_transpositions import OCTETS_PAR_CASE, TableCompacte
+    from bibliotheque_ouvertures import obtenir_bibliotheque
 
 
 class JoueurIACache(JoueurBase):
@@ -28,16 +32,37 @@ class JoueurIACache(JoueurBase):
     """
     
     # Cache partagé entre toutes les instances
+    # {(lignes, colonnes, alignement): table de transpositions}, une table par
+    # géométrie car les clés de position de plateaux différents peuvent coïncider.
+    # Les positions sont rangées sous leur clé canonique (voir symetries.py) :
+    # une seule entrée pour toutes les images d'une position par symétrie.
+    # Chaque entrée (voir moteur_recherche.py) garde le score, sa nature (exact,
+    # borne basse ou haute : un score sorti d'une fenêtre Alpha-Beta n'est
+    # qu'une borne) et le meilleur coup. Les scores ne dépendent que de la
+    # position (distance à la fin de partie comprise), du point de vue du
+    # joueur au trait : la table est commune aux joueurs X et O et sert d'une
+    # recherche à l'autre.
+    # Chaque table est un tableau préalloué d'entrées compactées en entiers
+    # (voir table_transpositions.py) : accès direct par la clé sur le 3x3,
+    # adressage ouvert borné ailleurs, où les entrées les moins profondes
+    # sont évincées quand la table est pleine.
+    TAILLE_CACHE_DEFAUT = 1 << 20  # Entrées par géométrie (16 Mo en adressage ouvert)
     _cache_global = {}
+    _taille_max = TAILLE_CACHE_DEFAUT
+    _VERSION_CACHE = 3
     _fichier_cache = Path(__file__).parent.parent / "cache_ia.pkl"
     
-    def __init__(self, symbole: str, nom: str = "IA Cache"):
+    def __init__(self, symbole: str, nom: str = "IA Cache", ordre_coups=True, bibliotheque=None):
         """
         Initialise le joueur IA avec cache.
         
         Args:
             symbole: Symbole du joueur ('X' ou 'O')
             nom: Nom du joueur
+            ordre_coups: Ordonnancement des coups (True pour OrdreCoups par défaut,
+                         None/False pour l'ordre brut, ou un objet compatible)
+            bibliotheque: Bibliothèque d'ouvertures consultée avant la recherche
+                          (BibliothequeOuvertures ou chemin de fichier)
         """
         super().__init__(symbole, nom)
         self.symbole_adversaire = 'O' if symbole == 'X' else 'X'
@@ -46,6 +71,8 @@ class JoueurIACache(JoueurBase):
         self.miss_cache = 0  # Nombre de fois où on a dû calculer
         self.elagages = 0  # Nombre d'élagages Alpha-Beta
         self.temps_reflexion = 0.0  # Temps de calcul en secondes
+        self.moteur = MoteurRecherche(ordre_coups, transpositions={}, cles_canoniques=True)
+        self.bibliotheque = obtenir_bibliotheque(bibliotheque)
         
         # Charger le cache au démarrage
         self.charger_cache()
@@ -56,8 +83,21 @@ class JoueurIACache(JoueurBase):
         if cls._fichier_cache.exists():
             try:
                 with open(cls._fichier_cache, 'rb') as f:
-                    cls._cache_global = pickle.load(f)
-                print(f"[Cache] {len(cls._cache_global)} positions chargées depuis {cls._fichier_cache.name}")
+                    donnees = pickle.load(f)
+                if donnees.get('version') == cls._VERSION_CACHE:
+                    # Tables ou dictionnaires simples : recopiés au budget courant
+                    donnees = {geometrie: cls._nouvelle_table(geometrie, entrees)
+                               for geometrie, entrees in donnees['tables'].items()}
+                else:
+                    # Anciens formats (indexé par le plateau, scores du point de vue
+                    # du joueur du cache, ou scores seuls sans nature ni coup) : incompatibles
+                    print(f"[Cache] Ancien format ignoré dans {cls._fichier_cache.name}")
+                    donnees = {}
+                cls._cache_global = donnees
+                print(f"[Cache] {cls._taille_cache()} positions chargées depuis {cls._fichier_cache.name}")
+                evictions = sum(table.evictions for table in donnees.values())
+                if evictions:
+                    print(f"[Cache] {evictions} positions du fichier évincées faute de place")
             except Exception as e:
                 print(f"[Cache] Erreur lors du chargement: {e}")
                 cls._cache_global = {}
@@ -67,23 +107,54 @@ class JoueurIACache(JoueurBase):
         """Sauvegarde le cache sur le disque."""
         try:
             with open(cls._fichier_cache, 'wb') as f:
-                pickle.dump(cls._cache_global, f)
-            print(f"[Cache] {len(cls._cache_global)} positions sauvegardées dans {cls._fichier_cache.name}")
+                # Entrées seules : le format du fichier ne dépend pas des tableaux
+                tables = {geometrie: dict(table.items()) for geometrie, table in cls._cache_global.items()}
+                pickle.dump({'version': cls._VERSION_CACHE, 'tables': tables}, f)
+            print(f"[Cache] {cls._taille_cache()} positions sauvegardées dans {cls._fichier_cache.name}")
         except Exception as e:
             print(f"[Cache] Erreur lors de la sauvegarde: {e}")
     
-    @staticmethod
-    def _plateau_vers_cle(plateau):
+    @classmethod
+    def configurer_cache(cls, taille_max: int = None, octets_max: int = None):
         """
-        Convertit un plateau en clé pour le cache.
+        Fixe le budget du cache, par géométrie de plateau.
+        
+        Les tables déjà en mémoire sont reconstruites aussitôt au nouveau budget.
         
         Args:
-            plateau: Plateau de jeu (liste 2D)
+            taille_max: Nombre maximal de positions par géométrie, arrondi à la
+                        puissance de 2 inférieure hors accès direct (None =
+                        accès direct si possible, sinon 2^20 cases)
+            octets_max: Budget mémoire en octets par géométrie, prioritaire sur ``taille_max``
         
-        Returns:
-            Tuple représentant l'état du plateau
+        Raises:
+            ValueError: Si le budget ne permet pas une seule position
         """
-        return tuple(tuple(ligne) for ligne in plateau)
+        if octets_max is not None:
+            taille_max = octets_max // OCTETS_PAR_CASE
+        if taille_max is not None and taille_max < 1:
+            raise ValueError(f"Budget de cache trop petit: {taille_max} position(s)")
+        cls._taille_max = taille_max
+        for table in cls._cache_global.values():
+            table.redimensionner(cls._taille_max)
+    
+    @classmethod
+    def _nouvelle_table(cls, geometrie: tuple, entrees=()) -> TableCompacte:
+        """
+        Table compacte de la géométrie au budget courant, remplie avec ``entrees``.
+        
+        Les entrées qui ne trouvent pas de place (table pleine ou zone de
+        sondage occupée) comptent dans les évictions de la table.
+        """
+        lignes, colonnes, _ = geometrie
+        table = TableCompacte(lignes * colonnes, cls._taille_max)
+        table.update(entrees)
+        return table
+    
+    @classmethod
+    def _taille_cache(cls) -> int:
+        """Nombre total de positions en cache, toutes géométries confondues."""
+        return sum(len(table) for table in cls._cache_global.values())
     
     def obtenir_coup(self, jeu: TicTacToe) -> tuple:
         """
@@ -98,27 +169,24 @@ class JoueurIACache(JoueurBase):
         import time
         debut = time.time()
         
-        self.noeuds_explores = 0
-        self.hits_cache = 0
-        self.miss_cache = 0
-        self.elagages = 0
+        moteur = self.moteur
+        moteur.reinitialiser_statistiques()
+        geometrie = (jeu.lignes, jeu.colonnes, jeu.alignement)
+        table = self._cache_global.get(geometrie)
+        if table is None:
+            table = self._cache_global[geometrie] = self._nouvelle_table(geometrie)
+        moteur.transpositions = table
         
-        meilleur_score = -math.inf
         meilleur_coup = None
+        if self.bibliotheque is not None:
+            meilleur_coup = self.bibliotheque.choisir(jeu, self.symbole)
+        if meilleur_coup is None:
+            meilleur_coup, _ = moteur.rechercher(jeu, self.symbole)
         
-        for ligne, col in jeu.obtenir_coups_possibles():
-            # Simuler le coup
-            jeu.plateau[ligne][col] = self.symbole
-            
-            # Évaluer avec Minimax + cache
-            score = self._minimax(jeu, 0, False, -math.inf, math.inf)
-            
-            # Annuler le coup
-            jeu.plateau[ligne][col] = TicTacToe.VIDE
-            
-            if score > meilleur_score:
-                meilleur_score = score
-                meilleur_coup = (ligne, col)
+        self.noeuds_explores = moteur.noeuds
+        self.hits_cache = moteur.hits_transpositions
+        self.miss_cache = moteur.miss_transpositions
+        self.elagages = moteur.elagages
         
         # Sauvegarder périodiquement (tous les 100 nouveaux calculs)
         if self.miss_cache > 0 and self.miss_cache % 100 == 0:
@@ -127,81 +195,6 @@ class JoueurIACache(JoueurBase):
         self.temps_reflexion = time.time() - debut
         return meilleur_coup if meilleur_coup else (0, 0)
     
-    def _minimax(self, jeu: TicTacToe, profondeur: int, est_maximisant: bool,
-                 alpha: float, beta: float) -> int:
-        """
-        Algorithme Minimax avec élagage Alpha-Beta et cache.
-        
-        Args:
-            jeu: Instance du jeu
-            profondeur: Profondeur actuelle
-            est_maximisant: True si c'est le tour du joueur IA
-            alpha: Meilleur score pour le maximiseur
-            beta: Meilleur score pour le minimiseur
-        
-        Returns:
-            Score du meilleur coup
-        """
-        self.noeuds_explores += 1
-        
-        # Créer une clé pour le cache
-        cle_plateau = self._plateau_vers_cle(jeu.plateau)
-        cle_cache = (cle_plateau, self.symbole, est_maximisant)
-        
-        # Vérifier le cache
-        if cle_cache in self._cache_global:
-            self.hits_cache += 1
-            return self._cache_global[cle_cache]
-        
-        self.miss_cache += 1
-        
-        # Vérifier les conditions terminales
-        gagnant = jeu.verifier_gagnant()
-        
-        if gagnant == self.symbole:
-            score = 10 - profondeur
-            self._cache_global[cle_cache] = score
-            return score
-        elif gagnant == self.symbole_adversaire:
-            score = profondeur - 10
-            self._cache_global[cle_cache] = score
-            return score
-        elif gagnant == 'NUL':  # Match nul
-            self._cache_global[cle_cache] = 0
-            return 0
-        
-        # Minimax récursif
-        if est_maximisant:
-            eval_max = -math.inf
-            for ligne, col in jeu.obtenir_coups_possibles():
-                jeu.plateau[ligne][col] = self.symbole
-                score_eval = self._minimax(jeu, profondeur + 1, False, alpha, beta)
-                jeu.plateau[ligne][col] = TicTacToe.VIDE
-                
-                eval_max = max(eval_max, score_eval)
-                alpha = max(alpha, score_eval)
-                if beta <= alpha:
-                    self.elagages += 1
-                    break
-            
-            self._cache_global[cle_cache] = eval_max
-            return eval_max
-        else:
-            eval_min = math.inf
-            for ligne, col in jeu.obtenir_coups_possibles():
-                jeu.plateau[ligne][col] = self.symbole_adversaire
-                score_eval = self._minimax(jeu, profondeur + 1, True, alpha, beta)
-                jeu.plateau[ligne][col] = TicTacToe.VIDE
-                
-                eval_min = min(eval_min, score_eval)
-                beta = min(beta, score_eval)
-                if beta <= alpha:
-                    self.elagages += 1
-                    break
-            
-            self._cache_global[cle_cache] = eval_min
-            return eval_min
-    
     def obtenir_statistiques(self) -> dict:
         """
         Retourne les statistiques d'utilisation du cache.
@@ -211,6 +204,9 @@ class JoueurIACache(JoueurBase):
         """
         total_acces = self.hits_cache + self.miss_cache
         taux_hit = (self.hits_cache / total_acces * 100) if total_acces > 0 else 0
+        tables = self._cache_global.values()
+        taille_cache = self._taille_cache()
+        capacite = sum(table.taille_max for table in tables)
         
         return {
             'noeuds_explores': self.noeuds_explores,
@@ -218,8 +214,13 @@ class JoueurIACache(JoueurBase):
             'miss_cache': self.miss_cache,
             'taux_hit': taux_hit,
             'elagages': self.elagages,
+            're_recherches': self.moteur.re_recherches,
+            'noeuds_par_seconde': self.moteur.noeuds_par_seconde,
             'temps_reflexion': self.temps_reflexion,
-            'taille_cache': len(self._cache_global)
+            'taille_cache': taille_cache,
+            'taille_max_cache': capacite,
+            'occupation_cache': taille_cache / capacite if capacite else 0.0,
+            'evictions_cache': sum(table.evictions for table in tables)
         }
     
     @classmethod
@@ -236,7 +237,11 @@ class JoueurIACache(JoueurBase):
         print(f"\n{'='*50}")
         print("STATISTIQUES DU CACHE")
         print('='*50)
-        print(f"Positions en mémoire: {len(cls._cache_global)}")
+        print(f"Positions en mémoire: {cls._taille_cache()}")
+        print(f"Budget par géométrie: {cls._taille_max if cls._taille_max else 'par défaut'}")
+        for geometrie, table in cls._cache_global.items():
+            print(f"  {geometrie}: {len(table)} positions / {table.taille_max} cases, "
+                  f"{table.evictions} évictions")
         print(f"Fichier cache: {cls._fichier_cache}")
         print(f"Taille fichier: {cls._fichier_cache.stat().st_size / 1024:.2f} KB" if cls._fichier_cache.exists() else "Fichier non créé")
         print('='*50)
@@ -278,4 +283,14 @@ if __name__ == "__main__":
     
     print(f"\nAccélération: {stats1['noeuds_explores'] / max(stats2['noeuds_explores'], 1):.2f}x plus rapide")
     
+    print("\nCache borné à 500 positions, 4x4 (alignement 3):")
+    JoueurIACache.configurer_cache(taille_max=500)
+    from morpion_mnk import MorpionMNK
+    grand = MorpionMNK(4, 4, 3)
+    joueur3 = JoueurIACache('X', "IA Cache Bornée")
+    coup3 = joueur3.obtenir_coup(grand)
+    stats3 = joueur3.obtenir_statistiques()
+    print(f"Coup: {coup3}")
+    print(f"Occupation: {stats3['occupation_cache']:.0%}, évictions: {stats3['evictions_cache']}")
+    
     JoueurIACache.afficher_statistiques_cache()
@@ -0,0 +1,277 @@
+"""
+Joueur Monte Carlo Tree Search (UCT) avec simulations par lot.
+
+Chaque itération descend l'arbre en choisissant l'enfant de meilleure borne
+UCB1 (taux de gain + exploration), ajoute un coup non encore essayé, puis
+estime la nouvelle position par ``simulations_par_feuille`` parties
+aléatoires jouées ensemble dans un SimulateurLot. Le résultat remonte
+jusqu'à la racine. La force croît avec le nombre de simulations ou le temps
+accordé, sans fonction d'évaluation : c'est le moteur des grands plateaux,
+où Alpha-Beta ne va pas assez profond.
+
+L'arbre est gardé d'un coup à l'autre : au coup suivant, le sous-arbre de la
+position réellement atteinte (notre coup puis la réponse de l'adversaire)
+devient la nouvelle racine avec toutes ses statistiques.
+"""
+
+import math
+import random
+import time
+from typing import List, Optional, Tuple
+import sys
+import os
+
+# Permettre l'import depuis le dossier parent
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from .joueur_base import JoueurBase
+except ImportError:
+    from joueur_base import JoueurBase
+
+from morpion_base import TicTacToe
+from simulateur_lot import SimulateurLot
+
+
+class _Noeud:
+    """Noeud de l'arbre : statistiques du coup qui y mène, du point de vue de son auteur."""
+    
+    __slots__ = ('coup', 'parent', 'enfants', 'a_essayer', 'visites', 'gains')
+    
+    def __init__(self, coup: Optional[Tuple[int, int]], parent: Optional['_Noeud'],
+                 a_essayer: List[Tuple[int, int]]):
+        self.coup = coup
+        self.parent = parent
+        self.enfants: List['_Noeud'] = []
+        self.a_essayer = a_essayer  # Coups pas encore développés
+        self.visites = 0
+        self.gains = 0.0  # Victoires de l'auteur du coup, un nul compte pour 1/2
+    
+    def taille(self) -> int:
+        """Nombre de noeuds du sous-arbre."""
+        return 1 + sum(enfant.taille() for enfant in self.enfants)
+
+
+class JoueurMCTS(JoueurBase):
+    """Joueur UCT : recherche arborescente Monte Carlo, simulations aléatoires par lot."""
+    
+    def __init__(self, symbole: str, nom: str = "IA MCTS", simulations: int = 2000,
+                 budget_ms: int = None, simulations_par_feuille: int = 16,
+                 exploration: float = math.sqrt(2), reutiliser_arbre: bool = True):
+        """
+        Initialise le joueur MCTS.
+        
+        Args:
+            symbole: Symbole du joueur ('X' ou 'O')
+            nom: Nom du joueur
+            simulations: Nombre de parties simulées par coup (None = sans limite,
+                         ``budget_ms`` doit alors être fourni)
+            budget_ms: Temps de réflexion par coup en millisecondes (None = sans limite)
+            simulations_par_feuille: Parties aléatoires jouées en lot à chaque
+                                     nouvelle feuille
+            exploration: Constante d'exploration de UCB1
+            reutiliser_arbre: Garder le sous-arbre de la position atteinte
+                              d'un coup à l'autre
+        """
+        if simulations is None and budget_ms is None:
+            raise ValueError("Il faut un nombre de simulations ou un budget de temps")
+        if simulations_par_feuille < 1:
+            raise ValueError(f"Nombre de simulations par feuille invalide: {simulations_par_feuille}")
+        super().__init__(symbole, nom)
+        self.simulations = simulations
+        self.budget_ms = budget_ms
+        self.simulations_par_feuille = simulations_par_feuille
+        self.exploration = exploration
+        self.reutiliser_arbre = reutiliser_arbre
+        self._racine: Optional[_Noeud] = None
+        self._position_racine = None  # (géométrie, bits X, bits O) de la racine
+        self._simulateur: Optional[SimulateurLot] = None
+        # Statistiques du dernier coup
+        self.iterations = 0
+        self.parties_simulees = 0
+        self.visites_reutilisees = 0
+        self.temps_reflexion = 0.0
+    
+    def obtenir_coup(self, jeu: TicTacToe) -> Tuple[int, int]:
+        """
+        Développe l'arbre dans la limite du budget et joue le coup le plus visité.
+        
+        Args:
+            jeu: Instance du jeu TicTacToe (ou MorpionMNK)
+        
+        Returns:
+            Tuple (ligne, colonne) du coup choisi
+        """
+        debut = time.perf_counter()
+        echeance = debut + self.budget_ms / 1000 if self.budget_ms is not None else None
+        racine = self._obtenir_racine(jeu)
+        self.visites_reutilisees = racine.visites
+        self.iterations = 0
+        self.parties_simulees = 0
+        
+        travail = jeu.copier()
+        symbole = jeu.joueur_actuel
+        while racine.a_essayer or racine.enfants:
+            self._iterer(racine, travail, symbole)
+            self.iterations += 1
+            if self.simulations is not None and self.parties_simulees >= self.simulations:
+                break
+            if echeance is not None and time.perf_counter() >= echeance:
+                break
+            if not racine.a_essayer and len(racine.enfants) == 1:
+                break  # Coup forcé
+        
+        self.temps_reflexion = time.perf_counter() - debut
+        if not racine.enfants:
+            coups = jeu.obtenir_coups_possibles()
+            return coups[0] if coups else (0, 0)
+        return max(racine.enfants, key=lambda enfant: enfant.visites).coup
+    
+    def _obtenir_racine(self, jeu: TicTacToe) -> _Noeud:
+        """Racine de la recherche : sous-arbre gardé du coup précédent ou nouvel arbre."""
+        geometrie = (jeu.lignes, jeu.colonnes, jeu.alignement)
+        bits_x, bits_o = jeu.bitboards[jeu.HUMAIN], jeu.bitboards[jeu.IA]
+        racine = None
+        if self.reutiliser_arbre and self._racine is not None and self._position_racine[0] == geometrie:
+            racine = self._retrouver(jeu, bits_x | bits_o)
+        if racine is None:
+            racine = _Noeud(None, None, jeu.obtenir_coups_possibles())
+        racine.parent = None
+        self._racine = racine
+        self._position_racine = (geometrie, bits_x, bits_o)
+        if self._simulateur is None or (self._simulateur.lignes, self._simulateur.colonnes,
+                                        self._simulateur.alignement) != geometrie:
+            self._simulateur = SimulateurLot(self.simulations_par_feuille, *geometrie,
+                                             reinitialisation_auto=False)
+        return racine
+    
+    def _retrouver(self, jeu: TicTacToe, occupees: int) -> Optional[_Noeud]:
+        """Petit-enfant de l'ancienne racine qui correspond à la position du jeu."""
+        _, ancien_x, ancien_o = self._position_racine
+        anciennes = ancien_x | ancien_o
+        if occupees & anciennes != anciennes or bin(occupees ^ anciennes).count('1') != 2:
+            return None
+        colonnes = jeu.colonnes
+        for enfant in self._racine.enfants:
+            bit = 1 << (enfant.coup[0] * colonnes + enfant.coup[1])
+            if not occupees & bit:
+                continue
+            for petit_enfant in enfant.enfants:
+                bit_reponse = 1 << (petit_enfant.coup[0] * colonnes + petit_enfant.coup[1])
+                if anciennes | bit | bit_reponse == occupees:
+                    # Même cases, vérifier aussi à qui elles appartiennent
+                    if (jeu.plateau[enfant.coup[0]][enfant.coup[1]] == self.symbole
+                            and jeu.plateau[petit_enfant.coup[0]][petit_enfant.coup[1]] != self.symbole):
+                        return petit_enfant
+        return None
+    
+    def _iterer(self, racine: _Noeud, jeu: TicTacToe, symbole: str):
+        """Une itération : sélection, expansion, simulations par lot, rétropropagation."""
+        noeud = racine
+        joues = 0
+        
+        # Sélection : UCB1 tant que le noeud est entièrement développé
+        while not noeud.a_essayer and noeud.enfants:
+            log_parent = math.log(noeud.visites)
+            exploration = self.exploration
+            noeud = max(noeud.enfants, key=lambda enfant: enfant.gains / enfant.visites
+                        + exploration * math.sqrt(log_parent / enfant.visites))
+            jeu.jouer_coup(noeud.coup[0], noeud.coup[1], symbole)
+            symbole = jeu.adversaire(symbole)
+            joues += 1
+        
+        # Expansion : un coup pas encore essayé (sauf position terminale)
+        resultat = jeu.verifier_gagnant()
+        if resultat is None and noeud.a_essayer:
+            coup = noeud.a_essayer.pop(random.randrange(len(noeud.a_essayer)))
+            jeu.jouer_coup(coup[0], coup[1], symbole)
+            symbole = jeu.adversaire(symbole)
+            joues += 1
+            resultat = jeu.verifier_gagnant()
+            enfant = _Noeud(coup, noeud, [] if resultat is not None else jeu.obtenir_coups_possibles())
+            noeud.enfants.append(enfant)
+            noeud = enfant
+        
+        # Simulation : parties aléatoires en lot, ou résultat connu
+        nb_parties = self.simulations_par_feuille
+        if resultat is None:
+            resultats = self._simuler(jeu, nb_parties)
+        else:
+            resultats = {jeu.HUMAIN: 0, jeu.IA: 0, 'NUL': 0}
+            resultats[resultat] = nb_parties
+        self.parties_simulees += nb_parties
+        
+        for _ in range(joues):
+            jeu.annuler_coup()
+        
+        # Rétropropagation : chaque noeud compte les gains de l'auteur de son coup
+        auteur = jeu.adversaire(symbole)
+        nuls = resultats['NUL'] / 2
+        while noeud is not None:
+            noeud.visites += nb_parties
+            noeud.gains += resultats[auteur] + nuls
+            auteur = jeu.adversaire(auteur)
+            noeud = noeud.parent
+    
+    def _simuler(self, jeu: TicTacToe, nb_parties: int) -> dict:
+        """Joue ``nb_parties`` parties aléatoires ensemble depuis la position du jeu."""
+        simulateur = self._simulateur
+        simulateur.reinitialiser(0)
+        bits_x, bits_o = jeu.bitboards[jeu.HUMAIN], jeu.bitboards[jeu.IA]
+        for i in range(nb_parties):
+            simulateur.charger_position(i, bits_x, bits_o)
+        
+        indices = list(range(nb_parties))
+        while indices:
+            coups = [random.choice(simulateur.obtenir_coups_possibles(i)) for i in indices]
+            simulateur.jouer(indices, coups)
+            indices = [i for i in indices if simulateur.actifs[i]]
+        return simulateur.resultats
+    
+    def nouvelle_partie(self):
+        """Oublie l'arbre de la partie précédente."""
+        self._racine = None
+        self._position_racine = None
+    
+    def obtenir_statistiques(self) -> dict:
+        """Retourne les statistiques du dernier coup calculé."""
+        racine = self._racine
+        return {
+            'iterations': self.iterations,
+            'parties_simulees': self.parties_simulees,
+            'visites_reutilisees': self.visites_reutilisees,
+            'noeuds_arbre': racine.taille() if racine is not None else 0,
+            'temps_reflexion': self.temps_reflexion,
+            'simulations': self.simulations,
+            'budget_ms': self.budget_ms,
+        }
+
+
+# Test du module
+if __name__ == "__main__":
+    from morpion_mnk import MorpionMNK
+    
+    print("Test du JoueurMCTS")
+    print("=" * 50)
+    
+    jeu = TicTacToe()
+    jeu.jouer_coup(0, 0, 'X')
+    jeu.jouer_coup(1, 1, 'O')
+    jeu.jouer_coup(0, 1, 'X')
+    jeu.afficher_plateau()
+    mcts = JoueurMCTS('O', simulations=3000)
+    print(f"O doit bloquer en (0, 2) : {mcts.obtenir_coup(jeu)}")
+    print(f"Statistiques : {mcts.obtenir_statistiques()}")
+    
+    print("\nPartie 7x7 (alignement 4), 300 ms par coup, arbre réutilisé:")
+    grand = MorpionMNK(7, 7, 4)
+    joueurs = {'X': JoueurMCTS('X', simulations=None, budget_ms=300),
+               'O': JoueurMCTS('O', simulations=None, budget_ms=300)}
+    while not grand.est_partie_terminee() and grand.nb_cases_occupees < 8:
+        joueur = joueurs[grand.joueur_actuel]
+        coup = joueur.obtenir_coup(grand)
+        grand.jouer_coup(coup[0], coup[1], joueur.symbole)
+        stats = joueur.obtenir_statistiques()
+        print(f"   {joueur.symbole} joue {coup}: {stats['parties_simulees']} parties simulées, "
+              f"{stats['visites_reutilisees']} visites réutilisées")
+    grand.afficher_plateau()
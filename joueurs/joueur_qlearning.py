@@ -24,11 +24,19 @@ try:
 except ImportError:
     from joueur_base import JoueurBase
 
+from morpion_mnk import MorpionMNK
+from symetries import Symetries, canonique
+from bibliotheque_ouvertures import obtenir_bibliotheque
+
 
 class JoueurQLearning(JoueurBase):
     """
     Agent Q-Learning qui apprend à jouer au Tic-Tac-Toe par renforcement.
     
+    Les états sont les clés canoniques des positions (voir symetries.py) et
+    les actions sont exprimées sur le plateau canonique : une position et ses
+    images par symétrie partagent les mêmes entrées de la table.
+    
     Attributs:
         table_q: Dictionnaire {(état, action): valeur_q}
         alpha: Taux d'apprentissage (learning rate)
@@ -44,7 +52,8 @@ class JoueurQLearning(JoueurBase):
                  gamma: float = 0.9,
                  epsilon: float = 0.1,
                  mode_entrainement: bool = True,
-                 fichier_sauvegarde: str = "qlearning_table.pkl"):
+                 fichier_sauvegarde: str = "qlearning_table.pkl",
+                 bibliotheque=None):
         """
         Initialise l'agent Q-Learning.
         
@@ -56,13 +65,15 @@ class JoueurQLearning(JoueurBase):
             epsilon: Taux d'exploration (0 à 1)
             mode_entrainement: Active l'exploration si True
             fichier_sauvegarde: Fichier pour sauvegarder la table Q
+            bibliotheque: Bibliothèque d'ouvertures jouée en mode jeu, coups tirés
+                          selon leurs poids (BibliothequeOuvertures ou chemin)
         """
         if nom is None:
             nom = f"Q-Learning {symbole}"
         super().__init__(symbole, nom)
-        self.table_q: Dict[Tuple[str, Tuple[int, int]], float] = {}
+        self.table_q: Dict[Tuple[int, Tuple[int, int]], float] = {}
         # DOUBLE Q-LEARNING : deux tables Q pour éviter le sur-optimisme
-        self.table_q2: Dict[Tuple[str, Tuple[int, int]], float] = {}
+        self.table_q2: Dict[Tuple[int, Tuple[int, int]], float] = {}
         self.alpha = alpha
         self.gamma = gamma
         self.epsilon = epsilon
@@ -71,6 +82,7 @@ class JoueurQLearning(JoueurBase):
         self.epsilon_decay = 0.995  # Taux de decay (0.995 = décroissance lente)
         self.mode_entrainement = mode_entrainement
         self.fichier_sauvegarde = fichier_sauvegarde
+        self.bibliotheque = obtenir_bibliotheque(bibliotheque)
         
         # Statistiques d'apprentissage
         self.victoires = 0
@@ -80,22 +92,26 @@ class JoueurQLearning(JoueurBase):
         
         # Historique de la partie en cours
         # Liste des transitions pour propager la récompense finale à tous les coups
-        # Élément: (etat_precedent, action_precedente, etat_suivant, coups_possibles_suivant)
+        # Élément: (etat_precedent, action_precedente, etat_suivant, coups_possibles_suivant,
+        #          coup_joue) ; le coup joué est celui du plateau réel
         self.historique_etats: list = []
         
         # État précédent pour TD-Learning
-        self.etat_precedent: Optional[str] = None
+        self.etat_precedent: Optional[int] = None
         self.action_precedente: Optional[Tuple[int, int]] = None
+        self.coup_precedent: Optional[Tuple[int, int]] = None
         
         # Charger la table Q si elle existe
         self.charger_table_q()
     
-    def compter_menaces(self, plateau, symbole: str, ligne_menace: int, col_menace: int) -> Tuple[int, int]:
+    def compter_menaces(self, plateau, symbole: str, ligne_menace: int, col_menace: int,
+                        alignement: int = 3) -> Tuple[int, int]:
         """
         Compte les menaces à une position donnée.
         Retourne : (nb_menaces_propres, nb_menaces_adversaire)
         
-        Menace = 2 symboles alignés avec une case vide pour le 3ème
+        Menace = alignement - 1 symboles alignés avec une case vide pour le dernier
+        (2 symboles alignés sur le plateau 3x3 classique)
         """
         adversaire = 'O' if symbole == 'X' else 'X'
         menaces_propres = 0
@@ -114,46 +130,43 @@ class JoueurQLearning(JoueurBase):
                 count_adversaire = 0
                 
                 # Compter dans cette direction
-                for dist in range(1, 3):
+                for dist in range(1, alignement):
                     x = ligne_menace + direction * dist * dx
                     y = col_menace + direction * dist * dy
                     
-                    if 0 <= x < 3 and 0 <= y < 3:
+                    if 0 <= x < len(plateau) and 0 <= y < len(plateau[0]):
                         if plateau[x][y] == symbole:
                             count_propre += 1
                         elif plateau[x][y] == adversaire:
                             count_adversaire += 1
                 
-                # Si 2 symboles propres -> on crée une menace
-                if count_propre == 2:
+                # Si alignement - 1 symboles propres -> on crée une menace
+                if count_propre == alignement - 1:
                     menaces_propres += 1
                 
-                # Si 2 symboles adversaire -> on bloque une menace
-                if count_adversaire == 2:
+                # Si alignement - 1 symboles adversaire -> on bloque une menace
+                if count_adversaire == alignement - 1:
                     menaces_adversaire += 1
         
         return menaces_propres, menaces_adversaire
     
-    def obtenir_recompense_intermediaire(self, jeu, etat_precedent: str, etat_actuel: str) -> float:
+    def obtenir_recompense_intermediaire(self, jeu, coup: Tuple[int, int]) -> float:
         """
         Calcule une récompense intermédiaire basée sur l'action tactique.
         
         + 0.2 : créer une menace de victoire (2 alignés)
         + 0.1 : bloquer une menace adversaire (2 alignés)
         - 0.2 : laisser l'adversaire créer une menace
+        
+        Args:
+            jeu: Instance du jeu
+            coup: Coup joué (ligne, colonne) sur le plateau réel
         """
-        # Trouver le coup joué en comparant les deux états
-        for i in range(9):
-            if etat_precedent[i] != etat_actuel[i]:
-                ligne = i // 3
-                col = i % 3
-                break
-        else:
-            return 0.0  # Aucun changement trouvé
+        ligne, col = coup
         
         # Analyser le plateau actuel
         menaces_propres, menaces_adversaire = self.compter_menaces(
-            jeu.plateau, self.symbole, ligne, col
+            jeu.plateau, self.symbole, ligne, col, jeu.alignement
         )
         
         recompense = 0.0
@@ -166,16 +179,29 @@ class JoueurQLearning(JoueurBase):
         
         return recompense
     
-    def obtenir_etat(self, jeu) -> str:
+    def obtenir_etat(self, jeu) -> int:
         """
-        Convertit le plateau de jeu en chaîne de caractères (état).
+        Retourne l'état du jeu : la clé canonique de la position.
         
         Returns:
-            Représentation en string du plateau (ex: "X O  X    ")
+            Plus petit rang en base 3 (0 vide, 1 X, 2 O par case) parmi les
+            images du plateau par symétrie
         """
-        return ''.join(''.join(ligne) for ligne in jeu.plateau)
+        return canonique(jeu)[0]
     
-    def obtenir_valeur_q(self, etat: str, action: Tuple[int, int]) -> float:
+    @staticmethod
+    def _etat_texte_vers_cle(etat: str) -> int:
+        """
+        Convertit un état de l'ancien format texte (ex: "X O  X    ") en clé.
+        
+        Utilisé pour relire les tables Q sauvegardées avant le passage aux clés entières.
+        """
+        cle = 0
+        for i, case in enumerate(etat):
+            cle += MorpionMNK.CHIFFRES[case] * 3 ** i
+        return cle
+    
+    def obtenir_valeur_q(self, etat: int, action: Tuple[int, int]) -> float:
         """
         Récupère la valeur Q pour une paire (état, action).
         DOUBLE Q-LEARNING : moyenne des deux tables
@@ -192,10 +218,10 @@ class JoueurQLearning(JoueurBase):
         return (q1 + q2) / 2  # Moyenne des deux tables
     
     def mettre_a_jour_q(self, 
-                        etat: str, 
+                        etat: int, 
                         action: Tuple[int, int], 
                         recompense: float, 
-                        prochain_etat: str,
+                        prochain_etat: int,
                         coups_possibles: list):
         """
         Met à jour la table Q selon l'équation de Bellman avec DOUBLE Q-LEARNING.
@@ -246,14 +272,15 @@ class JoueurQLearning(JoueurBase):
             Action choisie (ligne, colonne)
         """
         coups_possibles = jeu.obtenir_coups_possibles()
-        etat = self.obtenir_etat(jeu)
         
         # Exploration: action aléatoire
         if self.mode_entrainement and random.random() < self.epsilon:
             return random.choice(coups_possibles)
         
-        # Exploitation: meilleure action selon la table Q
-        valeurs_q = [(coup, self.obtenir_valeur_q(etat, coup)) 
+        # Exploitation: meilleure action selon la table Q, consultée sur le plateau canonique
+        etat, transformation = canonique(jeu)
+        symetries = Symetries.obtenir(jeu.lignes, jeu.colonnes)
+        valeurs_q = [(coup, self.obtenir_valeur_q(etat, symetries.transformer_coup(coup, transformation)))
                      for coup in coups_possibles]
         
         # Choisir l'action avec la plus haute valeur Q
@@ -274,25 +301,47 @@ class JoueurQLearning(JoueurBase):
         """
         debut = time.time()
         
-        etat_actuel = self.obtenir_etat(jeu)
-        action = self.choisir_action(jeu)
-        
-        # Enregistrer la transition (état précédent -> action -> état actuel)
-        # sans mettre à jour tout de suite : on attend la fin de partie
-        if self.mode_entrainement and self.etat_precedent is not None:
-            coups_possibles = jeu.obtenir_coups_possibles()
-            self.historique_etats.append(
-                (self.etat_precedent, self.action_precedente, etat_actuel, coups_possibles)
-            )
+        # En entraînement, l'agent explore lui-même les ouvertures
+        action = None
+        if self.bibliotheque is not None and not self.mode_entrainement:
+            action = self.bibliotheque.choisir(jeu, self.symbole, aleatoire=True)
+        if action is None:
+            action = self.choisir_action(jeu)
         
-        # Sauvegarder pour la prochaine transition
         if self.mode_entrainement:
+            # États et actions sont enregistrés sur le plateau canonique
+            etat_actuel, transformation = canonique(jeu)
+            symetries = Symetries.obtenir(jeu.lignes, jeu.colonnes)
+            
+            # Enregistrer la transition (état précédent -> action -> état actuel)
+            # sans mettre à jour tout de suite : on attend la fin de partie
+            if self.etat_precedent is not None:
+                coups_possibles = [symetries.transformer_coup(coup, transformation)
+                                   for coup in jeu.obtenir_coups_possibles()]
+                self.historique_etats.append(
+                    (self.etat_precedent, self.action_precedente, etat_actuel, coups_possibles,
+                     self.coup_precedent)
+                )
+            
+            # Sauvegarder pour la prochaine transition
             self.etat_precedent = etat_actuel
-            self.action_precedente = action
+            self.action_precedente = symetries.transformer_coup(action, transformation)
+            self.coup_precedent = action
         
         self.temps_reflexion = (time.time() - debut) * 1000
         return action
     
+    def obtenir_coups_lot(self, simulateur, indices: list) -> list:
+        """
+        Joue sur les plateaux d'un simulateur par lot (mode exploitation seulement).
+        
+        L'historique des transitions ne suit qu'une partie à la fois.
+        """
+        if self.mode_entrainement:
+            raise ValueError(f"{self.nom} apprend partie par partie : "
+                             "activer le mode exploitation pour jouer par lot")
+        return super().obtenir_coups_lot(simulateur, indices)
+    
     def apprendre(self, jeu, resultat: Optional[str]):
         """
         Met à jour la table Q après la fin de la partie (récompense finale).
@@ -322,7 +371,8 @@ class JoueurQLearning(JoueurBase):
         etat_terminal = self.obtenir_etat(jeu)
         if self.etat_precedent is not None and self.action_precedente is not None:
             self.historique_etats.append(
-                (self.etat_precedent, self.action_precedente, etat_terminal, [])
+                (self.etat_precedent, self.action_precedente, etat_terminal, [],
+                 self.coup_precedent)
             )
         
         # PROPAGATION RÉTROACTIVE : partir de la fin et remonter
@@ -331,14 +381,14 @@ class JoueurQLearning(JoueurBase):
         # + récompenses intermédiaires pour les actions tactiques (bloquer, menacer)
         
         for i in range(len(self.historique_etats) - 1, -1, -1):
-            etat, action, etat_suivant, coups_suivants = self.historique_etats[i]
+            etat, action, etat_suivant, coups_suivants, coup_joue = self.historique_etats[i]
             
             if i == len(self.historique_etats) - 1:
                 # Dernier coup : utiliser la récompense finale
                 recompense = recompense_finale
             else:
                 # Coups intermédiaires : récompense tactique (bloquer menace, créer menace)
-                recompense = self.obtenir_recompense_intermediaire(jeu, etat, etat_suivant)
+                recompense = self.obtenir_recompense_intermediaire(jeu, coup_joue)
             
             self.mettre_a_jour_q(etat, action, recompense, etat_suivant, coups_suivants)
         
@@ -350,6 +400,7 @@ class JoueurQLearning(JoueurBase):
         # Réinitialiser pour la prochaine partie
         self.etat_precedent = None
         self.action_precedente = None
+        self.coup_precedent = None
         self.historique_etats = []
         
         # Sauvegarder après chaque partie
@@ -362,6 +413,7 @@ class JoueurQLearning(JoueurBase):
                 donnees = {
                     'table_q': self.table_q,
                     'table_q2': self.table_q2,  # Deuxième table pour Double Q-Learning
+                    'canonique': True,  # États et actions rangés sur le plateau canonique
                     'victoires': self.victoires,
                     'defaites': self.defaites,
                     'nuls': self.nuls,
@@ -378,8 +430,9 @@ class JoueurQLearning(JoueurBase):
         try:
             with open(self.fichier_sauvegarde, 'rb') as f:
                 donnees = pickle.load(f)
-                self.table_q = donnees.get('table_q', {})
-                self.table_q2 = donnees.get('table_q2', {})  # Deuxième table
+                est_canonique = donnees.get('canonique', False)
+                self.table_q = self._convertir_table(donnees.get('table_q', {}), est_canonique)
+                self.table_q2 = self._convertir_table(donnees.get('table_q2', {}), est_canonique)  # Deuxième table
                 self.victoires = donnees.get('victoires', 0)
                 self.defaites = donnees.get('defaites', 0)
                 self.nuls = donnees.get('nuls', 0)
@@ -392,6 +445,32 @@ class JoueurQLearning(JoueurBase):
         except Exception as e:
             print(f"[Q-Learning] Erreur lors du chargement: {e}")
     
+    def _convertir_table(self, table: dict, est_canonique: bool = True) -> dict:
+        """
+        Convertit une table Q chargée vers le format courant.
+        
+        Les états texte deviennent des clés entières. Les tables enregistrées
+        avant la canonicalisation (toujours sur le plateau 3x3) sont ramenées
+        sur le plateau canonique ; les entrées qui se retrouvent sur la même
+        paire (état, action) sont fusionnées par moyenne.
+        
+        Args:
+            table: Table Q telle que chargée depuis le fichier
+            est_canonique: True si la table est déjà indexée par états canoniques
+        """
+        if est_canonique:
+            return dict(table)
+        
+        symetries = Symetries.obtenir(3, 3)
+        sommes: Dict[Tuple[int, Tuple[int, int]], list] = {}
+        for (etat, action), valeur in table.items():
+            cle = self._etat_texte_vers_cle(etat) if isinstance(etat, str) else etat
+            cle_canonique, transformation = symetries.canonique_cle(cle)
+            entree = sommes.setdefault((cle_canonique, symetries.transformer_coup(action, transformation)), [0.0, 0])
+            entree[0] += valeur
+            entree[1] += 1
+        return {paire: somme / nombre for paire, (somme, nombre) in sommes.items()}
+    
     def obtenir_statistiques(self) -> dict:
         """
         Retourne les statistiques d'apprentissage.
@@ -9,6 +9,8 @@ import time
 import math
 from typing import Tuple, List
 from .joueur_base import JoueurBase
+from symetries import Symetries, canonique
+from bibliotheque_ouvertures import obtenir_bibliotheque
 
 
 class ReseauNeurones:
@@ -296,7 +298,9 @@ class JoueurReseauNeurones(JoueurBase):
                  taille_cachee: int = 36,
                  taux_apprentissage: float = 0.05,
                  epsilon: float = 0.2,
-                 fichier_sauvegarde: str = None):
+                 fichier_sauvegarde: str = None,
+                 nb_cases: int = 9,
+                 bibliotheque=None):
         """
         Initialise le joueur réseau de neurones avec ses hyperparamètres.
         
@@ -313,6 +317,10 @@ class JoueurReseauNeurones(JoueurBase):
                     20% du temps: joue un coup aléatoire (exploration)
                     80% du temps: joue le meilleur coup connu (exploitation)
             fichier_sauvegarde: Fichier pickle pour sauvegarder/charger le réseau
+            nb_cases: Nombre de cases du plateau (9 pour le 3x3, 16 pour le 4x4...)
+                      Le réseau a une entrée et une sortie par case
+            bibliotheque: Bibliothèque d'ouvertures jouée en mode jeu, coups tirés
+                          selon leurs poids (BibliothequeOuvertures ou chemin)
         """
         super().__init__(symbole, nom)
         
@@ -321,9 +329,17 @@ class JoueurReseauNeurones(JoueurBase):
         self.taux_apprentissage = taux_apprentissage
         self.epsilon = epsilon
         self.mode_entrainement = mode_entrainement
+        self.nb_cases = nb_cases
+        self.bibliotheque = obtenir_bibliotheque(bibliotheque)
         
         # Fichier de sauvegarde: par défaut un fichier distinct par symbole pour éviter l'écrasement
-        self.fichier_sauvegarde = fichier_sauvegarde if fichier_sauvegarde else f"reseau_neurones_{symbole}.pkl"
+        # (et par taille de plateau, les poids d'un 3x3 ne servent pas sur un 4x4)
+        if fichier_sauvegarde:
+            self.fichier_sauvegarde = fichier_sauvegarde
+        elif nb_cases == 9:
+            self.fichier_sauvegarde = f"reseau_neurones_{symbole}.pkl"
+        else:
+            self.fichier_sauvegarde = f"reseau_neurones_{nb_cases}_{symbole}.pkl"
         
         # Historique pour l'apprentissage
         # Stocke tous les (état_plateau, coup_joué) de la partie en cours
@@ -331,6 +347,9 @@ class JoueurReseauNeurones(JoueurBase):
         self.historique_etats = []
         self.temps_reflexion = 0.0
         
+        # Vecteurs d'entrée déjà calculés, indexés par la clé de position du jeu
+        self._vecteurs = {}
+        
         # Statistiques d'apprentissage
         # CRITIQUE: Ces statistiques doivent être initialisées AVANT charger_reseau()
         # Sinon elles écraseraient les valeurs chargées depuis le fichier
@@ -342,40 +361,74 @@ class JoueurReseauNeurones(JoueurBase):
         
         # Création du réseau puis chargement des poids depuis le fichier (si existant)
         # L'ordre est important: créer puis charger
-        self.reseau = ReseauNeurones(9, taille_cachee, 9, taux_apprentissage)
+        self.reseau = ReseauNeurones(nb_cases, taille_cachee, nb_cases, taux_apprentissage)
         self.charger_reseau()
     
-    def plateau_vers_vecteur(self, jeu) -> List[float]:
+    # Nombre maximal de vecteurs gardés en mémoire (les grands plateaux ont trop de positions)
+    TAILLE_MAX_VECTEURS = 50000
+    
+    def plateau_vers_vecteur(self, jeu) -> Tuple[float, ...]:
         """
         Convertit l'état du plateau de jeu en vecteur numérique pour le réseau.
         
         Le réseau ne comprend que des nombres, donc on transforme chaque case:
         - Notre symbole: +1.0 (positif car c'est nous)
-        - Case vide: 0.0 (neutre)
         - Symbole adverse: -1.0 (négatif car c'est l'adversaire)
+        - Case vide: -1.0 également. Les poids fournis ont été entraînés avec
+          ce codage (l'ancien test `case is None` ne reconnaissait jamais
+          une case vide), on le conserve pour rester compatible.
+        
+        Le vecteur est lu directement dans la clé de position du jeu (un chiffre
+        en base 3 par case) et mémorisé : une position déjà vue ne coûte
+        qu'une recherche dans un dictionnaire.
+        
+        Args:
+            jeu: Instance du jeu TicTacToe
+            
+        Returns:
+            Vecteur d'une valeur par case (-1, 1) pour (adversaire ou vide, nous).
+            Le tuple est partagé entre les appels et ne doit pas être modifié.
+        """
+        if jeu.nb_cases != self.nb_cases:
+            raise ValueError(f"{self.nom} est entraîné pour {self.nb_cases} cases, "
+                             f"le plateau en a {jeu.nb_cases}")
+        return self._vecteur_depuis_cle(jeu.cle)
+    
+    def vecteur_canonique(self, jeu) -> Tuple[Tuple[float, ...], int]:
+        """
+        Vecteur d'entrée de la position canonique du plateau (voir symetries.py).
         
-        Cette représentation permet au réseau de distinguer facilement:
-        - Nos positions (valeurs positives)
-        - Les positions adverses (valeurs négatives)
-        - Les cases libres (zéros)
+        Le réseau joue et apprend sur les positions canoniques : les positions
+        symétriques partagent les mêmes exemples d'entraînement. La case i du
+        plateau réel correspond à l'entrée symetries.transformer_index(i, t).
         
         Args:
             jeu: Instance du jeu TicTacToe
             
         Returns:
-            Vecteur de 9 valeurs (-1, 0, 1) pour (adversaire, vide, nous)
-        """
-        plateau = jeu.plateau
-        vecteur = []
-        for i in range(3):
-            for j in range(3):
-                case = plateau[i][j]
-                if case == self.symbole:
-                    vecteur.append(1.0)  # Notre symbole
-                elif case is None:
-                    vecteur.append(0.0)  # Case vide
-                else:
-                    vecteur.append(-1.0)  # Symbole adverse
+            (vecteur, transformation) avec le même codage que plateau_vers_vecteur
+        """
+        if jeu.nb_cases != self.nb_cases:
+            raise ValueError(f"{self.nom} est entraîné pour {self.nb_cases} cases, "
+                             f"le plateau en a {jeu.nb_cases}")
+        cle_canonique, transformation = canonique(jeu)
+        return self._vecteur_depuis_cle(cle_canonique), transformation
+    
+    def _vecteur_depuis_cle(self, cle_position: int) -> Tuple[float, ...]:
+        """Décode (et mémorise) le vecteur d'entrée d'une clé de position."""
+        vecteur = self._vecteurs.get(cle_position)
+        if vecteur is None:
+            # Valeur de chaque chiffre de la clé : 0 vide, 1 X, 2 O
+            valeurs = (-1.0, 1.0 if self.symbole == 'X' else -1.0, 1.0 if self.symbole == 'O' else -1.0)
+            cle = cle_position
+            cases = []
+            for _ in range(self.nb_cases):
+                cle, chiffre = divmod(cle, 3)
+                cases.append(valeurs[chiffre])
+            vecteur = tuple(cases)
+            if len(self._vecteurs) >= self.TAILLE_MAX_VECTEURS:
+                self._vecteurs.clear()
+            self._vecteurs[cle_position] = vecteur
         return vecteur
     
     def choisir_action(self, jeu) -> Tuple[int, int]:
@@ -407,8 +460,9 @@ class JoueurReseauNeurones(JoueurBase):
             return random.choice(coups_possibles)
         
         # Phase d'exploitation: utiliser le réseau de neurones pour choisir
-        # Convertir le plateau en vecteur numérique
-        entree = self.plateau_vers_vecteur(jeu)
+        # Convertir le plateau canonique en vecteur numérique
+        entree, transformation = self.vecteur_canonique(jeu)
+        symetries = Symetries.obtenir(jeu.lignes, jeu.colonnes)
         
         # Obtenir les prédictions du réseau (une valeur par case)
         predictions = self.reseau.predire(entree)
@@ -417,8 +471,8 @@ class JoueurReseauNeurones(JoueurBase):
         # Seuls les coups légaux sont considérés
         coups_valeurs = []
         for coup in coups_possibles:
-            # Convertir coordonnées (ligne, col) en index linéaire 0-8
-            index = coup[0] * 3 + coup[1]
+            # Convertir coordonnées (ligne, col) en index de la case sur le plateau canonique
+            index = symetries.transformer_index(coup[0] * jeu.colonnes + coup[1], transformation)
             coups_valeurs.append((coup, predictions[index]))
         
         # Choisir le coup avec la valeur la plus élevée
@@ -446,22 +500,61 @@ class JoueurReseauNeurones(JoueurBase):
         """
         debut = time.time()
         
-        # Convertir l'état actuel du plateau en vecteur numérique
-        plateau = self.plateau_vers_vecteur(jeu)
+        # Convertir l'état actuel du plateau (canonique) en vecteur numérique
+        plateau, transformation = self.vecteur_canonique(jeu)
         
-        # Choisir un coup avec la stratégie epsilon-greedy
-        action = self.choisir_action(jeu)
+        # Choisir un coup : bibliothèque d'ouvertures en mode jeu, sinon epsilon-greedy
+        action = None
+        if self.bibliotheque is not None and not self.mode_entrainement:
+            action = self.bibliotheque.choisir(jeu, self.symbole, aleatoire=True)
+        if action is None:
+            action = self.choisir_action(jeu)
         
         # Enregistrer dans l'historique pour l'apprentissage post-partie
-        # Chaque entrée contient: (état_du_plateau, coup_joué)
-        # Cela permet de savoir quels coups ont mené à la victoire/défaite
+        # Chaque entrée contient: (état_du_plateau, index de la case jouée), tous deux
+        # sur le plateau canonique. Cela permet de savoir quels coups ont mené à la victoire/défaite
         if self.mode_entrainement:
-            self.historique_etats.append((plateau, action))
+            symetries = Symetries.obtenir(jeu.lignes, jeu.colonnes)
+            index_coup = symetries.transformer_index(action[0] * jeu.colonnes + action[1], transformation)
+            self.historique_etats.append((plateau, index_coup))
         
         # Mesurer le temps de réflexion (pour statistiques)
         self.temps_reflexion = time.time() - debut
         return action
     
+    def obtenir_coups_lot(self, simulateur, indices: List[int]) -> List[Tuple[int, int]]:
+        """
+        Choisit le meilleur coup selon le réseau sur chaque plateau d'un lot.
+        
+        Les positions sont lues directement dans les bitboards du simulateur.
+        L'historique d'apprentissage ne suit qu'une partie à la fois : le jeu
+        par lot n'est possible qu'en mode exploitation.
+        
+        Args:
+            simulateur: Instance de simulateur_lot.SimulateurLot
+            indices: Plateaux sur lesquels ce joueur est au trait
+            
+        Returns:
+            Liste des coups (ligne, colonne), dans l'ordre des indices
+        """
+        if self.mode_entrainement:
+            raise ValueError(f"{self.nom} apprend partie par partie : "
+                             "désactiver mode_entrainement pour jouer par lot")
+        if simulateur.nb_cases != self.nb_cases:
+            raise ValueError(f"{self.nom} est entraîné pour {self.nb_cases} cases, "
+                             f"le plateau en a {simulateur.nb_cases}")
+        
+        symetries = Symetries.obtenir(simulateur.lignes, simulateur.colonnes)
+        colonnes = simulateur.colonnes
+        coups = []
+        for i in indices:
+            cle_canonique, transformation = symetries.canonique(simulateur.bits_x[i], simulateur.bits_o[i])
+            predictions = self.reseau.predire(self._vecteur_depuis_cle(cle_canonique))
+            permutation = symetries.permutations[transformation]
+            coups.append(max(simulateur.obtenir_coups_possibles(i),
+                             key=lambda coup: predictions[permutation[coup[0] * colonnes + coup[1]]]))
+        return coups
+    
     def apprendre(self, jeu, resultat):
         """
         Apprend de la partie jouée avec l'algorithme de différence temporelle.
@@ -505,7 +598,7 @@ class JoueurReseauNeurones(JoueurBase):
         # Parcourir l'historique de la fin au début
         # Important: on va de la fin vers le début pour propager la récompense
         for i in range(len(self.historique_etats) - 1, -1, -1):
-            plateau, coup = self.historique_etats[i]
+            plateau, index_coup = self.historique_etats[i]
             
             # Calcul de la récompense ajustée avec le facteur de discount
             # Plus un coup est loin de la fin, moins il influence le résultat
@@ -524,7 +617,6 @@ class JoueurReseauNeurones(JoueurBase):
             # On garde toutes les prédictions actuelles sauf pour le coup qu'on a joué
             # Cela permet de n'ajuster que l'évaluation du coup joué, pas des autres cases
             cible = predictions.copy()
-            index_coup = coup[0] * 3 + coup[1]  # Convertir (ligne, col) en index 0-8
             cible[index_coup] = recompense_ajustee  # Ajuster uniquement ce coup
             
             # Rétropropagation pour mettre à jour les poids
@@ -1,96 +1,50 @@
 """
 Module principal pour le jeu de Tic-Tac-Toe avec IA 
 Ce module contient toute la logique du jeu et peut être utilisé par différentes interfaces.
+
+Le plateau est stocké sous forme de deux bitboards de 9 bits (un par symbole) :
+la case (ligne, colonne) correspond au bit ``ligne * 3 + colonne``. L'attribut
+``plateau`` reste disponible comme vue 3x3 compatible avec l'ancienne liste.
+TicTacToe est le cas 3,3,3 du moteur généralisé morpion_mnk.MorpionMNK.
 """
 
 import math
-from typing import List, Tuple, Optional
+from typing import List, Tuple
+
+from morpion_mnk import MorpionMNK
+from moteur_recherche import MoteurRecherche
+
+
+# Masque des 9 cases du plateau
+MASQUE_PLEIN = 0b111111111
+
+# Masques des 8 alignements gagnants (3 lignes, 3 colonnes, 2 diagonales)
+MASQUES_VICTOIRE = (
+    0b000000111, 0b000111000, 0b111000000,  # Lignes
+    0b001001001, 0b010010010, 0b100100100,  # Colonnes
+    0b100010001, 0b001010100,               # Diagonales
+)
 
+# Coups possibles précalculés pour chacun des 512 masques de cases libres
+COUPS_PAR_MASQUE = tuple(
+    tuple((i // 3, i % 3) for i in range(9) if masque >> i & 1)
+    for masque in range(MASQUE_PLEIN + 1)
+)
 
-class TicTacToe:
+
+class TicTacToe(MorpionMNK):
     """Classe représentant le jeu de Tic-Tac-Toe."""
     
-    # Constantes pour les joueurs
-    HUMAIN = 'X'
-    IA = 'O'
-    VIDE = ' '
+    # Moteur de recherche (moteur_recherche.py), créé par instance au premier appel
+    moteur = None
     
     def __init__(self):
         """Initialise une nouvelle partie."""
-        self.plateau = [[self.VIDE for _ in range(3)] for _ in range(3)]
-        self.joueur_actuel = self.HUMAIN  # L'humain commence
-    
-    def reinitialiser(self):
-        """Réinitialise le plateau de jeu."""
-        self.plateau = [[self.VIDE for _ in range(3)] for _ in range(3)]
-        self.joueur_actuel = self.HUMAIN
-    
-    def obtenir_plateau(self) -> List[List[str]]:
-        """Retourne une copie du plateau actuel."""
-        return [ligne[:] for ligne in self.plateau]
-    
-    def jouer_coup(self, ligne: int, colonne: int, joueur: str) -> bool:
-        """
-        Effectue un coup sur le plateau.
-        
-        Args:
-            ligne: Ligne (0-2)
-            colonne: Colonne (0-2)
-            joueur: Le joueur qui fait le coup (HUMAIN ou IA)
-        
-        Returns:
-            True si le coup est valide, False sinon
-        """
-        if 0 <= ligne < 3 and 0 <= colonne < 3 and self.plateau[ligne][colonne] == self.VIDE:
-            self.plateau[ligne][colonne] = joueur
-            return True
-        return False
-    
-    def annuler_coup(self, ligne: int, colonne: int):
-        """Annule un coup (pour Minimax)."""
-        self.plateau[ligne][colonne] = self.VIDE
+        super().__init__(3, 3, 3)
     
     def obtenir_coups_possibles(self) -> List[Tuple[int, int]]:
         """Retourne la liste des coups possibles."""
-        coups = []
-        for i in range(3):
-            for j in range(3):
-                if self.plateau[i][j] == self.VIDE:
-                    coups.append((i, j))
-        return coups
-    
-    def verifier_gagnant(self) -> Optional[str]:
-        """
-        Vérifie s'il y a un gagnant.
-        
-        Returns:
-            HUMAIN, IA, 'NUL' ou None si la partie continue
-        """
-        # Vérifier les lignes
-        for ligne in self.plateau:
-            if ligne[0] == ligne[1] == ligne[2] != self.VIDE:
-                return ligne[0]
-        
-        # Vérifier les colonnes
-        for col in range(3):
-            if self.plateau[0][col] == self.plateau[1][col] == self.plateau[2][col] != self.VIDE:
-                return self.plateau[0][col]
-        
-        # Vérifier les diagonales
-        if self.plateau[0][0] == self.plateau[1][1] == self.plateau[2][2] != self.VIDE:
-            return self.plateau[0][0]
-        if self.plateau[0][2] == self.plateau[1][1] == self.plateau[2][0] != self.VIDE:
-            return self.plateau[0][2]
-        
-        # Vérifier match nul
-        if not self.obtenir_coups_possibles():
-            return 'NUL'
-        
-        return None
-    
-    def est_partie_terminee(self) -> bool:
-        """Vérifie si la partie est terminée."""
-        return self.verifier_gagnant() is not None
+        return list(COUPS_PAR_MASQUE[self.obtenir_cases_libres()])
     
     def evaluer_plateau(self) -> int:
         """
@@ -109,10 +63,19 @@ class TicTacToe:
         else:
             return 0
     
+    def _obtenir_moteur(self) -> MoteurRecherche:
+        """Retourne le moteur de recherche de cette partie (créé au premier appel)."""
+        if self.moteur is None:
+            self.moteur = MoteurRecherche()
+        return self.moteur
+    
     def minimax(self, profondeur: int, est_maximisant: bool, alpha: int = -math.inf, beta: int = math.inf) -> int:
         """
         Algorithme Minimax avec élagage Alpha-Beta.
         
+        La recherche est déléguée au moteur négamax commun ; le score est
+        ramené à l'échelle historique, du point de vue de l'IA.
+        
         Args:
             profondeur: Profondeur actuelle dans l'arbre de recherche
             est_maximisant: True si c'est le tour de l'IA (maximise le score)
@@ -120,73 +83,47 @@ class TicTacToe:
             beta: Meilleur score garanti pour le minimiseur
         
         Returns:
-            Le meilleur score possible pour le joueur actuel
+            Le meilleur score possible pour le joueur actuel : 10 - d pour une
+            victoire de l'IA au d-ième demi-coup (``profondeur`` compris),
+            d - 10 pour une défaite, 0 pour un nul
         """
-        # Condition de base : partie terminée
-        score = self.evaluer_plateau()
-        if score == 10:
-            return score - profondeur  # Favorise les victoires rapides
-        if score == -10:
-            return score + profondeur  # Retarde les défaites
-        
-        # Match nul
-        if not self.obtenir_coups_possibles():
-            return 0
-        
-        if est_maximisant:
-            # Tour de l'IA (maximise)
-            eval_max = -math.inf
-            for ligne, col in self.obtenir_coups_possibles():
-                self.plateau[ligne][col] = self.IA
-                score_eval = self.minimax(profondeur + 1, False, alpha, beta)
-                self.plateau[ligne][col] = self.VIDE
-                eval_max = max(eval_max, score_eval)
-                alpha = max(alpha, score_eval)
-                if beta <= alpha:
-                    break  # Élagage Beta
-            return eval_max
-        else:
-            # Tour de l'humain (minimise)
-            eval_min = math.inf
-            for ligne, col in self.obtenir_coups_possibles():
-                self.plateau[ligne][col] = self.HUMAIN
-                score_eval = self.minimax(profondeur + 1, True, alpha, beta)
-                self.plateau[ligne][col] = self.VIDE
-                eval_min = min(eval_min, score_eval)
-                beta = min(beta, score_eval)
-                if beta <= alpha:
-                    break  # Élagage Alpha
-            return eval_min
-    
-    def obtenir_meilleur_coup(self) -> Tuple[int, int]:
+        # Le score exact est toujours dans la fenêtre : alpha et beta sont inutiles
+        symbole = self.IA if est_maximisant else self.HUMAIN
+        score = self._obtenir_moteur().evaluer(self, symbole)
+        if symbole == self.HUMAIN:
+            score = -score
+        # Le moteur compte en cases occupées (10 - n), minimax en profondeur (10 - d)
+        decalage = self.nb_cases_occupees - profondeur
+        if score > 0:
+            return score + decalage
+        if score < 0:
+            return score - decalage
+        return 0
+    
+    def obtenir_meilleur_coup(self, mode: str = 'minimax') -> Tuple[int, int]:
         """
         Trouve le meilleur coup pour l'IA en utilisant Minimax.
         
+        Args:
+            mode: 'minimax' pour chercher dans l'arbre, 'table' pour lire la
+                  table de résolution complète (réponse en temps constant)
+        
         Returns:
             Tuple (ligne, colonne) du meilleur coup
         """
-        meilleur_score = -math.inf
-        meilleur_coup = None
+        if mode == 'table':
+            from table_resolue import obtenir_meilleur_coup
+            coup = obtenir_meilleur_coup(self, self.IA)
+            if coup is not None:
+                return coup
+        elif mode != 'minimax':
+            raise ValueError(f"Mode inconnu: {mode!r}")
         
-        for ligne, col in self.obtenir_coups_possibles():
-            self.plateau[ligne][col] = self.IA
-            score = self.minimax(0, False)
-            self.plateau[ligne][col] = self.VIDE
-            
-            if score > meilleur_score:
-                meilleur_score = score
-                meilleur_coup = (ligne, col)
+        moteur = self._obtenir_moteur()
+        moteur.reinitialiser_statistiques()
+        meilleur_coup, _ = moteur.rechercher(self, self.IA)
         
         return meilleur_coup if meilleur_coup else (0, 0)
-    
-    def afficher_plateau(self):
-        """Affiche le plateau dans la console (pour debug)."""
-        print("\n  0   1   2")
-        for i, ligne in enumerate(self.plateau):
-            print(f"{i} {ligne[0]} | {ligne[1]} | {ligne[2]}")
-            if i < 2:
-                print(" -----------")
-        print()
 
 
 # Fonction utilitaire pour tester
@@ -0,0 +1,469 @@
+"""
+Moteur de plateau généralisé m,n,k : plateau de m lignes et n colonnes, la
+victoire revient au premier joueur qui aligne k symboles (horizontalement,
+verticalement ou en diagonale).
+
+Chaque symbole est stocké dans un bitboard : la case (ligne, colonne)
+correspond au bit ``ligne * colonnes + colonne``. Toutes les fenêtres de k
+cases alignées sont précalculées une fois par géométrie ; jouer_coup et
+annuler_coup ne mettent à jour que les fenêtres qui passent par la case
+jouée, si bien que la détection de victoire ne regarde que le dernier coup.
+
+Le jeu maintient aussi une clé de position entière, le rang en base 3 du
+plateau : chaque case vaut 0 (vide), 1 (X) ou 2 (O) et la clé est
+``somme(chiffre(case) * 3**index)``. Elle est tenue à jour par jouer_coup et
+annuler_coup et sert d'identifiant de position à tous les joueurs.
+
+Les coups joués sont empilés dans ``historique_coups`` : annuler_coup() sans
+argument dépile le dernier coup, le joueur au trait (``joueur_actuel``) suit
+les coups joués et annulés, et rejouer() reconstruit n'importe quel moment
+de la partie.
+
+Le Tic-Tac-Toe classique (morpion_base.TicTacToe) est le cas 3,3,3.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+
+class Geometrie:
+    """Tables précalculées pour une géométrie (lignes, colonnes, alignement)."""
+    
+    def __init__(self, lignes: int, colonnes: int, alignement: int):
+        """
+        Précalcule les fenêtres d'alignement du plateau.
+        
+        Args:
+            lignes: Nombre de lignes (m)
+            colonnes: Nombre de colonnes (n)
+            alignement: Nombre de symboles à aligner pour gagner (k)
+        """
+        if lignes < 1 or colonnes < 1:
+            raise ValueError("Le plateau doit avoir au moins une ligne et une colonne")
+        if not 1 <= alignement <= max(lignes, colonnes):
+            raise ValueError(f"Alignement impossible sur un plateau {lignes}x{colonnes}: {alignement}")
+        
+        self.lignes = lignes
+        self.colonnes = colonnes
+        self.alignement = alignement
+        self.nb_cases = lignes * colonnes
+        self.masque_plein = (1 << self.nb_cases) - 1
+        
+        # Toutes les fenêtres de k cases alignées, dans les 4 directions
+        masques = []
+        for dl, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            for l in range(lignes):
+                for c in range(colonnes):
+                    fin_l = l + dl * (alignement - 1)
+                    fin_c = c + dc * (alignement - 1)
+                    if not (0 <= fin_l < lignes and 0 <= fin_c < colonnes):
+                        continue
+                    masque = 0
+                    for pas in range(alignement):
+                        masque |= 1 << ((l + dl * pas) * colonnes + c + dc * pas)
+                    masques.append(masque)
+        # Avec k = 1, les quatre directions donnent la même fenêtre
+        self.masques_alignements = tuple(dict.fromkeys(masques))
+        self.nb_alignements = len(self.masques_alignements)
+        
+        # Fenêtres passant par chaque case
+        self.alignements_par_case = tuple(
+            tuple(n for n, masque in enumerate(self.masques_alignements) if masque >> i & 1)
+            for i in range(self.nb_cases)
+        )
+        
+        # Coordonnées de chaque case
+        self.coordonnees = tuple(divmod(i, colonnes) for i in range(self.nb_cases))
+        
+        # Poids de chaque case dans la clé de position (rang en base 3)
+        self.puissances3 = tuple(3 ** i for i in range(self.nb_cases))
+    
+    _cache: Dict[Tuple[int, int, int], 'Geometrie'] = {}
+    
+    @classmethod
+    def obtenir(cls, lignes: int, colonnes: int, alignement: int) -> 'Geometrie':
+        """Retourne la géométrie demandée, précalculée une seule fois par processus."""
+        cle = (lignes, colonnes, alignement)
+        geometrie = cls._cache.get(cle)
+        if geometrie is None:
+            geometrie = cls._cache[cle] = cls(lignes, colonnes, alignement)
+        return geometrie
+
+
+class _VueLigne:
+    """Vue d'une ligne du plateau, lue et écrite dans les bitboards du jeu."""
+    
+    __slots__ = ('_jeu', '_ligne')
+    
+    def __init__(self, jeu: 'MorpionMNK', ligne: int):
+        self._jeu = jeu
+        self._ligne = ligne
+    
+    def _index(self, colonne: int) -> int:
+        colonnes = self._jeu.colonnes
+        if colonne < 0:
+            colonne += colonnes
+        if not 0 <= colonne < colonnes:
+            raise IndexError("indice de colonne hors du plateau")
+        return self._ligne * colonnes + colonne
+    
+    def __getitem__(self, colonne):
+        if isinstance(colonne, slice):
+            return list(self)[colonne]
+        return self._jeu._symbole_case(self._index(colonne))
+    
+    def __setitem__(self, colonne: int, symbole: str):
+        self._jeu._placer(self._index(colonne), symbole)
+    
+    def __iter__(self):
+        symbole_case = self._jeu._symbole_case
+        debut = self._ligne * self._jeu.colonnes
+        return iter([symbole_case(i) for i in range(debut, debut + self._jeu.colonnes)])
+    
+    def __len__(self):
+        return self._jeu.colonnes
+    
+    def __eq__(self, autre):
+        try:
+            return list(self) == list(autre)
+        except TypeError:
+            return NotImplemented
+    
+    def __repr__(self):
+        return repr(list(self))
+
+
+class _VuePlateau:
+    """Vue m x n du plateau, compatible avec une liste de listes."""
+    
+    __slots__ = ('_lignes',)
+    
+    def __init__(self, jeu: 'MorpionMNK'):
+        self._lignes = tuple(_VueLigne(jeu, l) for l in range(jeu.lignes))
+    
+    def __getitem__(self, ligne):
+        return self._lignes[ligne]
+    
+    def __iter__(self):
+        return iter(self._lignes)
+    
+    def __len__(self):
+        return len(self._lignes)
+    
+    def __eq__(self, autre):
+        try:
+            return [list(ligne) for ligne in self] == [list(ligne) for ligne in autre]
+        except TypeError:
+            return NotImplemented
+    
+    def __repr__(self):
+        return repr([list(ligne) for ligne in self])
+
+
+class MorpionMNK:
+    """Jeu m,n,k : plateau m x n, victoire avec k symboles alignés."""
+    
+    # Constantes pour les joueurs
+    HUMAIN = 'X'
+    IA = 'O'
+    VIDE = ' '
+    
+    # Chiffre de chaque symbole dans la clé de position
+    CHIFFRES = {VIDE: 0, HUMAIN: 1, IA: 2}
+    
+    def __init__(self, lignes: int = 3, colonnes: int = 3, alignement: int = 3):
+        """
+        Initialise une nouvelle partie.
+        
+        Args:
+            lignes: Nombre de lignes du plateau (m)
+            colonnes: Nombre de colonnes du plateau (n)
+            alignement: Nombre de symboles à aligner pour gagner (k)
+        """
+        self.geometrie = Geometrie.obtenir(lignes, colonnes, alignement)
+        self.lignes = lignes
+        self.colonnes = colonnes
+        self.alignement = alignement
+        self.nb_cases = self.geometrie.nb_cases
+        
+        self.bitboards = {self.HUMAIN: 0, self.IA: 0}
+        # État incrémental : pions par alignement, alignements complets, cases occupées
+        nb_alignements = self.geometrie.nb_alignements
+        self.comptes_lignes = {self.HUMAIN: [0] * nb_alignements, self.IA: [0] * nb_alignements}
+        self.lignes_completes = {self.HUMAIN: 0, self.IA: 0}
+        self.nb_cases_occupees = 0
+        self.cle = 0  # Rang en base 3 de la position
+        self.plateau = _VuePlateau(self)
+        self.joueur_actuel = self.HUMAIN  # L'humain commence
+        # Pile des coups : indices des cases dans l'ordre où elles ont été jouées
+        self.historique_coups: List[int] = []
+    
+    def reinitialiser(self):
+        """Réinitialise le plateau de jeu."""
+        nb_alignements = self.geometrie.nb_alignements
+        for symbole in (self.HUMAIN, self.IA):
+            self.bitboards[symbole] = 0
+            self.comptes_lignes[symbole] = [0] * nb_alignements
+            self.lignes_completes[symbole] = 0
+        self.nb_cases_occupees = 0
+        self.cle = 0
+        self.joueur_actuel = self.HUMAIN
+        self.historique_coups = []
+    
+    def charger_position(self, bits_x: int, bits_o: int):
+        """
+        Remplace la position par celle décrite par deux bitboards.
+        
+        L'ordre des coups n'étant pas connu, la pile des coups contient les
+        cases de HUMAIN puis celles de IA, par indice croissant.
+        
+        Args:
+            bits_x: Bitboard des cases de HUMAIN
+            bits_o: Bitboard des cases de IA
+        """
+        self.reinitialiser()
+        for symbole, bits in ((self.HUMAIN, bits_x), (self.IA, bits_o)):
+            while bits:
+                bit = bits & -bits
+                bits ^= bit
+                self._ajouter(bit.bit_length() - 1, symbole)
+        # HUMAIN commence : il est au trait quand les deux camps ont autant de pions
+        if bin(bits_x).count('1') > bin(bits_o).count('1'):
+            self.joueur_actuel = self.IA
+    
+    def adversaire(self, symbole: str) -> str:
+        """Retourne le symbole de l'adversaire de ``symbole``."""
+        return self.IA if symbole == self.HUMAIN else self.HUMAIN
+    
+    @property
+    def nb_demi_coups(self) -> int:
+        """Nombre de coups joués depuis le début de la partie."""
+        return len(self.historique_coups)
+    
+    @property
+    def dernier_coup(self) -> Optional[Tuple[int, int]]:
+        """Dernier coup joué (ligne, colonne), ou None en début de partie."""
+        if not self.historique_coups:
+            return None
+        return self.geometrie.coordonnees[self.historique_coups[-1]]
+    
+    def obtenir_historique(self) -> List[Tuple[int, int, str]]:
+        """Retourne les coups de la partie dans l'ordre : (ligne, colonne, symbole)."""
+        coordonnees = self.geometrie.coordonnees
+        return [coordonnees[i] + (self._symbole_case(i),) for i in self.historique_coups]
+    
+    def copier(self) -> 'MorpionMNK':
+        """Retourne une copie indépendante de la partie, historique compris."""
+        return self.rejouer()
+    
+    def rejouer(self, nb_demi_coups: Optional[int] = None) -> 'MorpionMNK':
+        """
+        Rejoue le début de la partie sur un nouveau jeu.
+        
+        Args:
+            nb_demi_coups: Nombre de coups à rejouer (None : toute la partie)
+        
+        Returns:
+            Nouveau jeu, de la même classe, dans la position atteinte après
+            ``nb_demi_coups`` coups
+        """
+        jeu = type(self).__new__(type(self))
+        MorpionMNK.__init__(jeu, self.lignes, self.colonnes, self.alignement)
+        coordonnees = self.geometrie.coordonnees
+        for index in self.historique_coups[:nb_demi_coups]:
+            ligne, colonne = coordonnees[index]
+            jeu.jouer_coup(ligne, colonne, self._symbole_case(index))
+        if nb_demi_coups is None:
+            jeu.joueur_actuel = self.joueur_actuel
+        return jeu
+    
+    def obtenir_plateau(self) -> List[List[str]]:
+        """Retourne une copie du plateau actuel."""
+        return [list(ligne) for ligne in self.plateau]
+    
+    def _symbole_case(self, index: int) -> str:
+        """Retourne le symbole présent sur la case d'indice donné."""
+        bit = 1 << index
+        if self.bitboards[self.HUMAIN] & bit:
+            return self.HUMAIN
+        if self.bitboards[self.IA] & bit:
+            return self.IA
+        return self.VIDE
+    
+    def _placer(self, index: int, symbole: str):
+        """Écrit un symbole (ou VIDE) sur la case d'indice donné."""
+        if symbole != self.VIDE and symbole not in self.bitboards:
+            raise ValueError(f"Symbole inconnu: {symbole!r}")
+        self._retirer(index)
+        if symbole != self.VIDE:
+            self._ajouter(index, symbole)
+    
+    def _ajouter(self, index: int, symbole: str):
+        """Pose un symbole sur une case libre et met à jour l'état incrémental."""
+        self.bitboards[symbole] |= 1 << index
+        self.historique_coups.append(index)
+        self.nb_cases_occupees += 1
+        self.cle += self.CHIFFRES[symbole] * self.geometrie.puissances3[index]
+        comptes = self.comptes_lignes[symbole]
+        alignement = self.alignement
+        for n in self.geometrie.alignements_par_case[index]:
+            comptes[n] += 1
+            if comptes[n] == alignement:
+                self.lignes_completes[symbole] += 1
+    
+    def _retirer(self, index: int):
+        """Vide une case, où qu'elle soit dans la pile des coups."""
+        symbole = self._symbole_case(index)
+        if symbole == self.VIDE:
+            return
+        if self.historique_coups[-1] == index:
+            self.historique_coups.pop()
+        else:
+            # Case vidée hors de l'ordre de la pile (écriture dans le plateau)
+            self.historique_coups.remove(index)
+        self._enlever(index, symbole)
+    
+    def _enlever(self, index: int, symbole: str):
+        """Enlève le symbole d'une case et met à jour l'état incrémental (hors pile)."""
+        self.bitboards[symbole] &= ~(1 << index)
+        self.nb_cases_occupees -= 1
+        self.cle -= self.CHIFFRES[symbole] * self.geometrie.puissances3[index]
+        comptes = self.comptes_lignes[symbole]
+        alignement = self.alignement
+        for n in self.geometrie.alignements_par_case[index]:
+            if comptes[n] == alignement:
+                self.lignes_completes[symbole] -= 1
+            comptes[n] -= 1
+    
+    def obtenir_cases_libres(self) -> int:
+        """Retourne le masque de bits des cases libres."""
+        return ~(self.bitboards[self.HUMAIN] | self.bitboards[self.IA]) & self.geometrie.masque_plein
+    
+    def jouer_coup(self, ligne: int, colonne: int, joueur: str) -> bool:
+        """
+        Effectue un coup sur le plateau.
+        
+        Args:
+            ligne: Ligne (0 à lignes-1)
+            colonne: Colonne (0 à colonnes-1)
+            joueur: Le joueur qui fait le coup (HUMAIN ou IA)
+        
+        Returns:
+            True si le coup est valide, False sinon
+        
+        Raises:
+            ValueError: Si ``joueur`` n'est ni HUMAIN ni IA
+        """
+        if joueur != self.HUMAIN and joueur != self.IA:
+            raise ValueError(f"Symbole de joueur invalide: {joueur!r} (attendu: {self.HUMAIN!r} ou {self.IA!r})")
+        if 0 <= ligne < self.lignes and 0 <= colonne < self.colonnes:
+            index = ligne * self.colonnes + colonne
+            if not (self.bitboards[self.HUMAIN] | self.bitboards[self.IA]) >> index & 1:
+                self._ajouter(index, joueur)
+                self.joueur_actuel = self.IA if joueur == self.HUMAIN else self.HUMAIN
+                return True
+        return False
+    
+    def annuler_coup(self, ligne: Optional[int] = None, colonne: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Annule un coup (pour Minimax).
+        
+        Sans argument, annule le dernier coup joué (sommet de la pile).
+        Le joueur dont le coup est annulé redevient le joueur au trait.
+        
+        Args:
+            ligne: Ligne du coup à annuler (optionnel)
+            colonne: Colonne du coup à annuler (optionnel)
+        
+        Returns:
+            Coup annulé (ligne, colonne)
+        
+        Raises:
+            IndexError: Si aucun coup n'a été joué
+        """
+        if ligne is None:
+            # Dépiler : la case et son symbole sont connus sans rien chercher
+            if not self.historique_coups:
+                raise IndexError("Aucun coup à annuler")
+            index = self.historique_coups.pop()
+            symbole = self.HUMAIN if self.bitboards[self.HUMAIN] >> index & 1 else self.IA
+            self._enlever(index, symbole)
+        else:
+            index = ligne * self.colonnes + colonne
+            symbole = self._symbole_case(index)
+            if symbole == self.VIDE:
+                return (ligne, colonne)
+            self._retirer(index)
+        self.joueur_actuel = symbole
+        return self.geometrie.coordonnees[index]
+    
+    def obtenir_coups_possibles(self) -> List[Tuple[int, int]]:
+        """Retourne la liste des coups possibles."""
+        coordonnees = self.geometrie.coordonnees
+        coups = []
+        libres = self.obtenir_cases_libres()
+        while libres:
+            bit = libres & -libres
+            libres ^= bit
+            coups.append(coordonnees[bit.bit_length() - 1])
+        return coups
+    
+    def verifier_gagnant(self) -> Optional[str]:
+        """
+        Vérifie s'il y a un gagnant.
+        
+        Returns:
+            HUMAIN, IA, 'NUL' ou None si la partie continue
+        """
+        # Les alignements complets sont tenus à jour par jouer_coup / annuler_coup
+        if self.lignes_completes[self.HUMAIN]:
+            return self.HUMAIN
+        if self.lignes_completes[self.IA]:
+            return self.IA
+        
+        # Vérifier match nul
+        if self.nb_cases_occupees == self.nb_cases:
+            return 'NUL'
+        
+        return None
+    
+    def est_partie_terminee(self) -> bool:
+        """Vérifie si la partie est terminée."""
+        return self.verifier_gagnant() is not None
+    
+    def afficher_plateau(self):
+        """Affiche le plateau dans la console (pour debug)."""
+        largeur = len(str(max(self.lignes, self.colonnes) - 1))
+        marge = ' ' * largeur
+        print("\n" + marge + " " + "   ".join(str(c).center(largeur) for c in range(self.colonnes)).rstrip())
+        for i, ligne in enumerate(self.plateau):
+            cases = " | ".join(case.center(largeur) for case in ligne)
+            print(f"{str(i).rjust(largeur)} {cases}")
+            if i < self.lignes - 1:
+                print(marge + "-" * ((largeur + 3) * self.colonnes - 1))
+        print()
+
+
+# Test du module
+if __name__ == "__main__":
+    import random
+    import time
+    
+    print("Test du moteur m,n,k")
+    print("=" * 50)
+    
+    for lignes, colonnes, alignement in ((4, 4, 3), (5, 5, 4), (15, 15, 5)):
+        debut = time.time()
+        resultats = {'X': 0, 'O': 0, 'NUL': 0}
+        for _ in range(100):
+            jeu = MorpionMNK(lignes, colonnes, alignement)
+            symbole = MorpionMNK.HUMAIN
+            while not jeu.est_partie_terminee():
+                ligne, colonne = random.choice(jeu.obtenir_coups_possibles())
+                jeu.jouer_coup(ligne, colonne, symbole)
+                symbole = MorpionMNK.IA if symbole == MorpionMNK.HUMAIN else MorpionMNK.HUMAIN
+            resultats[jeu.verifier_gagnant()] += 1
+        duree = (time.time() - debut) * 1000
+        print(f"{lignes}x{colonnes}/{alignement}: {jeu.geometrie.nb_alignements} alignements, "
+              f"100 parties aléatoires en {duree:.0f}ms -> {resultats}")
+    
+    jeu.afficher_plateau()
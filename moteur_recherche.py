@@ -0,0 +1,541 @@
+"""
+Moteur de recherche commun à tous les joueurs Minimax.
+
+Une seule boucle négamax avec élagage Alpha-Beta et recherche à fenêtre
+principale (PVS) : le premier coup d'un noeud est cherché avec la fenêtre
+complète, les suivants avec une fenêtre nulle (alpha, alpha + 1) qui ne
+fait que prouver qu'ils ne sont pas meilleurs ; un coup qui la dépasse est
+recherché à nouveau avec la fenêtre complète.
+
+Les scores sont des entiers, toujours du point de vue du joueur au trait.
+Une partie gagnée quand ``n`` cases sont occupées vaut ``nb_cases + 1 - n``
+(une victoire rapide vaut plus qu'une victoire lente, une défaite lente
+coûte moins qu'une défaite rapide), un nul ou une coupure de profondeur vaut
+0. La valeur ne dépend que de la position, pas de la racine de la
+recherche : elle peut être mémorisée et relue d'une recherche à l'autre.
+
+Avec un évaluateur (evaluation.py), une position coupée par la profondeur
+reçoit une estimation au lieu de 0 ; les victoires sont alors multipliées
+par l'échelle de l'évaluateur pour rester au-dessus de toute estimation.
+
+Avec une table de finales (table_finale.py), une position qui y figure
+reçoit sa valeur exacte sans être développée.
+
+Avec une table de transpositions, chaque noeud mémorise son score, ce que
+vaut ce score vis-à-vis de sa fenêtre (valeur exacte, borne basse après une
+coupure, borne haute quand aucun coup n'a dépassé alpha), son meilleur coup
+et la profondeur restante sous laquelle il a été obtenu. Un score mémorisé
+ne sert que s'il répond à la nouvelle fenêtre ; sinon il la resserre, et le
+meilleur coup est essayé en premier. Une recherche à fenêtre étroite qui
+repasse par la position en profite : c'est ce qui rend MTD(f) efficace
+(suite de recherches à fenêtre nulle qui resserrent l'intervalle autour de
+la valeur, voir mtdf).
+
+Le moteur compte les noeuds, les élagages et les re-recherches PVS, ce qui
+donne le débit de la boucle (noeuds par seconde).
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ordre_coups import OrdreCoups
+from symetries import Symetries
+from table_finale import NUL, VICTOIRE
+
+# Nature du score d'une entrée de la table de transpositions
+EXACTE, BORNE_BASSE, BORNE_HAUTE = 0, 1, 2
+
+# Profondeur restante des valeurs de la table de transpositions obtenues sans
+# coupure de profondeur : valables quelle que soit la profondeur demandée
+_SANS_COUPURE = 1 << 30
+
+
+class TempsEcoule(Exception):
+    """Levée dans la recherche quand l'échéance est dépassée."""
+
+
+class RechercheAnnulee(Exception):
+    """Levée dans la recherche quand son annulation a été demandée."""
+
+
+class MoteurRecherche:
+    """Négamax + PVS instrumenté, partagé par les joueurs Minimax."""
+    
+    # Nombre de noeuds entre deux lectures de l'horloge, de l'annulation et
+    # deux appels de la progression (puissance de 2 - 1)
+    INTERVALLE_HORLOGE = 1023
+    
+    def __init__(self, ordre_coups=True, evaluateur=None, table_finale=None,
+                 transpositions: Optional[Dict[int, Tuple[int, int, int, int]]] = None,
+                 cles_canoniques: bool = False):
+        """
+        Initialise le moteur.
+        
+        Args:
+            ordre_coups: Ordonnancement des coups : True pour OrdreCoups par défaut,
+                         None/False pour l'ordre brut des cases, ou un objet compatible
+            evaluateur: Estimation des positions coupées par la profondeur : objet
+                        offrant evaluer(jeu, symbole) et ECHELLE (None : 0)
+            table_finale: Table de finales (table_finale.TableFinale) sondée
+                          avant de développer un noeud
+            transpositions: Table {clé: (profondeur restante, nature du score, score,
+                            case du meilleur coup ou -1)} lue et complétée pendant
+                            la recherche (None pour ne rien mémoriser) ; clé = clé
+                            de position * 2 + (IA au trait)
+            cles_canoniques: Ranger les positions de la table de transpositions
+                             sous leur clé canonique (voir symetries.py), meilleur
+                             coup compris : une entrée pour toutes les images
+        """
+        self.ordre_coups = OrdreCoups() if ordre_coups is True else (ordre_coups or None)
+        self.evaluateur = evaluateur
+        self.table_finale = table_finale
+        self.transpositions = transpositions
+        self.cles_canoniques = cles_canoniques
+        self.echeance = None  # Instant (perf_counter) où la recherche doit s'arrêter
+        self.annulation = None  # Événement (threading.Event) qui interrompt la recherche
+        self.progression = None  # Appelée avec {'noeuds': n} pendant la recherche
+        self._surveillance = False
+        self.coupe = False  # True si la dernière recherche a été coupée par la profondeur
+        self._limite = -1
+        self._symetries = None
+        self.reinitialiser_statistiques()
+    
+    def reinitialiser_statistiques(self):
+        """Remet les compteurs à zéro (avant chaque coup)."""
+        self.noeuds = 0
+        self.elagages = 0
+        self.re_recherches = 0
+        self.hits_finale = 0
+        self.hits_transpositions = 0
+        self.miss_transpositions = 0
+        self.passes_fenetre_nulle = 0
+        self.temps = 0.0
+        if self.ordre_coups is not None:
+            self.ordre_coups.reinitialiser()
+    
+    @property
+    def noeuds_par_seconde(self) -> float:
+        """Débit de la boucle de recherche depuis la remise à zéro."""
+        return self.noeuds / self.temps if self.temps > 0 else 0.0
+    
+    def obtenir_statistiques(self) -> dict:
+        """Retourne les compteurs de la boucle de recherche."""
+        return {
+            'noeuds': self.noeuds,
+            'elagages': self.elagages,
+            're_recherches': self.re_recherches,
+            'hits_finale': self.hits_finale,
+            'hits_transpositions': self.hits_transpositions,
+            'miss_transpositions': self.miss_transpositions,
+            'passes_fenetre_nulle': self.passes_fenetre_nulle,
+            'temps': self.temps,
+            'noeuds_par_seconde': self.noeuds_par_seconde,
+        }
+    
+    def rechercher(self, jeu, symbole: str, niveau: int = -1,
+                   coups: Optional[List[Tuple[int, int]]] = None,
+                   alpha: Optional[int] = None, beta: Optional[int] = None) -> Tuple[Optional[Tuple[int, int]], int]:
+        """
+        Cherche le meilleur coup de ``symbole``.
+        
+        Args:
+            jeu: Instance du jeu (MorpionMNK), rendue dans son état initial
+            symbole: Joueur au trait
+            niveau: Nombre de demi-coups explorés après le coup de la racine
+                    avant de couper (-1 = illimité)
+            coups: Coups de la racine, dans l'ordre où les essayer (par défaut
+                   l'ordre brut des cases : à égalité, le premier l'emporte)
+            alpha: Borne basse de la fenêtre de la racine (None = fenêtre complète)
+            beta: Borne haute de la fenêtre ; dès qu'un coup l'atteint, il est
+                  rendu sans essayer les suivants
+        
+        Returns:
+            Tuple (meilleur coup, score exact) ; (None, score) si la partie est
+            finie. Avec une fenêtre, un score <= alpha n'est qu'une borne haute
+            (le coup n'a alors pas de sens) et un score >= beta une borne basse
+        
+        Raises:
+            TempsEcoule: Si ``echeance`` est dépassée pendant la recherche
+            RechercheAnnulee: Si ``annulation`` est déclenchée pendant la recherche
+        """
+        debut = time.perf_counter()
+        self._preparer(jeu, niveau)
+        nb_demi_coups = jeu.nb_demi_coups
+        try:
+            if coups is None:
+                coups = jeu.obtenir_coups_possibles()
+            borne = self.borne(jeu)
+            return self._racine(jeu, symbole, coups, -borne if alpha is None else alpha,
+                                borne if beta is None else beta)
+        except (TempsEcoule, RechercheAnnulee):
+            self._restaurer(jeu, nb_demi_coups)
+            raise
+        finally:
+            self.temps += time.perf_counter() - debut
+    
+    def evaluer(self, jeu, symbole: str, alpha: Optional[int] = None, beta: Optional[int] = None,
+                niveau: int = -1, profondeur: int = 0) -> int:
+        """
+        Valeur de la position pour ``symbole``, joueur au trait.
+        
+        Avec une fenêtre (alpha, beta), un résultat hors de la fenêtre n'est
+        qu'une borne (fail-soft). ``niveau`` a le même sens que dans
+        rechercher ; ``profondeur`` est le nombre de demi-coups déjà joués
+        depuis cette racine (1 pour évaluer un coup de la racine à part).
+        """
+        debut = time.perf_counter()
+        self._preparer(jeu, niveau)
+        borne = self.borne(jeu)
+        nb_demi_coups = jeu.nb_demi_coups
+        try:
+            return self._negamax(jeu, symbole, jeu.adversaire(symbole), profondeur,
+                                 -borne if alpha is None else alpha,
+                                 borne if beta is None else beta)
+        except (TempsEcoule, RechercheAnnulee):
+            self._restaurer(jeu, nb_demi_coups)
+            raise
+        finally:
+            self.temps += time.perf_counter() - debut
+    
+    def mtdf(self, jeu, symbole: str, estimation: int = 0, niveau: int = -1,
+             coups: Optional[List[Tuple[int, int]]] = None) -> Tuple[Optional[Tuple[int, int]], int]:
+        """
+        Cherche le meilleur coup par MTD(f) : recherches à fenêtre nulle successives.
+        
+        Chaque passe demande si la valeur atteint un seuil, ce qui relève la
+        borne basse ou abaisse la borne haute, jusqu'à ce qu'elles se
+        rejoignent. Plus ``estimation`` est proche de la valeur, moins il faut
+        de passes (compteur ``passes_fenetre_nulle``). Sans table de
+        transpositions, chaque passe repart de zéro : à éviter.
+        
+        Args:
+            jeu: Instance du jeu, rendue dans son état initial
+            symbole: Joueur au trait
+            estimation: Première estimation de la valeur (ex. score de
+                        l'itération précédente d'un approfondissement)
+            niveau: Comme pour rechercher
+            coups: Comme pour rechercher ; à égalité, le premier l'emporte aussi
+        
+        Returns:
+            Tuple (meilleur coup, score exact), comme rechercher
+        """
+        if jeu.est_partie_terminee():
+            return self.rechercher(jeu, symbole, niveau, coups)
+        borne = self.borne(jeu)
+        basse, haute = -borne, borne
+        valeur = max(-borne + 1, min(estimation, borne - 1))
+        meilleur_coup = None
+        while basse < haute:
+            seuil = valeur + 1 if valeur == basse else valeur
+            coup, valeur = self.rechercher(jeu, symbole, niveau, coups, seuil - 1, seuil)
+            self.passes_fenetre_nulle += 1
+            if valeur < seuil:
+                haute = valeur
+            else:
+                basse = valeur
+                meilleur_coup = coup  # Premier coup dans l'ordre qui atteint le seuil
+        return meilleur_coup, valeur
+    
+    def analyser(self, jeu, symbole: str, niveau: int = -1,
+                 coups: Optional[List[Tuple[int, int]]] = None) -> List[Tuple[Tuple[int, int], int, List[Tuple[int, int]]]]:
+        """
+        Valeur exacte et variation principale de chaque coup de la racine.
+        
+        Contrairement à rechercher, qui ne prouve pour les coups suivants que
+        « pas meilleur que le premier », chaque coup est évalué en fenêtre
+        complète. Avec une table de transpositions, les sous-arbres communs
+        aux différents coups (et aux variations) ne sont cherchés qu'une fois.
+        
+        Args:
+            jeu: Instance du jeu, rendue dans son état initial
+            symbole: Joueur au trait
+            niveau: Comme pour rechercher
+            coups: Coups à analyser (par défaut tous, dans l'ordre des cases)
+        
+        Returns:
+            Liste de (coup, score, variation), du meilleur score au moins bon
+            (à égalité, dans l'ordre des coups) ; la variation commence par le
+            coup et suit le meilleur jeu des deux camps jusqu'à la fin de la
+            partie ou la coupure de profondeur
+        """
+        adversaire = jeu.adversaire(symbole)
+        if coups is None:
+            coups = jeu.obtenir_coups_possibles()
+        analyse = []
+        for coup in coups:
+            jeu.jouer_coup(coup[0], coup[1], symbole)
+            try:
+                score = -self.evaluer(jeu, adversaire, niveau=niveau, profondeur=1)
+                variation = [coup] + self.variation(jeu, adversaire, -score, niveau, profondeur=1)
+            finally:
+                jeu.annuler_coup()
+            analyse.append((coup, score, variation))
+        analyse.sort(key=lambda ligne: -ligne[1])
+        return analyse
+    
+    def variation(self, jeu, symbole: str, valeur: int, niveau: int = -1,
+                  profondeur: int = 0) -> List[Tuple[int, int]]:
+        """
+        Suite de coups qui réalise la valeur d'une position.
+        
+        À chaque demi-coup, le premier coup dont la valeur (vérifiée par une
+        recherche à fenêtre minimale autour de ``valeur``) est celle de la
+        position est retenu.
+        
+        Args:
+            jeu: Instance du jeu, rendue dans son état initial
+            symbole: Joueur au trait
+            valeur: Valeur exacte de la position pour ``symbole``
+            niveau: Comme pour rechercher
+            profondeur: Demi-coups déjà joués depuis la racine de ``niveau``
+        
+        Returns:
+            Liste des coups, vide si la position est terminale ou coupée
+        """
+        limite = jeu.nb_cases + 1 if niveau == -1 else niveau + 1
+        nb_demi_coups = jeu.nb_demi_coups
+        variation = []
+        adversaire = jeu.adversaire(symbole)
+        try:
+            while profondeur < limite and not jeu.est_partie_terminee():
+                for ligne, col in jeu.obtenir_coups_possibles():
+                    jeu.jouer_coup(ligne, col, symbole)
+                    score = -self.evaluer(jeu, adversaire, -valeur - 1, -valeur + 1, niveau, profondeur + 1)
+                    if score == valeur:
+                        break
+                    jeu.annuler_coup()
+                else:
+                    break  # Valeur inexacte : aucun coup ne la réalise
+                variation.append((ligne, col))
+                valeur = -valeur
+                symbole, adversaire = adversaire, symbole
+                profondeur += 1
+        finally:
+            self._restaurer(jeu, nb_demi_coups)
+        return variation
+    
+    def borne(self, jeu) -> int:
+        """Valeur strictement supérieure à tout score possible sur ce plateau."""
+        echelle = 1 if self.evaluateur is None else self.evaluateur.ECHELLE
+        return (jeu.nb_cases + 2) * echelle
+    
+    @staticmethod
+    def _restaurer(jeu, nb_demi_coups: int):
+        """Annule les coups laissés sur le plateau par une recherche interrompue."""
+        while jeu.nb_demi_coups > nb_demi_coups:
+            jeu.annuler_coup()
+    
+    def _preparer(self, jeu, niveau: int):
+        """Règle la profondeur de coupure et les symétries de la géométrie."""
+        # La racine est à la profondeur 0, ses coups à la profondeur 1
+        self._limite = jeu.nb_cases + 1 if niveau == -1 else niveau + 1
+        self._echelle = 1 if self.evaluateur is None else self.evaluateur.ECHELLE
+        self._score_victoire = jeu.nb_cases + 1
+        self.coupe = False
+        self._surveillance = (self.echeance is not None or self.annulation is not None
+                              or self.progression is not None)
+        if self.cles_canoniques:
+            self._symetries = Symetries.obtenir(jeu.lignes, jeu.colonnes)
+    
+    def _racine(self, jeu, symbole: str, coups, alpha: int, beta: int):
+        """Boucle PVS de la racine : mémorise le coup en plus du score."""
+        self.noeuds += 1
+        adversaire = jeu.adversaire(symbole)
+        terminal = self._terminal(jeu, symbole, adversaire)
+        if terminal is not None or not coups:
+            return None, terminal or 0
+        
+        meilleur_coup = None
+        meilleur = -self.borne(jeu)
+        for ligne, col in coups:
+            jeu.jouer_coup(ligne, col, symbole)
+            if meilleur_coup is None:
+                score = -self._negamax(jeu, adversaire, symbole, 1, -beta, -alpha)
+            else:
+                score = -self._negamax(jeu, adversaire, symbole, 1, -alpha - 1, -alpha)
+                if alpha < score < beta:
+                    self.re_recherches += 1
+                    score = -self._negamax(jeu, adversaire, symbole, 1, -beta, -score)
+            jeu.annuler_coup()
+            if score > meilleur:
+                meilleur = score
+                meilleur_coup = (ligne, col)
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break  # Fenêtre de la racine dépassée : borne basse suffisante
+        return meilleur_coup, meilleur
+    
+    def _surveiller(self):
+        """Contrôles périodiques : annulation, échéance, progression."""
+        if self.annulation is not None and self.annulation.is_set():
+            raise RechercheAnnulee()
+        if self.echeance is not None and time.perf_counter() >= self.echeance:
+            raise TempsEcoule()
+        if self.progression is not None:
+            self.progression({'noeuds': self.noeuds})
+    
+    def _terminal(self, jeu, symbole: str, adversaire: str) -> Optional[int]:
+        """Score d'une position terminale pour le joueur au trait, None sinon."""
+        occupees = jeu.nb_cases_occupees
+        if jeu.lignes_completes[adversaire]:
+            return (occupees - self._score_victoire) * self._echelle
+        if jeu.lignes_completes[symbole]:
+            return (self._score_victoire - occupees) * self._echelle
+        if occupees == jeu.nb_cases:
+            return 0
+        return None
+    
+    def _negamax(self, jeu, symbole: str, adversaire: str, profondeur: int,
+                 alpha: int, beta: int) -> int:
+        """
+        Boucle négamax + PVS.
+        
+        Args:
+            jeu: Instance du jeu
+            symbole: Joueur au trait
+            adversaire: Son adversaire
+            profondeur: Demi-coups joués depuis la racine
+            alpha: Score que le joueur au trait a déjà garanti
+            beta: Score au-delà duquel l'adversaire évitera cette position
+        
+        Returns:
+            Score pour le joueur au trait (borne si hors de ]alpha, beta[)
+        """
+        self.noeuds += 1
+        if not self.noeuds & self.INTERVALLE_HORLOGE and self._surveillance:
+            self._surveiller()
+        
+        # Conditions terminales
+        occupees = jeu.nb_cases_occupees
+        if jeu.lignes_completes[adversaire]:
+            return (occupees - self._score_victoire) * self._echelle  # Retarde les défaites
+        if jeu.lignes_completes[symbole]:
+            return (self._score_victoire - occupees) * self._echelle  # Favorise les victoires rapides
+        if occupees == jeu.nb_cases:
+            return 0
+        
+        # Valeur exacte lue dans la table de finales, même sous la coupure de profondeur
+        finale = self.table_finale
+        if finale is not None and jeu.nb_cases - occupees <= finale.vides_max:
+            valeur = finale.sonder(jeu, symbole)
+            if valeur is not None:
+                self.hits_finale += 1
+                resultat, distance = valeur
+                if resultat == NUL:
+                    return 0
+                score = (self._score_victoire - occupees - distance) * self._echelle
+                return score if resultat == VICTOIRE else -score
+        
+        # Vérifier si on a atteint la profondeur maximale
+        if profondeur >= self._limite:
+            self.coupe = True
+            if self.evaluateur is not None:
+                return self.evaluateur.evaluer(jeu, symbole)
+            return 0
+        
+        transpositions = self.transpositions
+        if transpositions is not None:
+            if self.cles_canoniques:
+                cle_position, transformation = self._symetries.canonique(jeu.bitboards[jeu.HUMAIN],
+                                                                         jeu.bitboards[jeu.IA])
+            else:
+                cle_position, transformation = jeu.cle, 0
+            cle_transposition = cle_position * 2 + (symbole == jeu.IA)
+            restante = self._limite - profondeur
+            entree = transpositions.get(cle_transposition)
+            coup_memorise = -1
+            if entree is not None:
+                profondeur_entree, nature, score, coup_memorise = entree
+                if profondeur_entree >= restante:
+                    if (nature == EXACTE or (nature == BORNE_BASSE and score >= beta)
+                            or (nature == BORNE_HAUTE and score <= alpha)):
+                        self.hits_transpositions += 1
+                        if profondeur_entree != _SANS_COUPURE:
+                            self.coupe = True
+                        return score
+                    # La borne connue resserre la fenêtre
+                    if nature == BORNE_BASSE:
+                        alpha = max(alpha, score)
+                    else:
+                        beta = min(beta, score)
+            self.miss_transpositions += 1
+            # Savoir si ce sous-arbre seul a été coupé par la profondeur
+            coupe_avant = self.coupe
+            self.coupe = False
+        
+        ordre = self.ordre_coups
+        coups = ordre.ordonner(jeu, symbole, profondeur) if ordre else jeu.obtenir_coups_possibles()
+        if transpositions is not None and coup_memorise >= 0:
+            # Le meilleur coup de la dernière visite est essayé en premier
+            index = coup_memorise
+            if self.cles_canoniques:
+                index = self._symetries.inverser_index(index, transformation)
+            coup = jeu.geometrie.coordonnees[index]
+            if coups[0] != coup and coup in coups:
+                coups.remove(coup)
+                coups.insert(0, coup)
+        alpha_initial = alpha
+        meilleur = -(self._score_victoire + 1) * self._echelle
+        meilleur_index = -1
+        premier = True
+        for ligne, col in coups:
+            jeu.jouer_coup(ligne, col, symbole)
+            if premier:
+                score = -self._negamax(jeu, adversaire, symbole, profondeur + 1, -beta, -alpha)
+                premier = False
+            else:
+                # Fenêtre nulle : prouver que le coup ne fait pas mieux qu'alpha
+                score = -self._negamax(jeu, adversaire, symbole, profondeur + 1, -alpha - 1, -alpha)
+                if alpha < score < beta:
+                    self.re_recherches += 1
+                    score = -self._negamax(jeu, adversaire, symbole, profondeur + 1, -beta, -score)
+            jeu.annuler_coup()
+            if score > meilleur:
+                meilleur = score
+                meilleur_index = ligne * jeu.colonnes + col
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self.elagages += 1
+                        if ordre:
+                            ordre.enregistrer_coupure(ligne, col, symbole, profondeur,
+                                                      jeu.nb_cases - occupees)
+                        break
+        
+        if transpositions is not None:
+            # Résultat fail-soft : borne haute sous la fenêtre (aucun coup n'y est
+            # meilleur qu'un autre, l'ancien coup mémorisé est gardé), borne basse
+            # au-dessus ; un score coupé par la profondeur ne vaut que pour une
+            # profondeur restante au plus égale
+            if meilleur <= alpha_initial:
+                nature = BORNE_HAUTE
+            else:
+                nature = BORNE_BASSE if meilleur >= beta else EXACTE
+                coup_memorise = meilleur_index
+                if self.cles_canoniques:
+                    coup_memorise = self._symetries.transformer_index(coup_memorise, transformation)
+            transpositions[cle_transposition] = (restante if self.coupe else _SANS_COUPURE,
+                                                 nature, meilleur, coup_memorise)
+            self.coupe = self.coupe or coupe_avant
+        return meilleur
+
+
+# Test du module
+if __name__ == "__main__":
+    from morpion_base import TicTacToe
+    from morpion_mnk import MorpionMNK
+    
+    print("Test du moteur de recherche")
+    print("=" * 50)
+    
+    # L'ordre brut ne termine pas en temps raisonnable sur le 4x4
+    essais = (("3x3", TicTacToe(), None), ("3x3", TicTacToe(), True),
+              ("4x4, alignement 3", MorpionMNK(4, 4, 3), True))
+    for nom, jeu, ordre in essais:
+        moteur = MoteurRecherche(ordre_coups=ordre)
+        coup, score = moteur.rechercher(jeu, jeu.HUMAIN)
+        stats = moteur.obtenir_statistiques()
+        print(f"{nom}, ordre {'heuristique' if ordre else 'brut'}: coup {coup}, score {score}, "
+              f"{stats['noeuds']} noeuds, {stats['re_recherches']} re-recherches, "
+              f"{stats['noeuds_par_seconde']:.0f} noeuds/s")
@@ -0,0 +1,205 @@
+"""
+Ordonnancement des coups pour les recherches Minimax avec élagage Alpha-Beta.
+
+L'élagage Alpha-Beta coupe d'autant plus tôt que le meilleur coup est essayé
+en premier. OrdreCoups trie les coups d'un noeud selon, par priorité
+décroissante :
+
+1. les coups gagnants immédiats (une fenêtre a k-1 pions du joueur et aucun
+   de l'adversaire) ;
+2. les coups qui bloquent une victoire immédiate de l'adversaire ;
+3. les coups « tueurs » : deux coups par profondeur qui ont récemment
+   provoqué une coupure à cette profondeur ;
+4. la table d'historique : chaque coupure ajoute au coup responsable un
+   bonus qui croît avec la hauteur du sous-arbre évité ;
+5. l'ordre statique : nombre de fenêtres d'alignement passant par la case
+   (le centre, puis les coins sur le 3x3).
+
+Chaque critère peut être désactivé à la construction. Les moteurs Minimax
+acceptent n'importe quel objet offrant ordonner, enregistrer_coupure et
+reinitialiser.
+"""
+
+from typing import List, Optional, Tuple
+
+# Rangs des critères dans la clé de tri (bits de poids fort) ; les coups
+# gagnants ne sont pas triés, ils sont placés en tête de liste
+_RANG_BLOCAGE = 3
+_RANG_TUEUR_1 = 2
+_RANG_TUEUR_2 = 1
+
+# Bits réservés au score d'historique, puis à l'ordre statique
+_BITS_HISTORIQUE = 40
+_BITS_STATIQUE = 8
+_HISTORIQUE_MAX = (1 << _BITS_HISTORIQUE) - 1
+
+
+class OrdreCoups:
+    """Tri des coups : victoires, blocages, coups tueurs, historique, ordre statique."""
+    
+    def __init__(self, statique: bool = True, menaces: bool = True,
+                 tueurs: bool = True, historique: bool = True):
+        """
+        Initialise l'ordonnanceur.
+        
+        Args:
+            statique: Essayer d'abord les cases traversées par le plus de fenêtres
+            menaces: Essayer d'abord les victoires immédiates, puis les blocages
+            tueurs: Essayer d'abord les coups tueurs de la profondeur courante
+            historique: Trier selon la table d'historique des coupures
+        """
+        self.statique = statique
+        self.menaces = menaces
+        self.tueurs = tueurs
+        self.historique = historique
+        self._geometrie = None
+        self._priorites = ()
+        self._tueurs: List[List[Optional[int]]] = []
+        self._historique = {}
+    
+    def _preparer(self, geometrie):
+        """Recalcule les tables quand la géométrie du plateau change."""
+        self._geometrie = geometrie
+        if self.statique:
+            self._priorites = tuple(len(fenetres) for fenetres in geometrie.alignements_par_case)
+        else:
+            self._priorites = (0,) * geometrie.nb_cases
+        self._tueurs = []
+        self._historique = {}
+    
+    def reinitialiser(self):
+        """
+        Prépare une nouvelle recherche.
+        
+        Les coups tueurs sont oubliés ; la table d'historique est divisée par
+        deux pour rester utile au coup suivant sans figer l'ordre.
+        """
+        self._tueurs = []
+        for table in self._historique.values():
+            for i in range(len(table)):
+                table[i] >>= 1
+    
+    @staticmethod
+    def _cases_gagnantes(jeu, symbole: str, adversaire: str, libres: int) -> int:
+        """Masque des cases libres qui complètent une fenêtre pour ``symbole``."""
+        comptes = jeu.comptes_lignes[symbole]
+        comptes_adversaire = jeu.comptes_lignes[adversaire]
+        masques = jeu.geometrie.masques_alignements
+        presque = jeu.alignement - 1
+        cases = 0
+        for n, compte in enumerate(comptes):
+            if compte == presque and not comptes_adversaire[n]:
+                cases |= masques[n]
+        return cases & libres
+    
+    def ordonner(self, jeu, symbole: str, profondeur: int) -> List[Tuple[int, int]]:
+        """
+        Retourne les coups possibles de ``symbole``, les plus prometteurs d'abord.
+        
+        Args:
+            jeu: Instance du jeu (MorpionMNK)
+            symbole: Joueur au trait
+            profondeur: Profondeur du noeud (indice des coups tueurs)
+        
+        Returns:
+            Liste de coups (ligne, colonne)
+        """
+        geometrie = jeu.geometrie
+        if geometrie is not self._geometrie:
+            self._preparer(geometrie)
+        
+        libres = jeu.obtenir_cases_libres()
+        gagnants = bloquants = 0
+        if self.menaces:
+            adversaire = jeu.adversaire(symbole)
+            gagnants = self._cases_gagnantes(jeu, symbole, adversaire, libres)
+            if gagnants:
+                # Un coup gagnant suffit : inutile d'ordonner le reste
+                bit = gagnants & -gagnants
+                index = bit.bit_length() - 1
+                coups = [geometrie.coordonnees[index]]
+                libres ^= bit
+            else:
+                bloquants = self._cases_gagnantes(jeu, adversaire, symbole, libres)
+        
+        tueur_1 = tueur_2 = None
+        if self.tueurs and profondeur < len(self._tueurs):
+            tueur_1, tueur_2 = self._tueurs[profondeur]
+        historique = self._historique.get(symbole) if self.historique else None
+        priorites = self._priorites
+        
+        cles = []
+        while libres:
+            bit = libres & -libres
+            libres ^= bit
+            index = bit.bit_length() - 1
+            if bloquants & bit:
+                rang = _RANG_BLOCAGE
+            elif index == tueur_1:
+                rang = _RANG_TUEUR_1
+            elif index == tueur_2:
+                rang = _RANG_TUEUR_2
+            else:
+                rang = 0
+            score = historique[index] if historique else 0
+            cles.append((((rang << _BITS_HISTORIQUE | score) << _BITS_STATIQUE | priorites[index]), index))
+        cles.sort(reverse=True)
+        
+        coordonnees = geometrie.coordonnees
+        suite = [coordonnees[index] for _, index in cles]
+        if gagnants:
+            return coups + suite
+        return suite
+    
+    def enregistrer_coupure(self, ligne: int, colonne: int, symbole: str,
+                            profondeur: int, hauteur: int):
+        """
+        Mémorise un coup qui vient de provoquer une coupure Alpha-Beta.
+        
+        Args:
+            ligne: Ligne du coup
+            colonne: Colonne du coup
+            symbole: Joueur qui a joué le coup
+            profondeur: Profondeur du noeud où la coupure a eu lieu
+            hauteur: Nombre de demi-coups restant sous ce noeud
+        """
+        geometrie = self._geometrie
+        if geometrie is None:
+            return
+        index = ligne * geometrie.colonnes + colonne
+        
+        if self.tueurs:
+            while len(self._tueurs) <= profondeur:
+                self._tueurs.append([None, None])
+            tueurs = self._tueurs[profondeur]
+            if tueurs[0] != index:
+                tueurs[1] = tueurs[0]
+                tueurs[0] = index
+        
+        if self.historique:
+            table = self._historique.get(symbole)
+            if table is None:
+                table = self._historique[symbole] = [0] * geometrie.nb_cases
+            table[index] = min(table[index] + hauteur * hauteur, _HISTORIQUE_MAX)
+
+
+# Test du module
+if __name__ == "__main__":
+    from morpion_mnk import MorpionMNK
+    
+    print("Test de l'ordonnancement des coups")
+    print("=" * 50)
+    
+    jeu = MorpionMNK(3, 3, 3)
+    ordre = OrdreCoups()
+    print(f"Plateau vide : {ordre.ordonner(jeu, 'X', 0)}")
+    
+    jeu.jouer_coup(0, 0, 'X')
+    jeu.jouer_coup(1, 1, 'O')
+    jeu.jouer_coup(0, 1, 'X')
+    jeu.afficher_plateau()
+    print(f"O doit bloquer en (0, 2) : {ordre.ordonner(jeu, 'O', 0)}")
+    print(f"X peut gagner en (0, 2) : {ordre.ordonner(jeu, 'X', 0)}")
+    
+    ordre.enregistrer_coupure(2, 2, 'O', 1, 5)
+    print(f"Après une coupure sur (2, 2) à la profondeur 1 : {ordre.ordonner(jeu, 'O', 1)}")
@@ -0,0 +1,226 @@
+"""
+Recherche Minimax répartie sur plusieurs processus (découpage de la racine).
+
+Chaque coup de la racine est évalué par un processus d'un pool
+concurrent.futures. Les processus partagent la borne alpha de la racine
+dans un multiprocessing.Value : quand un coup est évalué, son score relève
+la borne, et les coups évalués ensuite n'ont plus qu'à prouver qu'ils ne
+font pas mieux, ce qui coupe bien plus tôt.
+
+Pour rendre exactement le même coup que la recherche séquentielle (le
+premier coup de score maximal dans l'ordre de la racine), un coup n'est
+cherché qu'avec la borne ``alpha - 1`` : un coup à égalité avec le meilleur
+connu obtient alors sa valeur exacte, et l'égalité est tranchée par l'ordre
+de la racine.
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List, Optional, Tuple
+
+from moteur_recherche import MoteurRecherche, RechercheAnnulee, TempsEcoule
+from morpion_mnk import MorpionMNK
+
+# État de chaque processus du pool, fixé par _initialiser_processus
+_alpha_partage = None
+_moteur_processus = None
+
+
+class _DrapeauPartage:
+    """multiprocessing.Value vu comme l'événement d'annulation du moteur (is_set)."""
+    
+    def __init__(self, valeur):
+        self._valeur = valeur
+    
+    def is_set(self) -> bool:
+        return bool(self._valeur.value)
+
+
+def _initialiser_processus(alpha_partage, arret_partage, ordre_coups, evaluateur, table_finale):
+    """Initialise un processus du pool : borne et drapeau d'arrêt partagés, moteur local."""
+    global _alpha_partage, _moteur_processus
+    _alpha_partage = alpha_partage
+    _moteur_processus = MoteurRecherche(ordre_coups, evaluateur=evaluateur, table_finale=table_finale)
+    _moteur_processus.annulation = _DrapeauPartage(arret_partage)
+
+
+def _evaluer_coup(geometrie: Tuple[int, int, int], bits_x: int, bits_o: int,
+                  symbole: str, coup: Tuple[int, int], niveau: int, delai: Optional[float]):
+    """
+    Évalue un coup de la racine dans un processus du pool.
+    
+    Args:
+        geometrie: (lignes, colonnes, alignement) du plateau
+        bits_x: Bitboard des cases de X
+        bits_o: Bitboard des cases de O
+        symbole: Joueur qui joue le coup
+        coup: Coup (ligne, colonne) à évaluer
+        niveau: Profondeur de coupure (sens de MoteurRecherche.rechercher)
+        delai: Secondes disponibles (None = sans limite)
+    
+    Returns:
+        Tuple (score pour ``symbole``, compteurs du moteur, coupé par la profondeur)
+    """
+    jeu = MorpionMNK(*geometrie)
+    jeu.charger_position(bits_x, bits_o)
+    jeu.jouer_coup(coup[0], coup[1], symbole)
+    
+    moteur = _moteur_processus
+    moteur.reinitialiser_statistiques()
+    moteur.echeance = time.perf_counter() + delai if delai is not None else None
+    borne = moteur.borne(jeu)
+    # alpha - 1 : un coup à égalité avec le meilleur connu reçoit sa valeur exacte
+    alpha = _alpha_partage.value - 1
+    score = -moteur.evaluer(jeu, jeu.adversaire(symbole), -borne, -alpha, niveau, profondeur=1)
+    
+    with _alpha_partage.get_lock():
+        if score > _alpha_partage.value:
+            _alpha_partage.value = score
+    return score, (moteur.noeuds, moteur.elagages, moteur.re_recherches, moteur.hits_finale), moteur.coupe
+
+
+class RechercheParallele:
+    """Découpage de la racine sur un pool de processus, stats cumulées dans un moteur."""
+    
+    # Secondes entre deux contrôles de l'annulation pendant l'attente des processus
+    INTERVALLE_SONDAGE = 0.05
+    
+    def __init__(self, processus: int, moteur: MoteurRecherche):
+        """
+        Initialise la recherche parallèle (le pool est créé au premier appel).
+        
+        Args:
+            processus: Nombre de processus du pool
+            moteur: Moteur dont l'ordonnancement, l'évaluateur et la table de finales
+                    sont copiés dans chaque processus et dont les compteurs
+                    cumulent ceux des processus
+        """
+        if processus < 2:
+            raise ValueError(f"La recherche parallèle demande au moins 2 processus: {processus}")
+        self.processus = processus
+        self.moteur = moteur
+        self._pool = None
+        self._alpha = None
+        self._arret = None
+    
+    def _obtenir_pool(self) -> ProcessPoolExecutor:
+        """Crée le pool et la borne partagée au premier appel."""
+        if self._pool is None:
+            self._alpha = multiprocessing.Value('i', 0)
+            self._arret = multiprocessing.Value('b', 0)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processus,
+                initializer=_initialiser_processus,
+                initargs=(self._alpha, self._arret, self.moteur.ordre_coups, self.moteur.evaluateur,
+                          self.moteur.table_finale),
+            )
+        return self._pool
+    
+    def rechercher(self, jeu, symbole: str, niveau: int = -1,
+                   coups: Optional[List[Tuple[int, int]]] = None,
+                   echeance: Optional[float] = None) -> Tuple[Optional[Tuple[int, int]], int]:
+        """
+        Cherche le meilleur coup de ``symbole`` en évaluant la racine en parallèle.
+        
+        Args:
+            jeu: Instance du jeu (non modifiée)
+            symbole: Joueur au trait
+            niveau: Profondeur de coupure (sens de MoteurRecherche.rechercher)
+            coups: Coups de la racine, dans l'ordre où les départager
+            echeance: Instant (time.perf_counter) où la recherche doit s'arrêter
+        
+        Returns:
+            Tuple (meilleur coup, score exact), comme MoteurRecherche.rechercher
+        
+        Raises:
+            TempsEcoule: Si un processus dépasse l'échéance
+            RechercheAnnulee: Si l'annulation du moteur est déclenchée
+        """
+        moteur = self.moteur
+        if coups is None:
+            coups = jeu.obtenir_coups_possibles()
+        if jeu.verifier_gagnant() is not None or not coups:
+            return moteur.rechercher(jeu, symbole, niveau, coups)
+        
+        debut = time.perf_counter()
+        pool = self._obtenir_pool()
+        self._alpha.value = -moteur.borne(jeu)
+        self._arret.value = 0
+        geometrie = (jeu.lignes, jeu.colonnes, jeu.alignement)
+        bits_x, bits_o = jeu.bitboards[jeu.HUMAIN], jeu.bitboards[jeu.IA]
+        delai = None if echeance is None else max(echeance - debut, 0.0)
+        
+        taches = [pool.submit(_evaluer_coup, geometrie, bits_x, bits_o, symbole, coup, niveau, delai)
+                  for coup in coups]
+        try:
+            en_cours = set(taches)
+            while en_cours:
+                _, en_cours = wait(en_cours, self.INTERVALLE_SONDAGE, FIRST_COMPLETED)
+                if moteur.annulation is not None and moteur.annulation.is_set():
+                    raise RechercheAnnulee()
+                if moteur.progression is not None:
+                    moteur.progression({'noeuds': moteur.noeuds,
+                                        'coups_evalues': len(taches) - len(en_cours)})
+            resultats = [tache.result() for tache in taches]
+        except (TempsEcoule, RechercheAnnulee):
+            # Arrêter toutes les évaluations avant de rendre la main : une
+            # évaluation encore en cours fausserait la borne de la recherche suivante
+            self._arret.value = 1
+            for tache in taches:
+                tache.cancel()
+            wait(taches)
+            raise
+        finally:
+            moteur.temps += time.perf_counter() - debut
+        
+        meilleur_coup = None
+        meilleur = None
+        moteur.coupe = False
+        moteur.noeuds += 1  # La racine
+        for coup, (score, (noeuds, elagages, re_recherches, hits_finale), coupe) in zip(coups, resultats):
+            moteur.noeuds += noeuds
+            moteur.elagages += elagages
+            moteur.re_recherches += re_recherches
+            moteur.hits_finale += hits_finale
+            moteur.coupe = moteur.coupe or coupe
+            # Strictement meilleur : à égalité, le premier coup de la racine l'emporte
+            if meilleur is None or score > meilleur:
+                meilleur, meilleur_coup = score, coup
+        return meilleur_coup, meilleur
+    
+    def fermer(self):
+        """Arrête les processus du pool."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.fermer()
+
+
+# Test du module
+if __name__ == "__main__":
+    from morpion_base import TicTacToe
+    
+    print("Test de la recherche parallèle")
+    print("=" * 50)
+    
+    essais = (("3x3", TicTacToe()), ("4x4, alignement 3", MorpionMNK(4, 4, 3)))
+    for nom, jeu in essais:
+        serie = MoteurRecherche()
+        debut = time.time()
+        coup_serie, score_serie = serie.rechercher(jeu, jeu.HUMAIN)
+        duree_serie = time.time() - debut
+        
+        with RechercheParallele(4, MoteurRecherche()) as parallele:
+            debut = time.time()
+            coup, score = parallele.rechercher(jeu, jeu.HUMAIN)
+            duree = time.time() - debut
+        
+        print(f"{nom}: série {coup_serie} ({score_serie}) en {duree_serie:.2f}s, "
+              f"parallèle {coup} ({score}) en {duree:.2f}s, "
+              f"{parallele.moteur.noeuds} noeuds")
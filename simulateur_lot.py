@@ -0,0 +1,311 @@
+"""
+Simulateur de parties par lot : N plateaux avancés d'un demi-coup à la fois.
+
+Chaque plateau du lot n'est représenté que par deux entiers (les bitboards
+de X et de O) et un compteur de coups, rangés dans des listes indexées par
+le numéro de plateau. Un pas de simulation applique un vecteur de coups (un
+par plateau) ; la victoire se lit dans une table précalculée qui dit, pour
+chaque bitboard possible, s'il contient un alignement (tous les masques
+testés d'un coup). Les grands plateaux, pour lesquels cette table serait
+trop grosse, testent seulement les alignements qui passent par la case
+jouée. Les parties terminées sont comptées puis relancées automatiquement.
+
+Les joueurs fournissent leurs coups pour tout un lot avec
+JoueurBase.obtenir_coups_lot(simulateur, indices).
+"""
+
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from morpion_base import TicTacToe
+from morpion_mnk import Geometrie, MorpionMNK
+
+# Au-delà, les tables par bitboard (2**nb_cases entrées) coûtent trop cher à construire
+_TAILLE_MAX_TABLES = 12
+
+
+class SimulateurLot:
+    """Lot de plateaux m,n,k simulés ensemble, X commence toujours."""
+    
+    def __init__(self, nb_plateaux: int, lignes: int = 3, colonnes: int = 3, alignement: int = 3,
+                 reinitialisation_auto: bool = True):
+        """
+        Crée le lot de plateaux, tous vides.
+        
+        Args:
+            nb_plateaux: Nombre de parties simulées en même temps
+            lignes: Nombre de lignes du plateau (m)
+            colonnes: Nombre de colonnes du plateau (n)
+            alignement: Nombre de symboles à aligner pour gagner (k)
+            reinitialisation_auto: Si True, un plateau dont la partie se
+                termine repart aussitôt sur une nouvelle partie
+        """
+        if nb_plateaux < 1:
+            raise ValueError("Le lot doit contenir au moins un plateau")
+        self.nb_plateaux = nb_plateaux
+        self.geometrie = Geometrie.obtenir(lignes, colonnes, alignement)
+        self.lignes = lignes
+        self.colonnes = colonnes
+        self.alignement = alignement
+        self.nb_cases = self.geometrie.nb_cases
+        self.reinitialisation_auto = reinitialisation_auto
+        
+        self.bits_x: List[int] = []
+        self.bits_o: List[int] = []
+        self.nb_coups: List[int] = []
+        self.actifs: List[bool] = []  # Plateaux dont la partie est en cours
+        
+        # Nombre de parties encore à lancer (None : illimité)
+        self.parties_a_lancer: Optional[int] = None
+        self.parties_terminees = 0
+        self.resultats = {MorpionMNK.HUMAIN: 0, MorpionMNK.IA: 0, 'NUL': 0}
+        
+        # Tables de victoire et de coups par bitboard pour les petits plateaux
+        self._a_aligne = None
+        self._coups_par_masque = None
+        if self.nb_cases <= _TAILLE_MAX_TABLES:
+            self._a_aligne = self.construire_table_victoires(self.geometrie)
+            if (lignes, colonnes) == (3, 3):
+                from morpion_base import COUPS_PAR_MASQUE
+                self._coups_par_masque = COUPS_PAR_MASQUE
+            else:
+                coordonnees = self.geometrie.coordonnees
+                self._coups_par_masque = tuple(
+                    tuple(coordonnees[i] for i in range(self.nb_cases) if masque >> i & 1)
+                    for masque in range(1 << self.nb_cases)
+                )
+        # Masques des alignements passant par chaque case (grands plateaux)
+        masques = self.geometrie.masques_alignements
+        self._masques_par_case = tuple(
+            tuple(masques[n] for n in alignements) for alignements in self.geometrie.alignements_par_case
+        )
+        
+        # Plateau de travail prêté aux joueurs qui ne savent jouer que sur un jeu
+        if (lignes, colonnes, alignement) == (3, 3, 3):
+            self._jeu = TicTacToe()
+        else:
+            self._jeu = MorpionMNK(lignes, colonnes, alignement)
+        
+        self.reinitialiser()
+    
+    @staticmethod
+    def construire_table_victoires(geometrie: Geometrie) -> bytearray:
+        """
+        Précalcule, pour chaque bitboard, s'il contient un alignement gagnant.
+        
+        Returns:
+            Tableau de 2**nb_cases octets (1 si le bitboard gagne)
+        """
+        table = bytearray(1 << geometrie.nb_cases)
+        # Marquer chaque masque gagnant puis propager aux sur-ensembles, bit par bit
+        for masque in geometrie.masques_alignements:
+            table[masque] = 1
+        for i in range(geometrie.nb_cases):
+            bit = 1 << i
+            for bits in range(len(table)):
+                if bits & bit and table[bits ^ bit]:
+                    table[bits] = 1
+        return table
+    
+    def reinitialiser(self, nb_parties: Optional[int] = None):
+        """
+        Vide tous les plateaux et remet les compteurs à zéro.
+        
+        Args:
+            nb_parties: Nombre total de parties à jouer (None : illimité).
+                Si le lot est plus grand, les plateaux en trop restent inactifs.
+        """
+        n = self.nb_plateaux
+        self.bits_x = [0] * n
+        self.bits_o = [0] * n
+        self.nb_coups = [0] * n
+        lancees = n if nb_parties is None else min(n, nb_parties)
+        self.actifs = [i < lancees for i in range(n)]
+        self.parties_a_lancer = None if nb_parties is None else nb_parties - lancees
+        self.parties_terminees = 0
+        self.resultats = {MorpionMNK.HUMAIN: 0, MorpionMNK.IA: 0, 'NUL': 0}
+    
+    def charger_position(self, index: int, bits_x: int, bits_o: int):
+        """
+        Place une position en cours de partie sur le plateau ``index`` et l'active.
+
+        Args:
+            index: Numéro du plateau
+            bits_x: Bitboard des cases de X
+            bits_o: Bitboard des cases de O (X a joué le premier coup)
+        """
+        self.bits_x[index] = bits_x
+        self.bits_o[index] = bits_o
+        self.nb_coups[index] = bin(bits_x | bits_o).count('1')
+        self.actifs[index] = True
+
+    def symbole_au_trait(self, index: int) -> str:
+        """Symbole du joueur qui doit jouer sur le plateau ``index``."""
+        return MorpionMNK.HUMAIN if self.nb_coups[index] % 2 == 0 else MorpionMNK.IA
+    
+    def obtenir_cases_libres(self, index: int) -> int:
+        """Masque de bits des cases libres du plateau ``index``."""
+        return ~(self.bits_x[index] | self.bits_o[index]) & self.geometrie.masque_plein
+    
+    def obtenir_coups_possibles(self, index: int) -> Sequence[Tuple[int, int]]:
+        """Coups (ligne, colonne) possibles sur le plateau ``index``."""
+        libres = self.obtenir_cases_libres(index)
+        if self._coups_par_masque is not None:
+            return self._coups_par_masque[libres]
+        coordonnees = self.geometrie.coordonnees
+        coups = []
+        while libres:
+            bit = libres & -libres
+            libres ^= bit
+            coups.append(coordonnees[bit.bit_length() - 1])
+        return coups
+    
+    def obtenir_jeu(self, index: int) -> MorpionMNK:
+        """
+        Charge le plateau ``index`` dans un jeu de travail.
+        
+        Le même objet est réutilisé à chaque appel : il n'est valide que
+        jusqu'au prochain appel et ne doit pas être conservé.
+        """
+        self._jeu.charger_position(self.bits_x[index], self.bits_o[index])
+        return self._jeu
+    
+    def indices_au_trait(self, symbole: str) -> List[int]:
+        """Plateaux actifs sur lesquels ``symbole`` doit jouer."""
+        parite = 0 if symbole == MorpionMNK.HUMAIN else 1
+        nb_coups = self.nb_coups
+        return [i for i, actif in enumerate(self.actifs) if actif and nb_coups[i] % 2 == parite]
+    
+    def _a_gagne(self, bits: int, index: int) -> bool:
+        """Indique si le coup joué en ``index`` complète un alignement de ``bits``."""
+        if self._a_aligne is not None:
+            return bool(self._a_aligne[bits])
+        for masque in self._masques_par_case[index]:
+            if bits & masque == masque:
+                return True
+        return False
+    
+    def jouer(self, indices: Sequence[int], coups: Sequence[Tuple[int, int]]) -> List[Tuple[int, str]]:
+        """
+        Joue un coup sur chacun des plateaux indiqués.
+        
+        Le coup est joué par le joueur au trait de chaque plateau.
+        
+        Args:
+            indices: Numéros des plateaux
+            coups: Coup (ligne, colonne) pour chaque plateau, dans le même ordre
+        
+        Returns:
+            Liste des (plateau, résultat) des parties terminées par ce pas,
+            le résultat valant 'X', 'O' ou 'NUL'
+        
+        Raises:
+            ValueError: Si un plateau est inactif ou si un coup n'est pas légal
+        """
+        colonnes = self.colonnes
+        bits_x, bits_o, nb_coups = self.bits_x, self.bits_o, self.nb_coups
+        terminees = []
+        for i, (ligne, colonne) in zip(indices, coups):
+            if not self.actifs[i]:
+                raise ValueError(f"Le plateau {i} n'a pas de partie en cours")
+            index = ligne * colonnes + colonne
+            bit = 1 << index
+            if not (0 <= ligne < self.lignes and 0 <= colonne < colonnes) or (bits_x[i] | bits_o[i]) & bit:
+                raise ValueError(f"Coup illégal ({ligne}, {colonne}) sur le plateau {i}")
+            
+            if nb_coups[i] % 2 == 0:
+                bits = bits_x[i] = bits_x[i] | bit
+                symbole = MorpionMNK.HUMAIN
+            else:
+                bits = bits_o[i] = bits_o[i] | bit
+                symbole = MorpionMNK.IA
+            nb_coups[i] += 1
+            
+            if self._a_gagne(bits, index):
+                resultat = symbole
+            elif nb_coups[i] == self.nb_cases:
+                resultat = 'NUL'
+            else:
+                continue
+            terminees.append((i, resultat))
+            self._terminer(i, resultat)
+        return terminees
+    
+    def _terminer(self, index: int, resultat: str):
+        """Compte une partie terminée et relance le plateau si nécessaire."""
+        self.parties_terminees += 1
+        self.resultats[resultat] += 1
+        self.bits_x[index] = self.bits_o[index] = self.nb_coups[index] = 0
+        if not self.reinitialisation_auto or self.parties_a_lancer == 0:
+            self.actifs[index] = False
+        elif self.parties_a_lancer is not None:
+            self.parties_a_lancer -= 1
+    
+    def jouer_tour(self, joueurs: Dict[str, 'JoueurBase']) -> List[Tuple[int, str]]:
+        """
+        Fait jouer un demi-coup sur tous les plateaux actifs.
+        
+        Args:
+            joueurs: Joueur de chaque symbole, {'X': joueur_x, 'O': joueur_o}
+        
+        Returns:
+            Liste des (plateau, résultat) des parties terminées par ce tour
+        """
+        terminees = []
+        # Les deux camps jouent dans le même tour : les plateaux relancés
+        # ne sont pas au même coup que les autres
+        for symbole, joueur in joueurs.items():
+            indices = self.indices_au_trait(symbole)
+            if indices:
+                terminees += self.jouer(indices, joueur.obtenir_coups_lot(self, indices))
+        return terminees
+    
+    def jouer_parties(self, joueur_x: 'JoueurBase', joueur_o: 'JoueurBase', nb_parties: int) -> Dict[str, int]:
+        """
+        Joue ``nb_parties`` parties complètes entre deux joueurs.
+        
+        Returns:
+            Nombre de victoires de chaque symbole et de nuls {'X': .., 'O': .., 'NUL': ..}
+        """
+        self.reinitialiser(nb_parties)
+        joueurs = {MorpionMNK.HUMAIN: joueur_x, MorpionMNK.IA: joueur_o}
+        while any(self.actifs):
+            self.jouer_tour(joueurs)
+        return dict(self.resultats)
+
+
+# Test du module
+if __name__ == "__main__":
+    import time
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from joueurs import JoueurAleatoire
+    
+    print("Test du simulateur par lot")
+    print("=" * 50)
+    
+    joueur_x = JoueurAleatoire('X', "Aléatoire X")
+    joueur_o = JoueurAleatoire('O', "Aléatoire O")
+    
+    for lignes, colonnes, alignement in [(3, 3, 3), (4, 4, 3), (7, 7, 4)]:
+        simulateur = SimulateurLot(1000, lignes, colonnes, alignement)
+        nb_parties = 20000 if lignes == 3 else 2000
+        debut = time.time()
+        resultats = simulateur.jouer_parties(joueur_x, joueur_o, nb_parties)
+        duree = time.time() - debut
+        print(f"{lignes}x{colonnes}/{alignement}: {nb_parties} parties en {duree:.2f}s "
+              f"({nb_parties / duree:.0f} parties/s) -> {resultats}")
+    
+    # Comparaison : une partie à la fois avec des objets TicTacToe
+    random.seed(0)
+    debut = time.time()
+    for _ in range(20000):
+        jeu = TicTacToe()
+        symbole = 'X'
+        while not jeu.est_partie_terminee():
+            joueur = joueur_x if symbole == 'X' else joueur_o
+            ligne, colonne = joueur.obtenir_coup(jeu)
+            jeu.jouer_coup(ligne, colonne, symbole)
+            symbole = 'O' if symbole == 'X' else 'X'
+    print(f"Référence partie par partie: 20000 parties en {time.time() - debut:.2f}s")
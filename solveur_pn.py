@@ -0,0 +1,411 @@
+"""
+Solveur par nombres de preuve (df-pn) des variantes m,n,k.
+
+Alpha-Beta cherche le meilleur score ; ce solveur répond à une question
+oui/non, « le joueur A obtient-il au moins tel résultat ? », et concentre
+l'effort sur les coups qui rapprochent le plus d'une réponse. Chaque noeud
+porte deux nombres : le nombre de preuve (combien de feuilles au minimum
+restent à prouver pour établir la réponse oui) et le nombre de réfutation
+(pour la réponse non). Le parcours en profondeur df-pn (Nagai) développe
+toujours le noeud le plus prometteur sous des seuils, sans garder l'arbre
+en mémoire : seule la table de transposition retient les nombres.
+
+Les nombres sont tenus du point de vue du joueur au trait (phi, delta) :
+phi = 0 quand le joueur au trait atteint son but, delta = 0 quand il ne
+l'atteint pas. Le but de l'attaquant est d'obtenir au moins ``seuil``
+(VICTOIRE ou NUL), celui du défenseur de l'en empêcher.
+
+La table est limitée à ``taille_max`` entrées : quand elle est pleine, la
+moitié des entrées non résolues qui ont coûté le moins de travail sont
+oubliées (elles seront recalculées si besoin). Les positions symétriques
+partagent une entrée.
+
+Une fois la question tranchée, arbre_preuve extrait l'arbre de preuve :
+un coup gagnant pour chaque position où le camp qui a raison est au trait,
+toutes les réponses de l'autre camp. Ces coups complètent une bibliothèque
+d'ouvertures (completer_bibliotheque). Une table de finales peut servir
+d'oracle pour les positions qu'elle couvre.
+"""
+
+from typing import Dict, Optional, Tuple
+
+from bibliotheque_ouvertures import POIDS_MAX
+from symetries import Symetries
+from table_finale import DEFAITE, NUL, VICTOIRE
+
+# Nombre « infini » : question tranchée
+INF = 10 ** 9
+
+# Taille par défaut de la table de transposition (entrées)
+TAILLE_TABLE_DEFAUT = 2_000_000
+
+
+class LimiteAtteinte(Exception):
+    """Levée dans la recherche quand le budget de noeuds est épuisé."""
+
+
+def _nb_pions(cle: int) -> int:
+    """Nombre de cases occupées d'une clé de position (chiffres non nuls en base 3)."""
+    nb = 0
+    while cle:
+        cle, chiffre = divmod(cle, 3)
+        nb += chiffre != 0
+    return nb
+
+
+class SolveurPN:
+    """Recherche df-pn avec table de transposition bornée."""
+    
+    def __init__(self, taille_max: int = TAILLE_TABLE_DEFAUT, table_finale=None,
+                 symetries: bool = True):
+        """
+        Initialise le solveur.
+        
+        Args:
+            taille_max: Nombre maximal d'entrées de la table de transposition
+            table_finale: Table de finales (table_finale.TableFinale) sondée
+                          avant de développer un noeud
+            symetries: Partager une entrée entre positions symétriques (moins
+                       de noeuds, mais chaque clé coûte plus cher à calculer)
+        """
+        if taille_max < 2:
+            raise ValueError(f"Taille de table invalide: {taille_max}")
+        self.taille_max = taille_max
+        self.table_finale = table_finale
+        self.symetries = symetries
+        # Clé -> [phi, delta, travail] ; travail = noeuds développés sous la position
+        self.table: Dict[int, list] = {}
+        self._objectif = None  # (géométrie, attaquant, seuil) des nombres de la table
+        self._symetries = None
+        self._noeuds_max = None
+        self.reinitialiser_statistiques()
+    
+    def reinitialiser_statistiques(self):
+        """Remet les compteurs à zéro."""
+        self.noeuds = 0
+        self.nettoyages = 0
+        self.hits_finale = 0
+    
+    def obtenir_statistiques(self) -> dict:
+        """Retourne les compteurs de la dernière recherche."""
+        return {
+            'noeuds': self.noeuds,
+            'entrees_table': len(self.table),
+            'nettoyages': self.nettoyages,
+            'hits_finale': self.hits_finale,
+        }
+    
+    def prouver(self, jeu, attaquant: str, seuil: int = VICTOIRE,
+                noeuds_max: Optional[int] = None) -> Optional[bool]:
+        """
+        Établit si ``attaquant`` obtient au moins ``seuil`` en jeu parfait.
+        
+        Args:
+            jeu: Instance du jeu (TicTacToe ou MorpionMNK), non modifiée
+            attaquant: Joueur dont le résultat est examiné
+            seuil: VICTOIRE (l'attaquant gagne) ou NUL (l'attaquant ne perd pas)
+            noeuds_max: Budget de noeuds (None = sans limite)
+        
+        Returns:
+            True si c'est prouvé, False si c'est réfuté, None si le budget
+            est épuisé avant (la table garde le travail fait)
+        """
+        if seuil not in (NUL, VICTOIRE):
+            raise ValueError(f"Seuil invalide: {seuil} (attendu: NUL ou VICTOIRE)")
+        objectif = ((jeu.lignes, jeu.colonnes, jeu.alignement), attaquant, seuil)
+        if objectif != self._objectif:
+            self.table.clear()  # Les nombres n'ont de sens que pour une question
+            self._objectif = objectif
+        self._attaquant = attaquant
+        self._defenseur = jeu.adversaire(attaquant)
+        self._seuil = seuil
+        self._symetries = Symetries.obtenir(jeu.lignes, jeu.colonnes)
+        self._noeuds_max = None if noeuds_max is None else self.noeuds + noeuds_max
+        
+        symbole = jeu.joueur_actuel
+        travail = jeu.copier()
+        try:
+            phi, delta = self._mid(travail, symbole, jeu.adversaire(symbole), INF, INF)
+        except LimiteAtteinte:
+            return None
+        # phi = 0 : le joueur au trait atteint son but
+        return (phi == 0) == (symbole == attaquant)
+    
+    def resoudre(self, jeu, noeuds_max: Optional[int] = None) -> Optional[int]:
+        """
+        Résultat en jeu parfait pour le joueur au trait.
+        
+        Une première preuve demande si le joueur au trait gagne ; sinon une
+        seconde s'il évite la défaite. arbre_preuve décrit ensuite la
+        dernière preuve faite.
+        
+        Args:
+            jeu: Instance du jeu, non modifiée
+            noeuds_max: Budget de noeuds de chaque preuve (None = sans limite)
+        
+        Returns:
+            VICTOIRE, NUL ou DEFAITE, ou None si le budget est épuisé
+        """
+        symbole = jeu.joueur_actuel
+        gagne = self.prouver(jeu, symbole, VICTOIRE, noeuds_max)
+        if gagne is None:
+            return None
+        if gagne:
+            return VICTOIRE
+        ne_perd_pas = self.prouver(jeu, symbole, NUL, noeuds_max)
+        if ne_perd_pas is None:
+            return None
+        return NUL if ne_perd_pas else DEFAITE
+    
+    def _cle(self, jeu, symbole: str) -> int:
+        """Clé de la table ; le joueur au trait fait partie de la clé."""
+        if self.symetries:
+            cle, _ = self._symetries.canonique(jeu.bitboards[jeu.HUMAIN], jeu.bitboards[jeu.IA])
+        else:
+            cle = jeu.cle
+        return cle * 2 + (symbole == jeu.IA)
+    
+    def _valeur_terminale(self, jeu, symbole: str) -> Optional[bool]:
+        """
+        Valeur d'une position dont le résultat est connu sans la développer.
+        
+        Returns:
+            True si le joueur au trait y atteint son but, False sinon, None
+            si la position doit être développée
+        """
+        attaquant = self._attaquant
+        if jeu.lignes_completes[attaquant]:
+            resultat = VICTOIRE
+        elif jeu.lignes_completes[self._defenseur]:
+            resultat = DEFAITE
+        elif jeu.nb_cases_occupees == jeu.nb_cases:
+            resultat = NUL
+        else:
+            finale = self.table_finale
+            if finale is None or jeu.nb_cases - jeu.nb_cases_occupees > finale.vides_max:
+                return None
+            valeur = finale.sonder(jeu, symbole)
+            if valeur is None:
+                return None
+            self.hits_finale += 1
+            resultat = valeur[0] if symbole == attaquant else VICTOIRE - valeur[0]
+        return (resultat >= self._seuil) == (symbole == attaquant)
+    
+    def _stocker(self, cle: int, phi: int, delta: int, travail: int):
+        """Écrit une entrée, en faisant de la place si la table est pleine."""
+        table = self.table
+        if cle not in table and len(table) >= self.taille_max:
+            self._nettoyer()
+        table[cle] = [phi, delta, travail]
+    
+    def _nettoyer(self):
+        """Oublie la moitié de la table, les entrées les moins coûteuses d'abord."""
+        self.nettoyages += 1
+        table = self.table
+        a_garder = self.taille_max // 2
+        # Les positions non résolues partent avant les positions résolues
+        ordre = sorted(table, key=lambda cle: (table[cle][0] == 0 or table[cle][1] == 0, table[cle][2]))
+        for cle in ordre[:len(table) - a_garder]:
+            del table[cle]
+    
+    def _enfants(self, jeu, symbole: str, adversaire: str):
+        """Positions filles [ligne, colonne, clé, phi, delta] ; les filles terminales sont résolues."""
+        enfants = []
+        table = self.table
+        for ligne, colonne in jeu.obtenir_coups_possibles():
+            jeu.jouer_coup(ligne, colonne, symbole)
+            cle = self._cle(jeu, adversaire)
+            entree = table.get(cle)
+            if entree is not None:
+                phi, delta = entree[0], entree[1]
+            else:
+                valeur = self._valeur_terminale(jeu, adversaire)
+                phi, delta = (1, 1) if valeur is None else (0, INF) if valeur else (INF, 0)
+            jeu.annuler_coup()
+            enfants.append([ligne, colonne, cle, phi, delta])
+        return enfants
+    
+    def _mid(self, jeu, symbole: str, adversaire: str, seuil_phi: int, seuil_delta: int) -> Tuple[int, int]:
+        """
+        Développe une position jusqu'à ce que phi ou delta atteigne son seuil.
+        
+        Args:
+            jeu: Instance du jeu
+            symbole: Joueur au trait
+            adversaire: Son adversaire
+            seuil_phi: Seuil du nombre de preuve du joueur au trait
+            seuil_delta: Seuil de son nombre de réfutation
+        
+        Returns:
+            (phi, delta) de la position
+        """
+        self.noeuds += 1
+        if self._noeuds_max is not None and self.noeuds > self._noeuds_max:
+            raise LimiteAtteinte()
+        
+        cle = self._cle(jeu, symbole)
+        valeur = self._valeur_terminale(jeu, symbole)
+        if valeur is not None:
+            phi, delta = (0, INF) if valeur else (INF, 0)
+            self._stocker(cle, phi, delta, 0)
+            return phi, delta
+        
+        debut = self.noeuds
+        entree = self.table.get(cle)
+        travail = entree[2] if entree is not None else 0
+        enfants = self._enfants(jeu, symbole, adversaire)
+        table = self.table
+        while True:
+            # phi = plus petit delta des filles, delta = somme de leurs phi
+            phi = INF
+            delta = 0
+            meilleur = None
+            phi_meilleur = delta_second = INF
+            for enfant in enfants:
+                # Les nombres des filles sont aussi gardés ici : un nettoyage de la
+                # table ne fait pas perdre le travail fait sous ce noeud
+                entree_fille = table.get(enfant[2])
+                if entree_fille is not None:
+                    enfant[3], enfant[4] = entree_fille[0], entree_fille[1]
+                phi_fille, delta_fille = enfant[3], enfant[4]
+                delta = min(INF, delta + phi_fille)
+                if delta_fille < phi:
+                    delta_second = phi
+                    phi = delta_fille
+                    meilleur = enfant
+                    phi_meilleur = phi_fille
+                elif delta_fille < delta_second:
+                    delta_second = delta_fille
+            if phi >= seuil_phi or delta >= seuil_delta:
+                break
+            
+            # Seuils de la fille la plus prometteuse (ses phi/delta sont nos delta/phi)
+            jeu.jouer_coup(meilleur[0], meilleur[1], symbole)
+            meilleur[3], meilleur[4] = self._mid(jeu, adversaire, symbole,
+                                                 min(INF, seuil_delta - delta + phi_meilleur),
+                                                 min(seuil_phi, delta_second + 1))
+            jeu.annuler_coup()
+        
+        self._stocker(cle, phi, delta, travail + self.noeuds - debut)
+        return phi, delta
+    
+    def arbre_preuve(self, jeu) -> Dict[int, int]:
+        """
+        Extrait l'arbre de preuve de la dernière question tranchée.
+        
+        Pour chaque position de l'arbre où le camp qui a raison est au
+        trait, un coup qui maintient son but ; pour les autres, toutes les
+        réponses sont suivies. Les positions oubliées par la table sont
+        résolues à nouveau.
+        
+        Args:
+            jeu: Position racine de la dernière preuve, non modifiée
+        
+        Returns:
+            {clé canonique de la position: case du coup sur le plateau canonique},
+            au format de BibliothequeOuvertures
+        """
+        if self._objectif is None:
+            raise ValueError("Aucune preuve n'a encore été faite")
+        self._noeuds_max = None
+        arbre: Dict[int, int] = {}
+        symbole = jeu.joueur_actuel
+        self._extraire(jeu.copier(), symbole, jeu.adversaire(symbole), arbre, set())
+        return arbre
+    
+    def _resolue(self, jeu, symbole: str, adversaire: str) -> list:
+        """Entrée résolue de la position, recalculée si elle a été oubliée."""
+        entree = self.table.get(self._cle(jeu, symbole))
+        if entree is None or (entree[0] and entree[1]):
+            self._mid(jeu, symbole, adversaire, INF, INF)
+            entree = self.table[self._cle(jeu, symbole)]
+        return entree
+    
+    def _extraire(self, jeu, symbole: str, adversaire: str, arbre: Dict[int, int], vues: set):
+        """Parcourt l'arbre de preuve sous la position du jeu."""
+        cle_canonique, transformation = self._symetries.canonique(jeu.bitboards[jeu.HUMAIN],
+                                                                  jeu.bitboards[jeu.IA])
+        if cle_canonique in vues or self._valeur_terminale(jeu, symbole) is not None:
+            return
+        vues.add(cle_canonique)
+        gagne = self._resolue(jeu, symbole, adversaire)[0] == 0
+        
+        for ligne, colonne in jeu.obtenir_coups_possibles():
+            jeu.jouer_coup(ligne, colonne, symbole)
+            if gagne and self._resolue(jeu, adversaire, symbole)[1] != 0:
+                jeu.annuler_coup()
+                continue  # Ce coup ne maintient pas le but
+            if gagne:
+                index = ligne * jeu.colonnes + colonne
+                arbre[cle_canonique] = self._symetries.transformer_index(index, transformation)
+            self._extraire(jeu, adversaire, symbole, arbre, vues)
+            jeu.annuler_coup()
+            if gagne:
+                break
+    
+    def completer_bibliotheque(self, jeu, bibliotheque, poids: int = POIDS_MAX) -> int:
+        """
+        Ajoute l'arbre de preuve à une bibliothèque d'ouvertures.
+        
+        Les positions déjà présentes gardent leurs coups ; la profondeur de la
+        bibliothèque est étendue jusqu'aux positions ajoutées.
+        
+        Args:
+            jeu: Position racine de la dernière preuve
+            bibliotheque: bibliotheque_ouvertures.BibliothequeOuvertures de même géométrie
+            poids: Poids des coups ajoutés
+        
+        Returns:
+            Nombre de positions ajoutées
+        
+        Raises:
+            ValueError: Si la géométrie de la bibliothèque diffère
+        """
+        if (bibliotheque.lignes, bibliotheque.colonnes, bibliotheque.alignement) != \
+                (jeu.lignes, jeu.colonnes, jeu.alignement):
+            raise ValueError("La bibliothèque n'a pas la géométrie du jeu")
+        ajoutees = 0
+        for cle, index in self.arbre_preuve(jeu).items():
+            if cle in bibliotheque.entrees:
+                continue
+            bibliotheque.ajouter(cle, index, poids)
+            bibliotheque.profondeur = max(bibliotheque.profondeur, _nb_pions(cle) + 1)
+            ajoutees += 1
+        return ajoutees
+
+
+# Test du module
+if __name__ == "__main__":
+    import time
+    from bibliotheque_ouvertures import BibliothequeOuvertures
+    from morpion_mnk import MorpionMNK
+    
+    print("Test du solveur par nombres de preuve")
+    print("=" * 50)
+    noms = {VICTOIRE: "victoire", NUL: "nul", DEFAITE: "défaite"}
+    
+    for lignes, colonnes, alignement in ((3, 3, 3), (3, 4, 3), (4, 4, 3)):
+        jeu = MorpionMNK(lignes, colonnes, alignement)
+        solveur = SolveurPN()
+        debut = time.time()
+        resultat = solveur.resoudre(jeu)
+        print(f"{lignes}x{colonnes} (alignement {alignement}): {noms[resultat]} du premier joueur "
+              f"en {time.time() - debut:.2f}s, {solveur.obtenir_statistiques()}")
+    
+    jeu = MorpionMNK(4, 4, 3)
+    solveur = SolveurPN()
+    solveur.prouver(jeu, jeu.HUMAIN)
+    arbre = solveur.arbre_preuve(jeu)
+    print(f"\nArbre de preuve 4x4 (alignement 3): {len(arbre)} positions où X joue")
+    bibliotheque = BibliothequeOuvertures(4, 4, 3)
+    print(f"Positions ajoutées à une bibliothèque: {solveur.completer_bibliotheque(jeu, bibliotheque)}, "
+          f"premier coup {bibliotheque.choisir(jeu, jeu.HUMAIN)}")
+    
+    petite = SolveurPN(taille_max=300)
+    print(f"\nTable limitée à 300 entrées, 4x4 (alignement 3): {noms[petite.resoudre(jeu)]}, "
+          f"{petite.obtenir_statistiques()}")
+    
+    # 4x4 (alignement 4) est nul, mais la preuve demande plusieurs minutes
+    budget = SolveurPN()
+    print(f"4x4 (alignement 4) avec 20000 noeuds: {budget.prouver(MorpionMNK(4, 4, 4), 'X', noeuds_max=20000)} "
+          f"(None = budget épuisé)")
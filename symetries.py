@@ -0,0 +1,208 @@
+"""
+Canonicalisation des positions par symétrie du plateau.
+
+Un plateau carré a 8 symétries (groupe D4 : 4 rotations et 4 réflexions),
+un plateau rectangulaire en a 4. Deux positions images l'une de l'autre ont
+la même valeur : les caches, tables Q et données d'entraînement peuvent
+donc ne stocker qu'un représentant par classe, la position canonique, ce
+qui divise leur taille par 8 environ sur le 3x3.
+
+La position canonique est l'image de plus petite clé (rang en base 3). La
+transformation renvoyée avec elle sert à convertir les coups : un coup du
+plateau réel devient un coup du plateau canonique avec transformer_coup,
+et inverser_coup fait le chemin retour.
+
+Les permutations de cases sont précalculées une fois par géométrie ; pour
+les petits plateaux (jusqu'à 12 cases) les images de tous les bitboards
+sont aussi précalculées, une canonicalisation coûte alors quelques accès
+à des tuples.
+"""
+
+from typing import Dict, Sequence, Tuple
+
+# Les bitboards de plateaux plus grands sont transformés case par case
+_TAILLE_MAX_TABLES = 12
+
+
+class Symetries:
+    """Symétries d'une géométrie de plateau et tables de permutation associées."""
+    
+    def __init__(self, lignes: int, colonnes: int):
+        """
+        Précalcule les permutations de cases de chaque symétrie.
+        
+        Args:
+            lignes: Nombre de lignes du plateau
+            colonnes: Nombre de colonnes du plateau
+        """
+        self.lignes = lignes
+        self.colonnes = colonnes
+        self.nb_cases = lignes * colonnes
+        
+        dl, dc = lignes - 1, colonnes - 1
+        transformations = [
+            lambda l, c: (l, c),            # Identité
+            lambda l, c: (l, dc - c),       # Miroir vertical
+            lambda l, c: (dl - l, c),       # Miroir horizontal
+            lambda l, c: (dl - l, dc - c),  # Rotation 180°
+        ]
+        if lignes == colonnes:
+            transformations += [
+                lambda l, c: (c, dl - l),       # Rotation 90°
+                lambda l, c: (dc - c, l),       # Rotation 270°
+                lambda l, c: (c, l),            # Diagonale principale
+                lambda l, c: (dc - c, dl - l),  # Anti-diagonale
+            ]
+        
+        # permutations[t][i] : case du plateau transformé où arrive la case i
+        self.permutations = tuple(
+            tuple(nl * colonnes + nc for nl, nc in (f(*divmod(i, colonnes)) for i in range(self.nb_cases)))
+            for f in transformations
+        )
+        self.inverses = tuple(
+            tuple(sorted(range(self.nb_cases), key=lambda i: perm[i]))
+            for perm in self.permutations
+        )
+        self.nb_symetries = len(self.permutations)
+        
+        self._images = None
+        self._rangs = None
+        if self.nb_cases <= _TAILLE_MAX_TABLES:
+            taille = 1 << self.nb_cases
+            # Rang en base 3 de chaque bitboard (chiffre 1 sur chaque bit posé)
+            self._rangs = tuple(
+                sum(3 ** i for i in range(self.nb_cases) if bits >> i & 1) for bits in range(taille)
+            )
+            self._images = tuple(
+                tuple(self._transformer_bits(bits, perm) for bits in range(taille))
+                for perm in self.permutations
+            )
+    
+    _cache: Dict[Tuple[int, int], 'Symetries'] = {}
+    
+    @classmethod
+    def obtenir(cls, lignes: int, colonnes: int) -> 'Symetries':
+        """Retourne les symétries de la géométrie, précalculées une seule fois par processus."""
+        cle = (lignes, colonnes)
+        symetries = cls._cache.get(cle)
+        if symetries is None:
+            symetries = cls._cache[cle] = cls(lignes, colonnes)
+        return symetries
+    
+    @staticmethod
+    def _transformer_bits(bits: int, permutation: Sequence[int]) -> int:
+        """Applique une permutation de cases à un bitboard."""
+        image = 0
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            image |= 1 << permutation[bit.bit_length() - 1]
+        return image
+    
+    def _rang(self, bits: int) -> int:
+        """Rang en base 3 d'un bitboard (chiffre 1 sur chaque bit posé)."""
+        rang = 0
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            rang += 3 ** (bit.bit_length() - 1)
+        return rang
+    
+    def canonique(self, bits_x: int, bits_o: int) -> Tuple[int, int]:
+        """
+        Calcule la position canonique.
+        
+        Args:
+            bits_x: Bitboard des X
+            bits_o: Bitboard des O
+        
+        Returns:
+            (clé canonique, transformation) : la clé est le plus petit rang en
+            base 3 parmi toutes les images, la transformation est l'indice de
+            la symétrie qui amène la position réelle sur la position canonique
+        """
+        meilleure_cle = -1
+        meilleure_transfo = 0
+        if self._images is not None:
+            rangs = self._rangs
+            for t, images in enumerate(self._images):
+                cle = rangs[images[bits_x]] + 2 * rangs[images[bits_o]]
+                if meilleure_cle < 0 or cle < meilleure_cle:
+                    meilleure_cle = cle
+                    meilleure_transfo = t
+        else:
+            for t, perm in enumerate(self.permutations):
+                cle = (self._rang(self._transformer_bits(bits_x, perm))
+                       + 2 * self._rang(self._transformer_bits(bits_o, perm)))
+                if meilleure_cle < 0 or cle < meilleure_cle:
+                    meilleure_cle = cle
+                    meilleure_transfo = t
+        return meilleure_cle, meilleure_transfo
+    
+    def canonique_cle(self, cle: int) -> Tuple[int, int]:
+        """Comme canonique(), à partir d'une clé de position (rang en base 3)."""
+        bits_x = bits_o = 0
+        for i in range(self.nb_cases):
+            cle, chiffre = divmod(cle, 3)
+            if chiffre == 1:
+                bits_x |= 1 << i
+            elif chiffre == 2:
+                bits_o |= 1 << i
+        return self.canonique(bits_x, bits_o)
+    
+    def transformer_index(self, index: int, transformation: int) -> int:
+        """Case du plateau canonique correspondant à la case ``index`` du plateau réel."""
+        return self.permutations[transformation][index]
+    
+    def inverser_index(self, index: int, transformation: int) -> int:
+        """Case du plateau réel correspondant à la case ``index`` du plateau canonique."""
+        return self.inverses[transformation][index]
+    
+    def transformer_coup(self, coup: Tuple[int, int], transformation: int) -> Tuple[int, int]:
+        """Convertit un coup (ligne, colonne) du plateau réel vers le plateau canonique."""
+        return divmod(self.permutations[transformation][coup[0] * self.colonnes + coup[1]], self.colonnes)
+    
+    def inverser_coup(self, coup: Tuple[int, int], transformation: int) -> Tuple[int, int]:
+        """Convertit un coup (ligne, colonne) du plateau canonique vers le plateau réel."""
+        return divmod(self.inverses[transformation][coup[0] * self.colonnes + coup[1]], self.colonnes)
+
+
+def canonique(jeu) -> Tuple[int, int]:
+    """
+    Position canonique d'un jeu.
+    
+    Args:
+        jeu: Instance du jeu (TicTacToe ou MorpionMNK)
+    
+    Returns:
+        (clé canonique, transformation), voir Symetries.canonique
+    """
+    return Symetries.obtenir(jeu.lignes, jeu.colonnes).canonique(
+        jeu.bitboards[jeu.HUMAIN], jeu.bitboards[jeu.IA]
+    )
+
+
+# Test du module
+if __name__ == "__main__":
+    import time
+    from morpion_base import TicTacToe
+    
+    print("Test des symétries")
+    print("=" * 50)
+    
+    symetries = Symetries.obtenir(3, 3)
+    
+    # Compter les classes de positions parmi toutes les clés du 3x3
+    debut = time.time()
+    classes = set()
+    for cle in range(3 ** 9):
+        classes.add(symetries.canonique_cle(cle)[0])
+    print(f"{3 ** 9} clés -> {len(classes)} classes ({(time.time() - debut) * 1000:.0f}ms)")
+    
+    jeu = TicTacToe()
+    jeu.jouer_coup(0, 2, 'X')
+    jeu.jouer_coup(1, 1, 'O')
+    cle, transformation = canonique(jeu)
+    print(f"Clé réelle {jeu.cle}, clé canonique {cle}, transformation {transformation}")
+    coup = symetries.transformer_coup((0, 2), transformation)
+    print(f"Le coup (0, 2) devient {coup}, et revient en {symetries.inverser_coup(coup, transformation)}")
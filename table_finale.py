@@ -0,0 +1,322 @@
+"""
+Tables de finales des variantes m,n,k, par analyse rétrograde.
+
+Pour toutes les positions d'au plus ``vides_max`` cases vides, la table
+donne le résultat en jeu parfait pour le joueur au trait (victoire, nul,
+défaite) et le nombre de demi-coups avant la fin de la partie. Comme pour
+table_resolue.py, les couches sont résolues en remontant : les positions
+à 0 case vide d'abord, puis chaque couche à partir de la précédente.
+
+Une position est repérée par son rang dans sa couche, sans trou :
+
+- rang de l'ensemble des cases vides parmi les C(n, e) ensembles possibles ;
+- rang de l'ensemble des X parmi les C(n - e, nx) répartitions des cases
+  occupées, X ayant joué le premier (nx = moitié supérieure des pions).
+
+Le fichier (en-tête puis un octet par position, couche après couche) est
+ouvert en mémoire partagée avec mmap : seules les pages sondées sont lues
+et plusieurs processus partagent les mêmes pages. Taille : voir
+nb_positions (4x4 : 3,2 millions de positions pour 4 cases vides, 5x5 :
+1,4 milliard dès 3 cases vides).
+
+Codage d'une entrée : 0 pour une position impossible (le joueur au trait a
+déjà aligné), sinon 1 + 64 * résultat + distance, résultat valant 0 pour
+une défaite, 1 pour un nul et 2 pour une victoire du joueur au trait.
+"""
+
+import mmap
+import struct
+from itertools import combinations
+from typing import List, Optional, Tuple
+
+from morpion_mnk import Geometrie, MorpionMNK
+
+SIGNATURE = b'MRPF'
+FORMAT_EN_TETE = '<4sBBBB'
+TAILLE_EN_TETE = struct.calcsize(FORMAT_EN_TETE)
+
+DEFAITE, NUL, VICTOIRE = 0, 1, 2
+_PAS_RESULTAT = 64
+
+# Au-delà, l'alignement d'un bitboard est testé fenêtre par fenêtre
+_TAILLE_MAX_TABLES = 16
+
+
+def _binomiaux(n: int) -> List[List[int]]:
+    """Triangle de Pascal : binomiaux[i][k] = C(i, k), 0 <= i, k <= n."""
+    binomiaux = [[0] * (n + 2) for _ in range(n + 1)]
+    for i in range(n + 1):
+        binomiaux[i][0] = 1
+        for k in range(1, i + 1):
+            binomiaux[i][k] = binomiaux[i - 1][k - 1] + binomiaux[i - 1][k]
+    return binomiaux
+
+
+def _decalages(nb_cases: int, vides_max: int) -> List[int]:
+    """Début de chaque couche (0 à vides_max cases vides) dans la table, puis sa taille totale."""
+    binomiaux = _binomiaux(nb_cases)
+    decalages = [0]
+    for vides in range(vides_max + 1):
+        occupees = nb_cases - vides
+        decalages.append(decalages[-1] + binomiaux[nb_cases][vides] * binomiaux[occupees][(occupees + 1) // 2])
+    return decalages
+
+
+def nb_positions(nb_cases: int, vides_max: int) -> int:
+    """Nombre d'entrées (d'octets) de la table pour ``nb_cases`` cases."""
+    return _decalages(nb_cases, vides_max)[-1]
+
+
+class _Indexeur:
+    """Rang des positions d'une géométrie et test d'alignement."""
+    
+    def __init__(self, geometrie: Geometrie, vides_max: int):
+        self.geometrie = geometrie
+        self.nb_cases = geometrie.nb_cases
+        self.plein = (1 << self.nb_cases) - 1
+        self.binomiaux = _binomiaux(self.nb_cases)
+        self.decalages = _decalages(self.nb_cases, vides_max)
+        self._alignes = None
+        if self.nb_cases <= _TAILLE_MAX_TABLES:
+            self._alignes = bytearray(1 << self.nb_cases)
+            for masque in geometrie.masques_alignements:
+                # Tous les sur-ensembles de la fenêtre
+                reste = self.plein ^ masque
+                sous = reste
+                while True:
+                    self._alignes[masque | sous] = 1
+                    if not sous:
+                        break
+                    sous = (sous - 1) & reste
+    
+    def aligne(self, bits: int) -> bool:
+        """Indique si un bitboard contient un alignement gagnant."""
+        if self._alignes is not None:
+            return self._alignes[bits] == 1
+        for masque in self.geometrie.masques_alignements:
+            if bits & masque == masque:
+                return True
+        return False
+    
+    def rang(self, bits_x: int, bits_o: int) -> int:
+        """Index de la position dans la table (X a joué le premier)."""
+        binomiaux = self.binomiaux
+        occupees = bits_x | bits_o
+        rang_vides = nb_vides = 0
+        bits = self.plein ^ occupees
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            nb_vides += 1
+            rang_vides += binomiaux[bit.bit_length() - 1][nb_vides]
+        rang_x = nb_x = position = 0
+        bits = occupees
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            if bit & bits_x:
+                nb_x += 1
+                rang_x += binomiaux[position][nb_x]
+            position += 1
+        nb_occupees = self.nb_cases - nb_vides
+        return (self.decalages[nb_vides]
+                + rang_vides * binomiaux[nb_occupees][(nb_occupees + 1) // 2] + rang_x)
+
+
+class TableFinale:
+    """Table de finales ouverte en mémoire partagée, sondée par les moteurs de recherche."""
+    
+    def __init__(self, fichier: str):
+        """
+        Ouvre une table écrite par generer_table_finale.
+        
+        Args:
+            fichier: Chemin du fichier de la table
+        
+        Raises:
+            ValueError: Si le fichier n'est pas une table de finales complète
+        """
+        self.fichier = fichier
+        self._f = open(fichier, 'rb')
+        en_tete = self._f.read(TAILLE_EN_TETE)
+        if len(en_tete) != TAILLE_EN_TETE or en_tete[:4] != SIGNATURE:
+            self._f.close()
+            raise ValueError(f"{fichier} n'est pas une table de finales")
+        _, self.lignes, self.colonnes, self.alignement, self.vides_max = struct.unpack(FORMAT_EN_TETE, en_tete)
+        self.geometrie = Geometrie.obtenir(self.lignes, self.colonnes, self.alignement)
+        self._indexeur = _Indexeur(self.geometrie, self.vides_max)
+        self._donnees = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._donnees) != TAILLE_EN_TETE + self._indexeur.decalages[-1]:
+            self.fermer()
+            raise ValueError(f"{fichier} est incomplet")
+    
+    def __reduce__(self):
+        # Les processus d'un pool rouvrent le fichier au lieu de copier la table
+        return (TableFinale, (self.fichier,))
+    
+    def sonder(self, jeu, symbole: str) -> Optional[Tuple[int, int]]:
+        """
+        Lit la valeur d'une position.
+        
+        Args:
+            jeu: Instance du jeu (MorpionMNK)
+            symbole: Joueur au trait
+        
+        Returns:
+            (résultat, distance) pour ``symbole`` : résultat DEFAITE, NUL ou
+            VICTOIRE, distance en demi-coups avant la fin de la partie ; None
+            si la position est hors de la table (autre géométrie, trop de
+            cases vides, X n'a pas commencé ou ``symbole`` n'est pas au trait)
+        """
+        if jeu.geometrie is not self.geometrie:
+            return None
+        occupees = jeu.nb_cases_occupees
+        if jeu.nb_cases - occupees > self.vides_max:
+            return None
+        bits_x = jeu.bitboards[MorpionMNK.HUMAIN]
+        if symbole != (MorpionMNK.HUMAIN if occupees % 2 == 0 else MorpionMNK.IA):
+            return None
+        if bin(bits_x).count('1') != (occupees + 1) // 2:
+            return None
+        code = self._donnees[TAILLE_EN_TETE + self._indexeur.rang(bits_x, jeu.bitboards[MorpionMNK.IA])]
+        if not code:
+            return None
+        return divmod(code - 1, _PAS_RESULTAT)
+    
+    def fermer(self):
+        """Libère la projection mémoire et le fichier."""
+        if not self._f.closed:
+            self._donnees.close()
+            self._f.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.fermer()
+
+
+def _resoudre_couche(indexeur: _Indexeur, vides: int, precedente: bytearray) -> bytearray:
+    """Résout les positions à ``vides`` cases vides à partir de la couche à ``vides - 1``."""
+    nb_cases = indexeur.nb_cases
+    binomiaux = indexeur.binomiaux
+    decalage = indexeur.decalages[vides]
+    decalage_precedent = indexeur.decalages[vides - 1] if vides else 0
+    nb_occupees = nb_cases - vides
+    nb_x = (nb_occupees + 1) // 2
+    trait_x = nb_occupees % 2 == 0  # X au trait quand les deux camps ont autant de pions
+    couche = bytearray(binomiaux[nb_cases][vides] * binomiaux[nb_occupees][nb_x])
+    aligne = indexeur.aligne
+    rang = indexeur.rang
+    
+    for cases_vides in combinations(range(nb_cases), vides):
+        masque_vides = 0
+        for case in cases_vides:
+            masque_vides |= 1 << case
+        cases_occupees = [case for case in range(nb_cases) if not masque_vides >> case & 1]
+        for cases_x in combinations(cases_occupees, nb_x):
+            bits_x = 0
+            for case in cases_x:
+                bits_x |= 1 << case
+            bits_o = indexeur.plein ^ masque_vides ^ bits_x
+            joueur, adversaire = (bits_x, bits_o) if trait_x else (bits_o, bits_x)
+            if aligne(joueur):
+                continue  # Le joueur au trait ne peut pas avoir déjà gagné : impossible
+            if aligne(adversaire):
+                code = 1 + DEFAITE * _PAS_RESULTAT
+            elif not vides:
+                code = 1 + NUL * _PAS_RESULTAT
+            else:
+                # Meilleure suite : victoire la plus rapide, sinon nul, sinon défaite la plus lente
+                victoire = defaite = None
+                nul = False
+                for case in cases_vides:
+                    bit = 1 << case
+                    if trait_x:
+                        enfant = precedente[rang(bits_x | bit, bits_o) - decalage_precedent]
+                    else:
+                        enfant = precedente[rang(bits_x, bits_o | bit) - decalage_precedent]
+                    resultat, distance = divmod(enfant - 1, _PAS_RESULTAT)
+                    if resultat == DEFAITE:
+                        if victoire is None or distance < victoire:
+                            victoire = distance
+                    elif resultat == NUL:
+                        nul = True
+                    elif defaite is None or distance > defaite:
+                        defaite = distance
+                if victoire is not None:
+                    code = 1 + VICTOIRE * _PAS_RESULTAT + victoire + 1
+                elif nul:
+                    code = 1 + NUL * _PAS_RESULTAT + vides
+                else:
+                    code = 1 + DEFAITE * _PAS_RESULTAT + defaite + 1
+            couche[rang(bits_x, bits_o) - decalage] = code
+    return couche
+
+
+def generer_table_finale(fichier: str, lignes: int, colonnes: int, alignement: int,
+                         vides_max: int) -> TableFinale:
+    """
+    Construit la table des positions d'au plus ``vides_max`` cases vides.
+    
+    Seules deux couches sont en mémoire à la fois ; chaque couche résolue est
+    écrite à la suite dans le fichier.
+    
+    Args:
+        fichier: Chemin du fichier à écrire (remplacé s'il existe)
+        lignes: Nombre de lignes du plateau
+        colonnes: Nombre de colonnes du plateau
+        alignement: Nombre de symboles à aligner pour gagner
+        vides_max: Nombre maximal de cases vides (au plus 62)
+    
+    Returns:
+        La table, ouverte
+    """
+    geometrie = Geometrie.obtenir(lignes, colonnes, alignement)
+    if not 0 <= vides_max <= min(geometrie.nb_cases, _PAS_RESULTAT - 2):
+        raise ValueError(f"Nombre de cases vides invalide: {vides_max}")
+    indexeur = _Indexeur(geometrie, vides_max)
+    
+    with open(fichier, 'wb') as f:
+        f.write(struct.pack(FORMAT_EN_TETE, SIGNATURE, lignes, colonnes, alignement, vides_max))
+        precedente = bytearray()
+        for vides in range(vides_max + 1):
+            precedente = _resoudre_couche(indexeur, vides, precedente)
+            f.write(precedente)
+            print(f"[Table finale] {vides} case(s) vide(s): {len(precedente)} positions")
+    return TableFinale(fichier)
+
+
+# Test du module
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+    import time
+    from moteur_recherche import MoteurRecherche
+    
+    print("Test de la table de finales")
+    print("=" * 50)
+    print(f"Taille 4x4, 4 cases vides: {nb_positions(16, 4)} octets")
+    
+    fichier = os.path.join(tempfile.gettempdir(), "test_4x4_3.finale")
+    debut = time.time()
+    table = generer_table_finale(fichier, 4, 4, 3, 3)
+    print(f"Table générée en {time.time() - debut:.1f}s ({os.path.getsize(fichier)} octets)")
+    
+    # Partie aléatoire jusqu'à 5 cases vides : la table ne couvre que les feuilles
+    random.seed(2)
+    jeu = MorpionMNK(4, 4, 3)
+    while jeu.nb_cases - jeu.nb_cases_occupees > 5:
+        jeu.reinitialiser()
+        while jeu.nb_cases - jeu.nb_cases_occupees > 5 and not jeu.est_partie_terminee():
+            ligne, colonne = random.choice(jeu.obtenir_coups_possibles())
+            jeu.jouer_coup(ligne, colonne, jeu.joueur_actuel)
+    jeu.afficher_plateau()
+    
+    avec_table = MoteurRecherche(table_finale=table)
+    sans_table = MoteurRecherche()
+    for nom, moteur in (("sans table", sans_table), ("avec table", avec_table)):
+        print(f"Recherche {nom}: {moteur.rechercher(jeu, jeu.joueur_actuel)}, {moteur.noeuds} noeuds, "
+              f"{moteur.hits_finale} sondages")
+    table.fermer()
@@ -0,0 +1,186 @@
+"""
+Table de résolution complète du Tic-Tac-Toe 3x3.
+
+Les 5 478 positions atteignables depuis le plateau vide sont énumérées une
+seule fois, puis résolues par analyse rétrograde : on part des positions à
+9 pions et on remonte couche par couche jusqu'au plateau vide. Pour chaque
+position on conserve la valeur pour le joueur au trait et le masque de bits
+de ses coups optimaux, ce qui permet de répondre en O(1) quel que soit le
+nombre de cases vides.
+
+Les positions sont indexées du point de vue du joueur au trait :
+(bitboard du joueur, bitboard de l'adversaire). La même table sert donc
+que ce soit X ou O qui ait commencé la partie.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from morpion_base import MASQUE_PLEIN, MASQUES_VICTOIRE, TicTacToe
+
+
+# Entrée de la table : (résultat, distance, coups optimaux)
+#   résultat : +1 victoire, 0 nul, -1 défaite pour le joueur au trait
+#   distance : nombre de demi-coups avant la fin de la partie en jeu parfait
+#   coups    : masque de bits des coups optimaux (0 pour une position terminale)
+Entree = Tuple[int, int, int]
+
+_table: Optional[Dict[Tuple[int, int], Entree]] = None
+
+
+def _a_aligne(bits: int) -> bool:
+    """Indique si un bitboard contient un alignement gagnant."""
+    for masque in MASQUES_VICTOIRE:
+        if bits & masque == masque:
+            return True
+    return False
+
+
+def score_entree(resultat: int, distance: int) -> int:
+    """
+    Convertit (résultat, distance) en score Minimax.
+    
+    Même échelle que JoueurIA : 10 pour une victoire immédiate, moins un point
+    par demi-coup supplémentaire, symétrique pour les défaites, 0 pour un nul.
+    """
+    return resultat * (11 - distance)
+
+
+def _enumerer_positions() -> List[set]:
+    """
+    Énumère les positions atteignables, regroupées par nombre de pions.
+    
+    Returns:
+        Liste de 10 ensembles de positions (joueur, adversaire)
+    """
+    couches = [set() for _ in range(10)]
+    couches[0].add((0, 0))
+    for nb_pions in range(9):
+        for joueur, adversaire in couches[nb_pions]:
+            if _a_aligne(adversaire):
+                continue  # Partie terminée : pas de successeur
+            libres = ~(joueur | adversaire) & MASQUE_PLEIN
+            while libres:
+                bit = libres & -libres
+                libres ^= bit
+                # Après le coup, c'est à l'adversaire de jouer
+                couches[nb_pions + 1].add((adversaire, joueur | bit))
+    return couches
+
+
+def construire_table() -> Dict[Tuple[int, int], Entree]:
+    """
+    Résout toutes les positions par analyse rétrograde.
+    
+    Returns:
+        Dictionnaire {(joueur, adversaire): (résultat, distance, coups)}
+    """
+    couches = _enumerer_positions()
+    table: Dict[Tuple[int, int], Entree] = {}
+    
+    for nb_pions in range(9, -1, -1):
+        for position in couches[nb_pions]:
+            joueur, adversaire = position
+            if _a_aligne(adversaire):
+                table[position] = (-1, 0, 0)  # L'adversaire vient de gagner
+                continue
+            if nb_pions == 9:
+                table[position] = (0, 0, 0)  # Plateau plein : match nul
+                continue
+            
+            meilleur = None
+            coups = 0
+            libres = ~(joueur | adversaire) & MASQUE_PLEIN
+            while libres:
+                bit = libres & -libres
+                libres ^= bit
+                resultat_fils, distance_fils, _ = table[(adversaire, joueur | bit)]
+                resultat, distance = -resultat_fils, distance_fils + 1
+                score = score_entree(resultat, distance)
+                if meilleur is None or score > meilleur[0]:
+                    meilleur = (score, resultat, distance)
+                    coups = bit
+                elif score == meilleur[0]:
+                    coups |= bit
+            table[position] = (meilleur[1], meilleur[2], coups)
+    
+    return table
+
+
+def obtenir_table() -> Dict[Tuple[int, int], Entree]:
+    """Retourne la table résolue, construite au premier appel."""
+    global _table
+    if _table is None:
+        _table = construire_table()
+    return _table
+
+
+def consulter(jeu: TicTacToe, symbole: str) -> Optional[Entree]:
+    """
+    Cherche la position du jeu dans la table, du point de vue de ``symbole``.
+    
+    Args:
+        jeu: Instance du jeu TicTacToe
+        symbole: Symbole du joueur qui doit jouer
+    
+    Returns:
+        (résultat, distance, coups) ou None si la position n'est pas atteignable
+        avec ``symbole`` au trait (ou si le plateau n'est pas un 3x3 classique)
+    """
+    if (jeu.lignes, jeu.colonnes, jeu.alignement) != (3, 3, 3):
+        return None
+    adversaire = TicTacToe.IA if symbole == TicTacToe.HUMAIN else TicTacToe.HUMAIN
+    return obtenir_table().get((jeu.bitboards[symbole], jeu.bitboards[adversaire]))
+
+
+def obtenir_coups_optimaux(jeu: TicTacToe, symbole: str) -> Optional[List[Tuple[int, int]]]:
+    """
+    Retourne tous les coups optimaux pour ``symbole``.
+    
+    Returns:
+        Liste de (ligne, colonne) dans l'ordre des cases, ou None si la position
+        est inconnue de la table
+    """
+    entree = consulter(jeu, symbole)
+    if entree is None:
+        return None
+    coups = entree[2]
+    return [(i // 3, i % 3) for i in range(9) if coups >> i & 1]
+
+
+def obtenir_meilleur_coup(jeu: TicTacToe, symbole: str) -> Optional[Tuple[int, int]]:
+    """
+    Retourne le premier coup optimal pour ``symbole``.
+    
+    Le premier coup dans l'ordre des cases est celui que retiendrait Minimax,
+    qui ne remplace son meilleur coup que sur un score strictement supérieur.
+    
+    Returns:
+        Tuple (ligne, colonne) ou None si la position est inconnue ou terminée
+    """
+    entree = consulter(jeu, symbole)
+    if entree is None or not entree[2]:
+        return None
+    coups = entree[2]
+    index = (coups & -coups).bit_length() - 1
+    return (index // 3, index % 3)
+
+
+# Test du module
+if __name__ == "__main__":
+    import time
+    
+    print("Test de la table résolue")
+    print("=" * 50)
+    
+    debut = time.time()
+    table = obtenir_table()
+    print(f"{len(table)} positions résolues en {(time.time() - debut) * 1000:.1f}ms")
+    
+    resultat, distance, _ = table[(0, 0)]
+    print(f"Plateau vide: résultat {resultat:+d}, fin en {distance} demi-coups")
+    
+    jeu = TicTacToe()
+    debut = time.perf_counter()
+    coup = obtenir_meilleur_coup(jeu, TicTacToe.HUMAIN)
+    print(f"Premier coup optimal: {coup} ({(time.perf_counter() - debut) * 1e6:.1f}µs)")
+    print(f"Tous les coups optimaux: {obtenir_coups_optimaux(jeu, TicTacToe.HUMAIN)}")
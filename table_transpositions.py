@@ -0,0 +1,255 @@
+"""
+Table de transpositions compacte et bornée pour MoteurRecherche.
+
+Un dictionnaire qui grandit sans limite finit par occuper toute la mémoire
+sur les grands plateaux. TableCompacte range chaque entrée dans un seul
+entier de 64 bits d'un tableau préalloué (``array``) : accès direct par la
+clé quand toutes les positions tiennent (2 * 3^9 cases pour le 3x3),
+adressage ouvert sinon, sur un nombre de cases fixé par le budget. En
+adressage ouvert, une clé est rangée dans un seau de SONDES cases : la
+première case est toujours remplacée, les autres gardent les entrées les
+plus profondes. Une nouvelle entrée trouve donc toujours sa place, sans
+chasser les résultats coûteux par des positions peu profondes. Environ 16
+octets par case au lieu de 240 par entrée de dictionnaire.
+
+La table s'utilise comme le dictionnaire attendu par MoteurRecherche
+(get, affectation, len, clear) et se sauvegarde avec pickle.
+"""
+
+from array import array
+from typing import Iterator, Optional, Tuple
+
+# Octets par case d'adressage ouvert (clé + entrée), nombre maximal de
+# cases d'un tableau à accès direct et cases d'un seau (puissance de 2)
+OCTETS_PAR_CASE = 16
+TAILLE_DIRECTE_MAX = 1 << 16
+SONDES = 4
+
+# Profondeur restante des entrées obtenues sans coupure de profondeur
+# (moteur_recherche._SANS_COUPURE)
+_SANS_COUPURE = 1 << 30
+
+
+class TableCompacte:
+    """
+    Table de transpositions dans des tableaux d'entiers préalloués.
+    
+    Une entrée (profondeur restante, nature, score, case du coup) est rangée
+    dans un entier : case du coup + 1 sur 10 bits, nature sur 2 bits, code de
+    profondeur sur 10 bits (0 : case vide, 1 : sans coupure, restante + 2
+    sinon), score signé dans les bits restants.
+    """
+    
+    def __init__(self, nb_cases: int = 9, taille_max: Optional[int] = None,
+                 octets_max: Optional[int] = None):
+        """
+        Crée une table vide pour un plateau de ``nb_cases`` cases.
+        
+        Args:
+            nb_cases: Nombre de cases du plateau (clés < 2 * 3^nb_cases)
+            taille_max: Nombre maximal d'entrées, arrondi à la puissance de 2
+                        inférieure pour l'adressage ouvert (None = accès direct
+                        si possible, sinon 2^20 cases d'adressage ouvert)
+            octets_max: Budget mémoire en octets, prioritaire sur ``taille_max``
+        
+        Raises:
+            ValueError: Si le plateau est trop grand pour le format des entrées
+                        ou si le budget ne permet pas une seule entrée
+        """
+        if nb_cases > 1000:
+            raise ValueError(f"Plateau trop grand pour une table compacte: {nb_cases} cases")
+        self.nb_cases = nb_cases
+        self.evictions = 0
+        self.redimensionner(taille_max, octets_max)
+    
+    def redimensionner(self, taille_max: Optional[int] = None, octets_max: Optional[int] = None):
+        """
+        Change le budget ; les entrées sont replacées dans les nouveaux tableaux.
+        
+        Le budget est un plafond : la capacité de l'adressage ouvert est la
+        plus grande puissance de 2 qui ne le dépasse pas.
+        
+        Args:
+            taille_max: Nombre maximal d'entrées (None = accès direct si
+                        possible, sinon 2^20 cases)
+            octets_max: Budget mémoire en octets, prioritaire sur ``taille_max``
+        
+        Raises:
+            ValueError: Si le budget ne permet pas une seule entrée
+        """
+        if octets_max is not None:
+            taille_max = octets_max // OCTETS_PAR_CASE
+        if taille_max is not None and taille_max < 1:
+            raise ValueError(f"Budget de table de transpositions trop petit: {taille_max} entrée(s)")
+        anciennes = list(self.items()) if hasattr(self, '_valeurs') else []
+        
+        nb_cles = 2 * 3 ** self.nb_cases
+        self.directe = nb_cles <= TAILLE_DIRECTE_MAX and (taille_max is None or nb_cles <= taille_max)
+        if self.directe:
+            self.taille_max = nb_cles
+            self._cles = None
+        else:
+            capacite = 1 << 20 if taille_max is None else 1 << (taille_max.bit_length() - 1)
+            self.taille_max = capacite
+            self._sondes = min(SONDES, capacite)
+            # Masque du début de seau : les seaux sont alignés et disjoints
+            self._masque = (capacite - 1) & ~(self._sondes - 1)
+            # Clé + 1 (0 : case vide) ; entiers Python si les clés dépassent 64 bits
+            self._cles = array('Q', bytes(8 * capacite)) if nb_cles < 1 << 64 else [0] * capacite
+        self._valeurs = array('q', bytes(8 * self.taille_max))
+        self._nb_entrees = 0
+        for cle, entree in anciennes:
+            self[cle] = entree
+    
+    @staticmethod
+    def _encoder(entree: Tuple[int, int, int, int]) -> int:
+        restante, nature, score, coup = entree
+        code = 1 if restante >= _SANS_COUPURE else restante + 2
+        return (score << 22) | (code << 12) | (nature << 10) | (coup + 1)
+    
+    @staticmethod
+    def _decoder(valeur: int) -> Tuple[int, int, int, int]:
+        code = (valeur >> 12) & 1023
+        return (_SANS_COUPURE if code == 1 else code - 2, (valeur >> 10) & 3,
+                valeur >> 22, (valeur & 1023) - 1)
+    
+    def _case(self, cle: int) -> int:
+        """Case de ``cle`` dans l'adressage ouvert, ou -1 si elle est absente."""
+        cles = self._cles
+        marque = cle + 1
+        debut = hash(cle) & self._masque
+        for case in range(debut, debut + self._sondes):
+            contenu = cles[case]
+            if contenu == marque:
+                return case
+            if not contenu:
+                return -1  # Les cases d'un seau se remplissent dans l'ordre
+        return -1
+    
+    def get(self, cle: int, defaut=None):
+        """Lit l'entrée de ``cle`` sous forme de tuple, ou ``defaut``."""
+        if self.directe:
+            valeur = self._valeurs[cle]
+        else:
+            case = self._case(cle)
+            if case < 0:
+                return defaut
+            valeur = self._valeurs[case]
+        if not valeur & 0x3FF000:
+            return defaut
+        return self._decoder(valeur)
+    
+    def __getitem__(self, cle: int) -> Tuple[int, int, int, int]:
+        entree = self.get(cle)
+        if entree is None:
+            raise KeyError(cle)
+        return entree
+    
+    def __contains__(self, cle: int) -> bool:
+        return self.get(cle) is not None
+    
+    def __setitem__(self, cle: int, entree: Tuple[int, int, int, int]):
+        valeur = self._encoder(entree)
+        valeurs = self._valeurs
+        if self.directe:
+            if not valeurs[cle] & 0x3FF000:
+                self._nb_entrees += 1
+            valeurs[cle] = valeur
+            return
+        
+        # Même clé ou case vide dans le seau, sinon remplacement. La première
+        # case est toujours remplacée ; une nouvelle entrée au moins aussi
+        # profonde que la moins profonde des autres cases (les entrées sans
+        # coupure sont les plus précieuses) prend sa place, et cette dernière
+        # descend dans la première case
+        cles = self._cles
+        marque = cle + 1
+        debut = hash(cle) & self._masque
+        victime = debut
+        profondeur_victime = -1
+        for case in range(debut, debut + self._sondes):
+            contenu = cles[case]
+            if contenu == marque:
+                valeurs[case] = valeur
+                return
+            if not contenu:
+                cles[case] = marque
+                valeurs[case] = valeur
+                self._nb_entrees += 1
+                return
+            if case != debut:
+                code = (valeurs[case] >> 12) & 1023
+                profondeur = 1 << 11 if code == 1 else code
+                if profondeur_victime < 0 or profondeur < profondeur_victime:
+                    victime = case
+                    profondeur_victime = profondeur
+        code = (valeur >> 12) & 1023
+        if (1 << 11 if code == 1 else code) >= profondeur_victime > 0:
+            cles[debut] = cles[victime]
+            valeurs[debut] = valeurs[victime]
+        else:
+            victime = debut
+        cles[victime] = marque
+        valeurs[victime] = valeur
+        self.evictions += 1
+    
+    def __len__(self) -> int:
+        return self._nb_entrees
+    
+    def items(self) -> Iterator[Tuple[int, Tuple[int, int, int, int]]]:
+        """Parcourt les couples (clé, entrée) de la table."""
+        valeurs = self._valeurs
+        for case, valeur in enumerate(valeurs):
+            if valeur & 0x3FF000:
+                cle = case if self.directe else self._cles[case] - 1
+                yield cle, self._decoder(valeur)
+    
+    def update(self, entrees=()):
+        """Ajoute les entrées d'un dictionnaire ou d'une suite de couples (clé, entrée)."""
+        if hasattr(entrees, 'items'):
+            entrees = entrees.items()
+        for cle, entree in entrees:
+            self[cle] = entree
+    
+    def clear(self):
+        """Vide la table sans changer son budget."""
+        self._valeurs = array('q', bytes(8 * self.taille_max))
+        if self._cles is not None:
+            self._cles = (array('Q', bytes(8 * self.taille_max)) if isinstance(self._cles, array)
+                          else [0] * self.taille_max)
+        self._nb_entrees = 0
+    
+    @property
+    def occupation(self) -> float:
+        """Part des cases utilisée (0 à 1)."""
+        return self._nb_entrees / self.taille_max
+    
+    def obtenir_statistiques(self) -> dict:
+        """Retourne la taille, la capacité et le nombre d'évictions de la table."""
+        return {
+            'entrees': self._nb_entrees,
+            'taille_max': self.taille_max,
+            'occupation': self.occupation,
+            'evictions': self.evictions,
+            'acces_direct': self.directe,
+            'octets_estimes': self.taille_max * (8 if self.directe else OCTETS_PAR_CASE),
+        }
+
+
+# Test du module
+if __name__ == "__main__":
+    import time
+    from moteur_recherche import MoteurRecherche
+    from morpion_mnk import MorpionMNK
+    
+    print("Test de la table de transpositions compacte")
+    print("=" * 50)
+    
+    for geometrie, budget in (((3, 3, 3), None), ((4, 4, 3), None), ((4, 4, 3), 2000)):
+        jeu = MorpionMNK(*geometrie)
+        table = TableCompacte(jeu.nb_cases, taille_max=budget)
+        moteur = MoteurRecherche(transpositions=table, cles_canoniques=True)
+        debut = time.time()
+        coup, score = moteur.rechercher(jeu, jeu.HUMAIN)
+        print(f"Table compacte {geometrie}, budget {budget}: coup {coup}, score {score}, "
+              f"{moteur.noeuds} noeuds en {time.time() - debut:.1f}s, {table.obtenir_statistiques()}")
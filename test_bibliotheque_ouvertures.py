@@ -0,0 +1,85 @@
+"""Test de la bibliothèque d'ouvertures contre la table résolue du 3x3"""
+import os
+import tempfile
+
+import pytest
+
+from bibliotheque_ouvertures import BibliothequeOuvertures, construire_bibliotheque
+from morpion_base import TicTacToe
+from table_resolue import consulter
+
+
+def verifier_resultats(bibliotheque: BibliothequeOuvertures) -> int:
+    """
+    Vérifie que chaque coup de la bibliothèque garde le résultat de la position.
+    
+    Toutes les positions couvertes sont parcourues depuis le plateau vide ;
+    le résultat après chaque coup retenu est comparé à celui de la position
+    en jeu parfait.
+    
+    Returns:
+        Nombre de coups vérifiés
+    """
+    verifies = 0
+    frontiere = [TicTacToe()]
+    for _ in range(bibliotheque.profondeur):
+        suivante = []
+        for jeu in frontiere:
+            symbole = jeu.joueur_actuel
+            adversaire = jeu.adversaire(symbole)
+            coups = bibliotheque.coups(jeu, symbole)
+            assert coups, f"Position non couverte:\n{jeu.plateau}"
+            resultat = consulter(jeu, symbole)[0]
+            for (ligne, colonne), poids in coups:
+                jeu.jouer_coup(ligne, colonne, symbole)
+                resultat_coup = -consulter(jeu, adversaire)[0]
+                jeu.annuler_coup()
+                assert resultat_coup == resultat, (
+                    f"{symbole} en ({ligne}, {colonne}), poids {poids}: résultat {resultat_coup} "
+                    f"au lieu de {resultat}\n{jeu.plateau}")
+                verifies += 1
+            for ligne, colonne in jeu.obtenir_coups_possibles():
+                jeu.jouer_coup(ligne, colonne, symbole)
+                if not jeu.est_partie_terminee():
+                    suivante.append(jeu.copier())
+                jeu.annuler_coup()
+        frontiere = suivante
+    return verifies
+
+
+def test_coups_de_meme_resultat():
+    """Avec une marge, aucun coup retenu ne change le résultat de la partie."""
+    for marge in (0, 2, 5):
+        bibliotheque = construire_bibliotheque(profondeur=4, marge=marge)
+        assert verifier_resultats(bibliotheque) > 0
+
+
+def test_aller_retour_fichier():
+    """La bibliothèque relue est identique à celle écrite."""
+    bibliotheque = construire_bibliotheque(profondeur=4, marge=2)
+    fichier = os.path.join(tempfile.gettempdir(), "test_ouvertures.livre")
+    try:
+        bibliotheque.sauvegarder(fichier)
+        relue = BibliothequeOuvertures.charger(fichier)
+    finally:
+        if os.path.exists(fichier):
+            os.remove(fichier)
+    assert relue.entrees == bibliotheque.entrees
+    verifier_resultats(relue)
+
+
+def test_plateau_trop_grand():
+    """Une case de coup tient sur un octet : les plateaux de plus de 256 cases sont refusés."""
+    BibliothequeOuvertures(16, 16, 5)
+    with pytest.raises(ValueError):
+        BibliothequeOuvertures(17, 16, 5)
+
+
+if __name__ == "__main__":
+    print('=' * 60)
+    print("TEST BIBLIOTHÈQUE D'OUVERTURES vs TABLE RÉSOLUE")
+    print('=' * 60)
+    test_coups_de_meme_resultat()
+    test_aller_retour_fichier()
+    test_plateau_trop_grand()
+    print("Tous les tests sont passés")
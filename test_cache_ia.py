@@ -0,0 +1,93 @@
+"""Test de la sauvegarde et du rechargement du cache de JoueurIACache"""
+import pickle
+import tempfile
+from pathlib import Path
+
+from joueurs import JoueurIACache
+from morpion_mnk import MorpionMNK
+
+
+def _remplir_et_recharger(taille_max, taille_rechargement):
+    """Remplit le cache sur 3x3 et 4x4, le sauvegarde puis le recharge avec un autre budget."""
+    ancien_fichier, ancienne_taille = JoueurIACache._fichier_cache, JoueurIACache._taille_max
+    ancien_cache = JoueurIACache._cache_global
+    fichier = Path(tempfile.gettempdir()) / "test_cache_ia.pkl"
+    if fichier.exists():
+        fichier.unlink()
+    try:
+        JoueurIACache._fichier_cache = fichier
+        JoueurIACache._cache_global = {}
+        JoueurIACache.configurer_cache(taille_max=taille_max)
+        for geometrie in ((3, 3, 3), (4, 4, 3)):
+            jeu = MorpionMNK(*geometrie)
+            JoueurIACache('X').obtenir_coup(jeu)
+        avant = {geometrie: dict(table.items()) for geometrie, table in JoueurIACache._cache_global.items()}
+        JoueurIACache.sauvegarder_cache()
+        with open(fichier, 'rb') as f:
+            sauvegardees = pickle.load(f)['tables']
+        JoueurIACache.configurer_cache(taille_max=taille_rechargement)
+        JoueurIACache.charger_cache()
+        return avant, sauvegardees, JoueurIACache._cache_global
+    finally:
+        JoueurIACache._fichier_cache = ancien_fichier
+        JoueurIACache._taille_max = ancienne_taille
+        JoueurIACache._cache_global = ancien_cache
+        if fichier.exists():
+            fichier.unlink()
+
+
+def test_aller_retour_complet():
+    """Budget par défaut : toutes les positions sont relues à l'identique."""
+    avant, sauvegardees, relues = _remplir_et_recharger(None, None)
+    assert sauvegardees == avant
+    for geometrie, entrees in avant.items():
+        assert dict(relues[geometrie].items()) == entrees
+        assert relues[geometrie].evictions == 0
+
+
+def test_aller_retour_table_pleine():
+    """Budget réduit : chaque position du fichier est relue ou comptée comme évincée."""
+    avant, sauvegardees, relues = _remplir_et_recharger(None, 300)
+    assert sauvegardees == avant
+    for geometrie, entrees in avant.items():
+        table = relues[geometrie]
+        relues_table = dict(table.items())
+        assert len(table) + table.evictions == len(entrees)
+        assert all(entrees[cle] == entree for cle, entree in relues_table.items())
+
+
+def test_budget_plafond():
+    """La mémoire allouée et la capacité rapportée ne dépassent jamais le budget."""
+    from table_transpositions import OCTETS_PAR_CASE, TableCompacte
+    for octets_max in (17 * 2 ** 20, 2 ** 20, 5000):
+        table = TableCompacte(16, octets_max=octets_max)
+        assert table.taille_max * OCTETS_PAR_CASE <= octets_max < 2 * table.taille_max * OCTETS_PAR_CASE
+    ancien_fichier, ancienne_taille = JoueurIACache._fichier_cache, JoueurIACache._taille_max
+    ancien_cache = JoueurIACache._cache_global
+    fichier = Path(tempfile.gettempdir()) / "test_cache_ia.pkl"
+    try:
+        JoueurIACache._fichier_cache = fichier
+        JoueurIACache._cache_global = {}
+        JoueurIACache.configurer_cache(taille_max=1000)
+        joueur = JoueurIACache('X')
+        joueur.obtenir_coup(MorpionMNK(4, 4, 3))
+        stats = joueur.obtenir_statistiques()
+        assert stats['taille_max_cache'] == TableCompacte(16, taille_max=1000).taille_max
+        assert stats['taille_max_cache'] <= 1000 < 2 * stats['taille_max_cache']
+        assert stats['taille_cache'] <= stats['taille_max_cache']
+    finally:
+        JoueurIACache._fichier_cache = ancien_fichier
+        JoueurIACache._taille_max = ancienne_taille
+        JoueurIACache._cache_global = ancien_cache
+        if fichier.exists():
+            fichier.unlink()
+
+
+if __name__ == "__main__":
+    print('=' * 60)
+    print("TEST CACHE IA : SAUVEGARDE ET RECHARGEMENT")
+    print('=' * 60)
+    test_aller_retour_complet()
+    test_aller_retour_table_pleine()
+    test_budget_plafond()
+    print("Tous les tests sont passés")
@@ -0,0 +1,60 @@
+"""Test des calculs asynchrones : annulation puis relance sur le même joueur"""
+import time
+
+from joueurs import JoueurIA
+from morpion_mnk import MorpionMNK
+from moteur_recherche import RechercheAnnulee
+
+# Attente maximale de la fin d'un calcul annulé, en secondes
+DELAI_ARRET = 2.0
+
+
+def _attendre_fin(calcul, delai: float = DELAI_ARRET) -> bool:
+    """Attend la fin du calcul ; True s'il s'est terminé dans le délai."""
+    echeance = time.perf_counter() + delai
+    while not calcul.est_termine():
+        if time.perf_counter() >= echeance:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_annuler_puis_relancer():
+    """Chaque calcul s'arrête à sa propre annulation, même relancé aussitôt sur le même joueur."""
+    jeu = MorpionMNK(5, 5, 4)
+    joueur = JoueurIA('X', niveau=-1)
+    premier = joueur.obtenir_coup_async(jeu)
+    time.sleep(0.2)
+    premier.annuler()
+    second = joueur.obtenir_coup_async(jeu)
+    assert _attendre_fin(premier)
+    time.sleep(0.2)
+    second.annuler()
+    assert _attendre_fin(second)
+    for calcul in (premier, second):
+        try:
+            calcul.resultat()
+        except RechercheAnnulee:
+            pass
+        else:
+            assert False, "Un calcul annulé a rendu un coup"
+
+
+def test_relance_apres_annulation():
+    """Le calcul relancé après une annulation rend un coup légal."""
+    jeu = MorpionMNK(3, 3, 3)
+    joueur = JoueurIA('X', niveau=-1)
+    premier = joueur.obtenir_coup_async(jeu)
+    premier.annuler()
+    second = joueur.obtenir_coup_async(jeu)
+    assert second.resultat(10) in jeu.obtenir_coups_possibles()
+    assert joueur.moteur.annulation is None
+
+
+if __name__ == "__main__":
+    print('=' * 60)
+    print("TEST CALCULS ASYNCHRONES")
+    print('=' * 60)
+    test_annuler_puis_relancer()
+    test_relance_apres_annulation()
+    print("Tous les tests sont passés")
@@ -1,5 +1,5 @@
 """Test du réseau contre joueur aléatoire (mode exploitation pur)"""
-from morpion_base import TicTacToe
+from simulateur_lot import SimulateurLot
 from joueurs import JoueurReseauNeurones, JoueurAleatoire
 
 print('='*60)
@@ -14,28 +14,13 @@ print(f'Parties jouées par le réseau: {reseau.parties_jouees}')
 print(f'Epsilon actuel: {reseau.epsilon:.3f}')
 print('\nTest sur 100 parties en mode exploitation pur...\n')
 
-victoires = 0
-defaites = 0
-nuls = 0
-
-for partie in range(1, 101):
-    game = TicTacToe()
-    joueur_actuel = reseau
-    joueur_suivant = adversaire
-    
-    while not game.est_partie_terminee():
-        coup = joueur_actuel.obtenir_coup(game)
-        game.jouer_coup(coup[0], coup[1], joueur_actuel.symbole)
-        joueur_actuel, joueur_suivant = joueur_suivant, joueur_actuel
-    
-    winner = game.verifier_gagnant()
-    
-    if winner == reseau.symbole:
-        victoires += 1
-    elif winner is None:
-        nuls += 1
-    else:
-        defaites += 1
+# Les 100 parties sont jouées ensemble par le simulateur par lot
+simulateur = SimulateurLot(100)
+resultats = simulateur.jouer_parties(reseau, adversaire, 100)
+
+victoires = resultats[reseau.symbole]
+nuls = resultats['NUL']
+defaites = resultats[adversaire.symbole]
 
 taux_v = (victoires / 100) * 100
 taux_n = (nuls / 100) * 100
@@ -0,0 +1,59 @@
+"""Test du remplacement dans la table de transpositions compacte"""
+from table_transpositions import SONDES, TableCompacte, _SANS_COUPURE
+
+# Entrées (profondeur restante, nature, score, case du coup)
+PROFONDE = (_SANS_COUPURE, 0, 7, 3)
+PEU_PROFONDE = (1, 1, -2, 5)
+
+
+def _seau_plein_profond() -> TableCompacte:
+    """Table d'un seul seau, rempli d'entrées sans coupure."""
+    table = TableCompacte(16, taille_max=SONDES)
+    for cle in range(SONDES):
+        table[cle] = PROFONDE
+    assert len(table) == SONDES and table.evictions == 0
+    return table
+
+
+def test_entree_peu_profonde_rangee():
+    """Un seau plein d'entrées profondes accepte encore les nouvelles entrées peu profondes."""
+    table = _seau_plein_profond()
+    for cle in range(100, 110):
+        table[cle] = PEU_PROFONDE
+        assert table.get(cle) == PEU_PROFONDE
+    # Les entrées profondes des autres cases du seau sont gardées
+    gardees = [cle for cle in range(SONDES) if table.get(cle) == PROFONDE]
+    assert len(gardees) == SONDES - 1
+    assert table.evictions == 10
+
+
+def test_entree_profonde_prioritaire():
+    """Une entrée profonde remplace la moins profonde, qui descend dans la case toujours remplacée."""
+    table = TableCompacte(16, taille_max=SONDES)
+    table[0] = PROFONDE
+    table[1] = PEU_PROFONDE
+    table[2] = PROFONDE
+    table[3] = PROFONDE
+    table[10] = PROFONDE
+    assert table.get(10) == PROFONDE
+    assert table.get(1) == PEU_PROFONDE
+    assert table.get(0) is None
+    assert len(table) == SONDES and table.evictions == 1
+
+
+def test_mise_a_jour_sans_eviction():
+    """Réécrire une clé présente ne change ni la taille ni les évictions."""
+    table = _seau_plein_profond()
+    table[2] = PEU_PROFONDE
+    assert table.get(2) == PEU_PROFONDE
+    assert len(table) == SONDES and table.evictions == 0
+
+
+if __name__ == "__main__":
+    print('=' * 60)
+    print("TEST TABLE DE TRANSPOSITIONS COMPACTE")
+    print('=' * 60)
+    test_entree_peu_profonde_rangee()
+    test_entree_profonde_prioritaire()
+    test_mise_a_jour_sans_eviction()
+    print("Tous les tests sont passés")